@@ -0,0 +1,152 @@
+"""
+Thread-safe registry of many Account instances.
+
+Account itself does no locking, so two threads trading on the same account
+can both pass a balance check and overdraw it. AccountBook serializes every
+operation on an account behind one of a fixed pool of striped locks, chosen
+by hashing the account id. Operations on accounts that land on different
+stripes never wait for each other.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from accounts import Account
+from price_provider import PriceProvider
+
+
+class AccountBook:
+    """
+    Manages many accounts and serializes trading on each one.
+    """
+
+    def __init__(self, stripes: int = 64, price_provider: PriceProvider = None):
+        """
+        Initializes an empty book.
+
+        Args:
+            stripes (int, optional): Number of locks shared out between accounts. More
+                                     stripes mean fewer unrelated accounts waiting on
+                                     each other. Defaults to 64.
+            price_provider (PriceProvider, optional): Price source given to every account
+                                                      opened by the book. Defaults to each
+                                                      Account's own default.
+        """
+        self.price_provider = price_provider
+        self._accounts: Dict[str, Account] = {}
+        self._registry_lock = threading.Lock()  # Guards opening and closing accounts
+        self._stripes: List[threading.RLock] = [threading.RLock() for _ in range(stripes)]
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    def __contains__(self, account_id: str) -> bool:
+        return account_id in self._accounts
+
+    def account_ids(self) -> List[str]:
+        """
+        Returns the ids of all open accounts.
+
+        Returns:
+            List[str]: Account ids, in the order they were opened.
+        """
+        return list(self._accounts)
+
+    def open_account(self, account_id: str) -> Account:
+        """
+        Returns the account with the given id, creating it if it does not exist yet.
+
+        Args:
+            account_id (str): A unique identifier for the account.
+
+        Returns:
+            Account: The existing or newly created account.
+        """
+        account = self._accounts.get(account_id)
+        if account is None:
+            with self._registry_lock:
+                account = self._accounts.get(account_id)
+                if account is None:
+                    account = Account(account_id, price_provider=self.price_provider)
+                    self._accounts[account_id] = account
+        return account
+
+    def close_account(self, account_id: str) -> bool:
+        """
+        Removes an account from the book once nothing is trading on it, freeing its memory.
+        Opening the same id again starts a new, empty account.
+
+        Args:
+            account_id (str): The account id.
+
+        Returns:
+            bool: True if the account was open and has been closed, False if it was not open.
+        """
+        with self._lock_for(account_id):
+            with self._registry_lock:
+                return self._accounts.pop(account_id, None) is not None
+
+    def get_account(self, account_id: str) -> Account:
+        """
+        Returns an open account. Callers that read or trade on it directly must hold
+        locked(account_id) to stay consistent with concurrent writers.
+
+        Args:
+            account_id (str): The account id.
+
+        Returns:
+            Account: The account.
+
+        Raises:
+            KeyError: If no account with that id has been opened.
+        """
+        return self._accounts[account_id]
+
+    def _lock_for(self, account_id: str) -> threading.RLock:
+        """Returns the stripe lock guarding an account id."""
+        return self._stripes[hash(account_id) % len(self._stripes)]
+
+    @contextmanager
+    def locked(self, account_id: str) -> Iterator[Account]:
+        """
+        Holds an account's lock for a multi-step read or update.
+
+        Args:
+            account_id (str): The account id.
+
+        Yields:
+            Account: The account, exclusively owned by the caller until the block exits.
+
+        Raises:
+            KeyError: If no account with that id has been opened.
+        """
+        with self._lock_for(account_id):
+            # Looked up under the lock, so close_account() cannot drop it in between
+            account = self.get_account(account_id)
+            yield account
+
+    def deposit(self, account_id: str, amount: float) -> bool:
+        """Calls Account.deposit on an account under its lock."""
+        with self.locked(account_id) as account:
+            return account.deposit(amount)
+
+    def withdraw(self, account_id: str, amount: float) -> bool:
+        """Calls Account.withdraw on an account under its lock."""
+        with self.locked(account_id) as account:
+            return account.withdraw(amount)
+
+    def buy_shares(self, account_id: str, symbol: str, quantity: int) -> bool:
+        """Calls Account.buy_shares on an account under its lock."""
+        with self.locked(account_id) as account:
+            return account.buy_shares(symbol, quantity)
+
+    def sell_shares(self, account_id: str, symbol: str, quantity: int) -> bool:
+        """Calls Account.sell_shares on an account under its lock."""
+        with self.locked(account_id) as account:
+            return account.sell_shares(symbol, quantity)
+
+    def execute_batch(self, account_id: str, orders: List[Dict[str, Any]]) -> bool:
+        """Calls Account.execute_batch on an account under its lock."""
+        with self.locked(account_id) as account:
+            return account.execute_batch(orders)
@@ -1,8 +1,43 @@
+import asyncio
+import bisect
 import datetime
-from typing import Dict, List, Any
+import time
+from types import MappingProxyType
+from typing import AsyncIterator, Callable, Dict, List, Any, Mapping, NamedTuple, Optional, Tuple
+
+from ledger import (
+    TransactionLedger,
+    TransactionView,
+    datetime_to_ns,
+    MSG_CUSTOM,
+    MSG_DEPOSITED,
+    MSG_DEPOSIT_NOT_POSITIVE,
+    MSG_WITHDREW,
+    MSG_WITHDRAW_NOT_POSITIVE,
+    MSG_INSUFFICIENT_FUNDS,
+    MSG_QUANTITY_NOT_POSITIVE,
+    MSG_UNKNOWN_SYMBOL,
+    MSG_INSUFFICIENT_FUNDS_TO_BUY,
+    MSG_BOUGHT,
+    MSG_NOT_ENOUGH_SHARES,
+    MSG_SOLD,
+)
+from change_feed import ChangeFeed, Event
+from lots import FIFO, LotQueue
+from price_provider import PriceProvider, CallablePriceProvider
+from rejects import RejectLog
 
 # --- External Dependency / Mock Implementation ---
 
+MOCK_PRICES: Dict[str, float] = {
+    "AAPL": 170.00,
+    "TSLA": 250.00,
+    "GOOGL": 120.00,
+    "MSFT": 320.00,
+    "AMZN": 130.00,
+    "NVDA": 450.00,
+}
+
 def get_share_price(symbol: str) -> float:
     """
     Simulates fetching the current market price for a given stock symbol.
@@ -19,15 +54,55 @@ def get_share_price(symbol: str) -> float:
         float: The current price of one share of the given symbol.
                Returns 0.0 if the symbol is not recognized in this mock.
     """
-    prices = {
-        "AAPL": 170.00,
-        "TSLA": 250.00,
-        "GOOGL": 120.00,
-        "MSFT": 320.00,
-        "AMZN": 130.00,
-        "NVDA": 450.00,
-    }
-    return prices.get(symbol.upper(), 0.0)
+    return MOCK_PRICES.get(symbol.upper(), 0.0)
+
+# --- Class: AccountSnapshot ---
+
+class AccountSnapshot(NamedTuple):
+    """
+    An immutable, consistent view of an account's state between two ledger writes,
+    rejects or reprices. Every field describes the same moment, however many trades land while
+    the snapshot is being read.
+    """
+    sequence: int  # Ledger length, the same cursor as the change feed
+    balance: float
+    initial_deposit_total: float
+    holdings: Mapping[str, int]  # Read-only; symbol -> quantity held
+    marks: Mapping[str, float]  # Read-only; symbol -> price the holding is valued at
+    holdings_value: float
+    cost_basis: float
+    realized_profit_loss: float
+    last_message: Optional[str]  # Message of the latest transaction or reject, if any
+
+    @property
+    def portfolio_value(self) -> float:
+        """Cash balance plus the market value of all held shares."""
+        return self.balance + self.holdings_value
+
+    @property
+    def profit_loss(self) -> float:
+        """Portfolio value minus the total amount deposited."""
+        return self.portfolio_value - self.initial_deposit_total
+
+class HoldingStatus(NamedTuple):
+    """One held symbol in an AccountStatus, valued at a current price."""
+    symbol: str
+    quantity: int
+    price: float
+    value: float
+
+
+class AccountStatus(NamedTuple):
+    """
+    Everything a status display shows, taken from one snapshot and valued with one price fetch.
+    """
+    sequence: int  # Ledger length of the snapshot the status was built from
+    balance: float
+    initial_deposit_total: float
+    holdings: Tuple[HoldingStatus, ...]  # In the order the symbols were first bought
+    portfolio_value: float
+    profit_loss: float
+    last_message: Optional[str]  # Message of the latest transaction or reject, if any
 
 # --- Class: Account ---
 
@@ -38,18 +113,117 @@ class Account:
     history of all financial and trading transactions.
     """
 
-    def __init__(self, account_id: str):
+    def __init__(
+        self,
+        account_id: str,
+        checkpoint_interval: int = 1000,
+        price_provider: PriceProvider = None,
+        cost_basis_method: str = FIFO,
+        clock: Callable[[], int] = None,
+        reject_log_size: int = 1000
+    ):
         """
         Initializes a new Account instance.
 
         Args:
             account_id (str): A unique identifier for the account.
+            checkpoint_interval (int, optional): Number of ledger rows between state
+                                                 checkpoints used by point-in-time queries.
+                                                 Defaults to 1000.
+            price_provider (PriceProvider, optional): Source of share prices. Defaults to
+                                                      the module-level get_share_price mock.
+            cost_basis_method (str, optional): How sells are matched against earlier buys
+                                               for cost basis and realized profit/loss:
+                                               "fifo", "lifo" or "average". Defaults to "fifo".
+            clock (Callable[[], int], optional): Returns the time to stamp transactions with,
+                                                 in nanoseconds since the epoch, e.g. the
+                                                 current tick of a backtest. Defaults to the
+                                                 local wall clock.
+            reject_log_size (int, optional): Number of most recent rejected orders kept
+                                             for inspection. Rejects are counted but never
+                                             enter the transaction ledger. Defaults to 1000.
+
+        Raises:
+            ValueError: If cost_basis_method is not recognized.
         """
         self.account_id: str = account_id
+        # Looked up at call time so get_share_price can be swapped or patched
+        self.price_provider: PriceProvider = price_provider or CallablePriceProvider(
+            lambda symbol: get_share_price(symbol)
+        )
+        self._clock: Optional[Callable[[], int]] = clock
         self._balance: float = 0.0  # Current cash balance
         self._initial_deposit_total: float = 0.0  # Cumulative sum of all deposits
         self._holdings: Dict[str, int] = {}  # Stock symbol -> quantity held
-        self._transactions: List[Dict[str, Any]] = []  # List of recorded transactions
+        self._marks: Dict[str, float] = {}  # Stock symbol -> last known price per share
+        self._holdings_value: float = 0.0  # Running market value of all held shares
+        self.cost_basis_method: str = LotQueue(cost_basis_method).method  # Validates the method
+        self._lots: Dict[str, LotQueue] = {}  # Stock symbol -> open lots and realized P&L
+        self._cost_basis_total: float = 0.0  # Running cost of all held shares
+        self._realized_total: float = 0.0  # Running realized P&L across all symbols
+        self._transactions: TransactionLedger = TransactionLedger()  # Columnar history of applied transactions
+        self._rejects: RejectLog = RejectLog(reject_log_size)  # Bounded log of rejected orders
+        self._last_rejected: bool = False  # The latest order was rejected, not recorded
+        self._feed: ChangeFeed = ChangeFeed()  # Publishes each new ledger row to subscribers
+        # Bumped to odd before a state change and back to even after it; see get_snapshot()
+        self._version: int = 0
+        self._snapshot: Tuple[int, AccountSnapshot] = (-1, None)  # (version, snapshot) last built
+        self._snapshot_requested: bool = False  # A reader is waiting for the current write to end
+        self._checkpoint_interval: int = checkpoint_interval
+        self._checkpoint_rows: List[int] = [0]  # Ledger length at each checkpoint, ascending
+        self._checkpoints: List[tuple] = [(0.0, {}, {})]  # (deposit total, holdings, marks) per checkpoint
+
+    def _mark(self, symbol_upper: str, quantity: int, price: float) -> None:
+        """
+        Internal helper that moves one symbol to a new quantity and price, adjusting
+        the running market value by the difference instead of re-pricing every holding.
+
+        Args:
+            symbol_upper (str): Upper-cased stock symbol.
+            quantity (int): The new quantity held (0 removes the position).
+            price (float): The price per share to mark the position at.
+        """
+        old_value = self._holdings.get(symbol_upper, 0) * self._marks.get(symbol_upper, 0.0)
+        if quantity == 0:
+            self._holdings.pop(symbol_upper, None)
+            self._marks.pop(symbol_upper, None)
+        else:
+            self._holdings[symbol_upper] = quantity
+            self._marks[symbol_upper] = price
+        if self._holdings:
+            self._holdings_value += quantity * price - old_value
+        else:
+            self._holdings_value = 0.0  # Drop accumulated rounding error once flat
+
+    def _fill(self, transaction_type: str, symbol_upper: str, quantity: int, price: float) -> None:
+        """
+        Internal helper that books a successful buy or sell against the symbol's lots.
+        Call it after _mark, so a fully closed account can reset its running cost basis.
+
+        Args:
+            transaction_type (str): "buy" or "sell".
+            symbol_upper (str): Upper-cased stock symbol.
+            quantity (int): Number of shares traded.
+            price (float): Price per share.
+        """
+        lots = self._lots.get(symbol_upper)
+        if lots is None:
+            lots = self._lots[symbol_upper] = LotQueue(self.cost_basis_method)
+        basis_before = lots.cost_basis
+        if transaction_type == "buy":
+            lots.buy(quantity, price)
+        else:
+            self._realized_total += lots.sell(quantity, price)
+        if self._holdings:
+            self._cost_basis_total += lots.cost_basis - basis_before
+        else:
+            self._cost_basis_total = 0.0  # Drop accumulated rounding error once flat
+
+    def _now_ns(self) -> int:
+        """Returns the timestamp for a new transaction, in nanoseconds since the epoch."""
+        if self._clock is not None:
+            return self._clock()
+        return datetime_to_ns(datetime.datetime.now())
 
     def _record_transaction(
         self,
@@ -58,11 +232,11 @@ class Account:
         symbol: str = None,
         quantity: int = None,
         price_per_share: float = None,
-        success: bool = True,
-        message: str = ""
+        message_code: int = MSG_CUSTOM,
+        detail: Any = None
     ) -> None:
         """
-        Internal helper method to record a transaction in the _transactions list.
+        Internal helper method to record a successful transaction in the _transactions ledger.
 
         Args:
             transaction_type (str): Type of transaction (e.g., 'deposit', 'withdraw', 'buy', 'sell').
@@ -71,21 +245,266 @@ class Account:
             symbol (str, optional): Stock symbol for share transactions. Defaults to None.
             quantity (int, optional): Number of shares for share transactions. Defaults to None.
             price_per_share (float, optional): Price per share for share transactions. Defaults to None.
-            success (bool, optional): Indicates if the transaction was successful. Defaults to True.
-            message (str, optional): An optional message providing more details about the transaction.
-        """
-        transaction = {
-            'timestamp': datetime.datetime.now().isoformat(),
-            'type': transaction_type,
-            'amount_effect_on_cash': cash_change,
-            'symbol': symbol,
-            'quantity': quantity,
-            'price_per_share': price_per_share,
-            'balance_after': self._balance,  # Record balance after transaction
-            'success': success,
-            'message': message
+            message_code (int, optional): Ledger message template used to render the message
+                                          lazily. Defaults to MSG_CUSTOM, whose text is `detail`.
+            detail (Any, optional): Extra value required by the message template, if any.
+        """
+        self._transactions.append(
+            self._now_ns(),
+            transaction_type,
+            cash_change,
+            symbol,
+            quantity,
+            price_per_share,
+            self._balance,  # Record balance after transaction
+            True,
+            message_code,
+            detail,
+        )
+        self._after_append()
+
+    def _reject(
+        self,
+        transaction_type: str,
+        cash_change: float,
+        symbol: str = None,
+        quantity: int = None,
+        price_per_share: float = None,
+        message_code: int = MSG_CUSTOM,
+        detail: Any = None
+    ) -> None:
+        """
+        Internal helper method to record a rejected order in the bounded reject log.
+        The ledger is not touched, so rejects cannot grow the account's history.
+
+        Args:
+            transaction_type (str): Type of the rejected order (e.g., 'deposit', 'buy').
+            cash_change (float): The effect the order would have had on the cash balance.
+            symbol (str, optional): Stock symbol for share orders. Defaults to None.
+            quantity (int, optional): Number of shares for share orders. Defaults to None.
+            price_per_share (float, optional): Quoted price per share, if fetched. Defaults to None.
+            message_code (int, optional): Ledger message template explaining the rejection.
+                                          Defaults to MSG_CUSTOM, whose text is `detail`.
+            detail (Any, optional): Extra value required by the message template, if any.
+        """
+        self._version += 1  # Begin write: the latest message is part of a snapshot
+        try:
+            self._rejects.record(
+                self._now_ns(),
+                transaction_type,
+                cash_change,
+                symbol,
+                quantity,
+                price_per_share,
+                self._balance,
+                message_code,
+                detail,
+            )
+            self._last_rejected = True
+        finally:
+            self._end_write()
+
+    def _build_snapshot(self) -> AccountSnapshot:
+        """Internal helper that copies the current state into a new snapshot."""
+        return AccountSnapshot(
+            len(self._transactions),
+            self._balance,
+            self._initial_deposit_total,
+            MappingProxyType(self._holdings.copy()),
+            MappingProxyType(self._marks.copy()),
+            self._holdings_value,
+            self._cost_basis_total,
+            self._realized_total,
+            self._last_message(),
+        )
+
+    def _last_message(self) -> Optional[str]:
+        """Internal helper that returns the message of the latest transaction or reject."""
+        last_reject = self._rejects.last() if self._last_rejected else None
+        if last_reject is not None:
+            return last_reject['message']
+        rows = len(self._transactions)
+        return self._transactions.message(rows - 1) if rows else None
+
+    def _end_write(self) -> None:
+        """
+        Internal helper that ends a state change for snapshot readers: moves the version
+        to the next even number, and builds the snapshot a waiting reader asked for.
+        Loaders that change state without beginning a write call it too.
+        """
+        self._version = (self._version + 2) & ~1  # Next even version, from odd or even
+        if self._snapshot_requested:
+            self._snapshot_requested = False
+            self._snapshot = (self._version, self._build_snapshot())
+
+    def _finish_write(self) -> None:
+        """
+        Internal helper run in a finally block after every write. If the write raised
+        before the ledger append ended it, ends it here, so snapshot readers never wait
+        on a version that stays odd.
+        """
+        if self._version & 1:
+            self._end_write()
+
+    def _after_append(self) -> None:
+        """
+        Internal hook run after every ledger write. Ends the write for snapshot readers,
+        takes a checkpoint of the account state once `checkpoint_interval` rows have been
+        written since the previous one, then publishes the new rows to change feed subscribers.
+        The cash balance is not part of a checkpoint: the ledger records it on every row.
+        """
+        self._last_rejected = False
+        self._end_write()
+        rows = len(self._transactions)
+        if rows - self._checkpoint_rows[-1] >= self._checkpoint_interval:
+            self._checkpoint_rows.append(rows)
+            self._checkpoints.append((self._initial_deposit_total, self._holdings.copy(), self._marks.copy()))
+        self._feed.publish(self._transactions)
+
+    def _export_state(self) -> Dict[str, Any]:
+        """
+        Internal helper that captures the state derived from the ledger, so that it can be
+        restored with _import_state instead of replaying every row.
+
+        Returns:
+            Dict[str, Any]: A JSON-serializable dict of the balance, deposit total,
+                            holdings, marks, cost basis method and tax lots.
+        """
+        return {
+            'balance': self._balance,
+            'initial_deposit_total': self._initial_deposit_total,
+            'holdings': dict(self._holdings),
+            'marks': dict(self._marks),
+            'cost_basis_method': self.cost_basis_method,
+            'lots': {symbol: lots.to_state() for symbol, lots in self._lots.items()},
         }
-        self._transactions.append(transaction)
+
+    def _import_state(self, state: Dict[str, Any]) -> bool:
+        """
+        Internal helper that restores state captured by _export_state into a fresh account.
+        The cash balance is left to the caller, which takes it from the ledger.
+
+        Args:
+            state (Dict[str, Any]): The captured state.
+
+        Returns:
+            bool: False, restoring nothing, if the state was captured under a different
+                  cost basis method (its lots would be wrong for this account).
+        """
+        if state.get('cost_basis_method') != self.cost_basis_method:
+            return False
+        self._initial_deposit_total = state['initial_deposit_total']
+        for symbol, quantity in state['holdings'].items():
+            self._mark(symbol, quantity, state['marks'][symbol])
+        for symbol, lots_state in state['lots'].items():
+            lots = self._lots[symbol] = LotQueue.from_state(lots_state, self.cost_basis_method)
+            self._cost_basis_total += lots.cost_basis
+            self._realized_total += lots.realized
+        return True
+
+    def _replay(self, start: int, stop: int) -> None:
+        """
+        Internal helper that applies the successful ledger rows in a range to the deposit
+        total, holdings, marks and lots, e.g. after loading a ledger from storage. The
+        rows are not written again, and the cash balance is left to the caller.
+
+        Args:
+            start (int): First row position.
+            stop (int): One past the last row position.
+        """
+        for transaction_type, cash_change, symbol, quantity, price in self._transactions.iter_successful(start, stop):
+            if transaction_type == "deposit":
+                self._initial_deposit_total += cash_change
+            elif transaction_type in ("buy", "sell"):
+                symbol_upper = symbol.upper()
+                held = self._holdings.get(symbol_upper, 0)
+                self._mark(symbol_upper, held + quantity if transaction_type == "buy" else held - quantity, price)
+                self._fill(transaction_type, symbol_upper, quantity, price)
+
+    def _restore(self, state: Optional[Dict[str, Any]] = None, state_rows: int = 0) -> int:
+        """
+        Internal helper that rebuilds a fresh account whose ledger rows were just loaded
+        from storage. Restores `state`, if usable, and replays only the rows after it; takes
+        the cash balance from the ledger; and takes a checkpoint every `checkpoint_interval`
+        rows across the whole history, as live writes would have, so point-in-time queries
+        on the loaded account stay O(log n) plus one interval.
+
+        Args:
+            state (Dict[str, Any], optional): State captured by _export_state. Defaults to
+                                              None, replaying every row.
+            state_rows (int, optional): Ledger length when `state` was captured. Defaults to 0.
+
+        Returns:
+            int: The row position replay started from: `state_rows` if the state was
+                 restored, otherwise 0.
+        """
+        rows = len(self._transactions)
+        interval = self._checkpoint_interval
+        start = 0
+        # Ignore a state ahead of the stored rows, or built with other lot rules
+        if state is not None and state_rows <= rows and self._import_state(state):
+            start = state_rows
+
+        # Rows covered by the restored state: checkpoints only need deposits, holdings and marks
+        deposits, holdings, marks = 0.0, {}, {}
+        position = 0
+        for boundary in range(interval, start + 1, interval):
+            deposits = self._advance(deposits, holdings, marks, position, boundary)
+            position = boundary
+            self._checkpoint_rows.append(boundary)
+            self._checkpoints.append((deposits, holdings.copy(), marks.copy()))
+
+        position = start
+        for boundary in range(start - start % interval + interval, rows + 1, interval):
+            self._replay(position, boundary)
+            position = boundary
+            self._checkpoint_rows.append(boundary)
+            self._checkpoints.append((self._initial_deposit_total, self._holdings.copy(), self._marks.copy()))
+        self._replay(position, rows)
+        self._balance = self._transactions.balance_after(rows - 1) if rows else 0.0
+        return start
+
+    def _advance(self, deposits: float, holdings: Dict[str, int], marks: Dict[str, float], start: int, stop: int) -> float:
+        """
+        Internal helper that applies the successful ledger rows in a range to a deposit
+        total and to holdings and marks dicts, which are updated in place.
+
+        Returns:
+            float: The deposit total after the rows.
+        """
+        for transaction_type, cash_change, symbol, quantity, price in self._transactions.iter_successful(start, stop):
+            if transaction_type == "deposit":
+                deposits += cash_change
+            elif transaction_type in ("buy", "sell"):
+                symbol_upper = symbol.upper()
+                held = holdings.get(symbol_upper, 0) + (quantity if transaction_type == "buy" else -quantity)
+                if held == 0:
+                    holdings.pop(symbol_upper, None)
+                    marks.pop(symbol_upper, None)
+                else:
+                    holdings[symbol_upper] = held
+                    marks[symbol_upper] = price
+        return deposits
+
+    def _state_at(self, timestamp: datetime.datetime) -> tuple:
+        """
+        Internal helper that rebuilds the account state as of a point in time. The ledger
+        position is found by binary search over timestamps, then roughly one checkpoint
+        interval of rows is replayed on top of the nearest earlier checkpoint.
+
+        Args:
+            timestamp (datetime.datetime): The point in time (inclusive).
+
+        Returns:
+            tuple: (balance, deposit total, holdings, marks) as of `timestamp`.
+        """
+        rows = self._transactions.count_until(datetime_to_ns(timestamp))
+        index = bisect.bisect_right(self._checkpoint_rows, rows) - 1
+        deposits, holdings, marks = self._checkpoints[index]
+        holdings, marks = holdings.copy(), marks.copy()
+        deposits = self._advance(deposits, holdings, marks, self._checkpoint_rows[index], rows)
+        balance = self._transactions.balance_after(rows - 1) if rows else 0.0
+        return balance, deposits, holdings, marks
 
     def deposit(self, amount: float) -> bool:
         """
@@ -98,17 +517,21 @@ class Account:
             bool: True if the deposit was successful, False otherwise.
         """
         if amount <= 0:
-            self._record_transaction(
-                "deposit", 0.0, success=False, message="Deposit amount must be positive."
+            self._reject(
+                "deposit", 0.0, message_code=MSG_DEPOSIT_NOT_POSITIVE
             )
             return False
         
-        self._balance += amount
-        self._initial_deposit_total += amount  # Accumulate for profit/loss calculation
-        self._record_transaction(
-            "deposit", amount, success=True, message=f"Deposited {amount:.2f}"
-        )
-        return True
+        self._version += 1  # Begin write
+        try:
+            self._balance += amount
+            self._initial_deposit_total += amount  # Accumulate for profit/loss calculation
+            self._record_transaction(
+                "deposit", amount, message_code=MSG_DEPOSITED
+            )
+            return True
+        finally:
+            self._finish_write()
 
     def withdraw(self, amount: float) -> bool:
         """
@@ -121,25 +544,74 @@ class Account:
             bool: True if the withdrawal was successful, False otherwise.
         """
         if amount <= 0:
-            self._record_transaction(
-                "withdraw", 0.0, success=False, message="Withdrawal amount must be positive."
+            self._reject(
+                "withdraw", 0.0, message_code=MSG_WITHDRAW_NOT_POSITIVE
             )
             return False
         
         if self._balance < amount:
-            self._record_transaction(
-                "withdraw", -amount, success=False,
-                message=f"Insufficient funds. Available: {self._balance:.2f}, Requested: {amount:.2f}"
+            self._reject(
+                "withdraw", -amount, message_code=MSG_INSUFFICIENT_FUNDS
             )
             return False
         
-        self._balance -= amount
-        self._record_transaction(
-            "withdraw", -amount, success=True, message=f"Withdrew {amount:.2f}"
-        )
-        return True
+        self._version += 1  # Begin write
+        try:
+            self._balance -= amount
+            self._record_transaction(
+                "withdraw", -amount, message_code=MSG_WITHDREW
+            )
+            return True
+        finally:
+            self._finish_write()
 
-    def buy_shares(self, symbol: str, quantity: int) -> bool:
+    def _buy_price(self, symbol: str, quantity: int, price: Optional[float]) -> Optional[float]:
+        """
+        Internal helper that validates a purchase, logging the reject if it would fail.
+
+        Returns:
+            Optional[float]: The price per share to buy at, or None if the purchase was rejected.
+        """
+        if quantity <= 0:
+            self._reject(
+                "buy", 0.0, symbol, quantity, message_code=MSG_QUANTITY_NOT_POSITIVE
+            )
+            return None
+
+        if price is None:
+            price = self.price_provider.get_price(symbol)
+        if price <= 0:
+            self._reject(
+                "buy", 0.0, symbol, quantity, price, message_code=MSG_UNKNOWN_SYMBOL
+            )
+            return None
+
+        cost = price * quantity
+        if self._balance < cost:
+            self._reject(
+                "buy", -cost, symbol, quantity, price,
+                message_code=MSG_INSUFFICIENT_FUNDS_TO_BUY
+            )
+            return None
+        return price
+
+    def can_buy(self, symbol: str, quantity: int, price: float = None) -> bool:
+        """
+        Checks whether buy_shares() would succeed, without buying. A purchase that would
+        fail is logged in the reject log exactly as buy_shares() would log it.
+
+        Args:
+            symbol (str): The stock ticker symbol (e.g., 'AAPL').
+            quantity (int): The number of shares to buy.
+            price (float, optional): Execution price per share, e.g. an order book fill.
+                                     Defaults to the price provider's current price.
+
+        Returns:
+            bool: True if the purchase would succeed, False if it was rejected.
+        """
+        return self._buy_price(symbol, quantity, price) is not None
+
+    def buy_shares(self, symbol: str, quantity: int, price: float = None) -> bool:
         """
         Purchases shares of a given stock. Funds are deducted from the cash balance.
         Records a 'buy' transaction.
@@ -147,41 +619,31 @@ class Account:
         Args:
             symbol (str): The stock ticker symbol (e.g., 'AAPL').
             quantity (int): The number of shares to buy.
+            price (float, optional): Execution price per share, e.g. an order book fill.
+                                     Defaults to the price provider's current price.
 
         Returns:
             bool: True if the purchase was successful, False otherwise.
         """
-        if quantity <= 0:
-            self._record_transaction(
-                "buy", 0.0, symbol, quantity, success=False, message="Quantity must be positive."
-            )
+        price = self._buy_price(symbol, quantity, price)
+        if price is None:
             return False
-
-        price = get_share_price(symbol)
-        if price <= 0:
-            self._record_transaction(
-                "buy", 0.0, symbol, quantity, price, success=False,
-                message=f"Invalid or unknown symbol: {symbol}. Cannot get price."
-            )
-            return False
-
         cost = price * quantity
-        if self._balance < cost:
+
+        self._version += 1  # Begin write
+        try:
+            self._balance -= cost
+            symbol_upper = symbol.upper()
+            self._mark(symbol_upper, self._holdings.get(symbol_upper, 0) + quantity, price)
+            self._fill("buy", symbol_upper, quantity, price)
             self._record_transaction(
-                "buy", -cost, symbol, quantity, price, success=False,
-                message=f"Insufficient funds to buy {quantity} {symbol}. Cost: {cost:.2f}, Available: {self._balance:.2f}"
+                "buy", -cost, symbol, quantity, price, message_code=MSG_BOUGHT
             )
-            return False
-        
-        self._balance -= cost
-        self._holdings[symbol.upper()] = self._holdings.get(symbol.upper(), 0) + quantity
-        self._record_transaction(
-            "buy", -cost, symbol, quantity, price, success=True,
-            message=f"Bought {quantity} {symbol} at {price:.2f} each."
-        )
-        return True
+            return True
+        finally:
+            self._finish_write()
 
-    def sell_shares(self, symbol: str, quantity: int) -> bool:
+    def sell_shares(self, symbol: str, quantity: int, price: float = None) -> bool:
         """
         Sells shares of a given stock. Funds are added to the cash balance.
         Records a 'sell' transaction.
@@ -189,45 +651,158 @@ class Account:
         Args:
             symbol (str): The stock ticker symbol (e.g., 'AAPL').
             quantity (int): The number of shares to sell.
+            price (float, optional): Execution price per share, e.g. an order book fill.
+                                     Defaults to the price provider's current price.
 
         Returns:
             bool: True if the sale was successful, False otherwise.
         """
         if quantity <= 0:
-            self._record_transaction(
-                "sell", 0.0, symbol, quantity, success=False, message="Quantity must be positive."
+            self._reject(
+                "sell", 0.0, symbol, quantity, message_code=MSG_QUANTITY_NOT_POSITIVE
             )
             return False
         
         symbol_upper = symbol.upper()
         if self._holdings.get(symbol_upper, 0) < quantity:
-            self._record_transaction(
-                "sell", 0.0, symbol, quantity, success=False,
-                message=f"Not enough {symbol} shares to sell. Have: {self._holdings.get(symbol_upper, 0)}, Requested: {quantity}"
+            self._reject(
+                "sell", 0.0, symbol, quantity,
+                message_code=MSG_NOT_ENOUGH_SHARES, detail=self._holdings.get(symbol_upper, 0)
             )
             return False
         
-        price = get_share_price(symbol)
+        if price is None:
+            price = self.price_provider.get_price(symbol)
         if price <= 0:
-            self._record_transaction(
-                "sell", 0.0, symbol, quantity, price, success=False,
-                message=f"Invalid or unknown symbol: {symbol}. Cannot get price."
+            self._reject(
+                "sell", 0.0, symbol, quantity, price, message_code=MSG_UNKNOWN_SYMBOL
             )
             return False
             
         revenue = price * quantity
-        self._balance += revenue
-        self._holdings[symbol_upper] -= quantity
-        
-        # Clean up holdings if quantity becomes zero
-        if self._holdings[symbol_upper] == 0:
-            del self._holdings[symbol_upper]
+        self._version += 1  # Begin write
+        try:
+            self._balance += revenue
+            # Marks the remaining position at the sale price; a zero quantity clears it
+            self._mark(symbol_upper, self._holdings[symbol_upper] - quantity, price)
+            self._fill("sell", symbol_upper, quantity, price)
 
-        self._record_transaction(
-            "sell", revenue, symbol, quantity, price, success=True,
-            message=f"Sold {quantity} {symbol} at {price:.2f} each."
-        )
-        return True
+            self._record_transaction(
+                "sell", revenue, symbol, quantity, price, message_code=MSG_SOLD
+            )
+            return True
+        finally:
+            self._finish_write()
+
+    def execute_batch(self, orders: List[Dict[str, Any]], record_failure: bool = True) -> bool:
+        """
+        Executes several orders as one all-or-nothing unit. Every symbol in the batch is
+        priced once up front, the whole batch is validated in order against the running
+        cash balance and holdings, and only then applied with a single bulk ledger write.
+
+        Each order is a dictionary with a 'type' key:
+            {'type': 'deposit', 'amount': 1000.0}
+            {'type': 'withdraw', 'amount': 250.0}
+            {'type': 'buy', 'symbol': 'AAPL', 'quantity': 10}
+            {'type': 'sell', 'symbol': 'AAPL', 'quantity': 5}
+
+        If any order would fail, nothing is applied; the first failing order is recorded
+        in the reject log, exactly as the matching single-order method would.
+
+        Args:
+            orders (List[Dict[str, Any]]): The orders to execute, in order.
+            record_failure (bool, optional): Whether a rejected batch logs its first
+                                             failing order as a reject. Callers that retry the orders
+                                             one by one pass False. Defaults to True.
+
+        Returns:
+            bool: True if every order was applied, False if the batch was rejected.
+
+        Raises:
+            ValueError: If an order has an unknown 'type'.
+        """
+        to_price: Dict[str, str] = {}  # Upper symbol -> symbol as first given in the batch
+        for order in orders:
+            if order['type'] in ("buy", "sell") and order['quantity'] > 0:
+                to_price.setdefault(order['symbol'].upper(), order['symbol'])
+        # One bulk price snapshot for the whole batch
+        snapshot = self.price_provider.get_prices(list(to_price.values())) if to_price else {}
+        # A provider may leave out symbols it does not know; those are rejected as unknown
+        prices = {symbol_upper: snapshot.get(symbol, 0.0) for symbol_upper, symbol in to_price.items()}
+
+        balance = self._balance
+        deposits = self._initial_deposit_total
+        holdings: Dict[str, int] = {}  # Only the symbols this batch touches
+        rows = []
+        for order in orders:
+            transaction_type = order['type']
+            if transaction_type in ("deposit", "withdraw"):
+                amount = order['amount']
+                cash_change = amount if transaction_type == "deposit" else -amount
+                symbol = quantity = price = None
+                if amount <= 0:
+                    cash_change = 0.0
+                    failure = (MSG_DEPOSIT_NOT_POSITIVE if transaction_type == "deposit"
+                               else MSG_WITHDRAW_NOT_POSITIVE), None
+                elif transaction_type == "withdraw" and balance < amount:
+                    failure = MSG_INSUFFICIENT_FUNDS, None
+                else:
+                    failure = None
+                    if transaction_type == "deposit":
+                        deposits += amount
+                    code = MSG_DEPOSITED if transaction_type == "deposit" else MSG_WITHDREW
+            elif transaction_type in ("buy", "sell"):
+                symbol, quantity = order['symbol'], order['quantity']
+                symbol_upper = symbol.upper()
+                held = holdings.get(symbol_upper, self._holdings.get(symbol_upper, 0))
+                price = prices.get(symbol_upper)
+                cash_change = 0.0
+                if quantity <= 0:
+                    price = None
+                    failure = MSG_QUANTITY_NOT_POSITIVE, None
+                elif transaction_type == "sell" and held < quantity:
+                    price = None
+                    failure = MSG_NOT_ENOUGH_SHARES, held
+                elif price <= 0:
+                    failure = MSG_UNKNOWN_SYMBOL, None
+                elif transaction_type == "buy":
+                    cash_change = -price * quantity
+                    failure = (MSG_INSUFFICIENT_FUNDS_TO_BUY, None) if balance < -cash_change else None
+                    holdings[symbol_upper] = held + quantity
+                    code = MSG_BOUGHT
+                else:
+                    cash_change = price * quantity
+                    failure = None
+                    holdings[symbol_upper] = held - quantity
+                    code = MSG_SOLD
+            else:
+                raise ValueError(f"Unknown order type: {transaction_type!r}")
+
+            if failure is not None:
+                # Reject the whole batch; record why, against the untouched account state
+                if record_failure:
+                    self._reject(
+                        transaction_type, cash_change, symbol, quantity, price,
+                        message_code=failure[0], detail=failure[1]
+                    )
+                return False
+            balance += cash_change
+            rows.append((transaction_type, cash_change, symbol, quantity, price, balance, True, code, None))
+
+        self._version += 1  # Begin write
+        try:
+            self._balance = balance
+            self._initial_deposit_total = deposits
+            for symbol_upper, quantity in holdings.items():
+                self._mark(symbol_upper, quantity, prices[symbol_upper])
+            for transaction_type, _, symbol, quantity, price, *_ in rows:
+                if transaction_type in ("buy", "sell"):
+                    self._fill(transaction_type, symbol.upper(), quantity, price)
+            self._transactions.extend(self._now_ns(), rows)
+            self._after_append()
+            return True
+        finally:
+            self._finish_write()
 
     def get_balance(self) -> float:
         """
@@ -238,6 +813,80 @@ class Account:
         """
         return self._balance
 
+    def get_snapshot(self) -> AccountSnapshot:
+        """
+        Returns the account state as of the latest completed ledger write or reprice (or a
+        write completed during the call), as one immutable snapshot. Reading several figures
+        from the same snapshot never mixes states from before and after a trade, even while
+        another thread keeps trading.
+
+        No lock is taken, and writers pay only two counter increments per change. The reader
+        copies the state, then checks the version did not move while it copied (a seqlock);
+        if it did, it copies again. A reader that arrives in the middle of a write asks the
+        writer to build the snapshot when the write ends, rather than retrying until it
+        catches the writer between trades. The snapshot is cached until the next change, so
+        repeated reads between trades cost nothing.
+
+        Returns:
+            AccountSnapshot: Balance, deposits, read-only holdings and marks, holdings
+                             value, cost basis, realized P&L and ledger length, plus the
+                             derived portfolio_value and profit_loss.
+        """
+        oldest = self._version & ~1  # The last write completed when the call started
+        while True:
+            version = self._version
+            cached_version, snapshot = self._snapshot
+            if cached_version >= oldest:
+                return snapshot
+            if version & 1:
+                self._snapshot_requested = True
+                time.sleep(0)  # Let the writer thread finish the write and build the snapshot
+                continue
+            snapshot = self._build_snapshot()
+            if self._version == version:
+                self._snapshot = (version, snapshot)
+                return snapshot
+
+    def get_status_snapshot(self, prices: Dict[str, float] = None) -> AccountStatus:
+        """
+        Returns every figure a status display needs, from one snapshot valued at current
+        prices, in one pass over the holdings. The account itself is not changed: its
+        marks move only through trades and reprice(), so this is as lock-free as
+        get_snapshot().
+
+        Args:
+            prices (Dict[str, float], optional): Symbol -> current price per share, if the
+                                                 caller already has them. If omitted, the
+                                                 holdings are priced with one bulk lookup
+                                                 from the price provider. A held symbol
+                                                 without a price keeps its last mark.
+
+        Returns:
+            AccountStatus: Balance, deposits, each holding with its price and value,
+                           portfolio value, P&L and the latest transaction or reject message.
+        """
+        snapshot = self.get_snapshot()
+        if prices is None:
+            prices = self.price_provider.get_prices(list(snapshot.holdings))
+        prices = {symbol.upper(): price for symbol, price in prices.items()}
+        marks = snapshot.marks
+        holdings = []
+        holdings_value = 0.0
+        for symbol, quantity in snapshot.holdings.items():
+            price = prices.get(symbol, marks[symbol])
+            holdings.append(HoldingStatus(symbol, quantity, price, quantity * price))
+            holdings_value += quantity * price
+        portfolio_value = snapshot.balance + holdings_value
+        return AccountStatus(
+            snapshot.sequence,
+            snapshot.balance,
+            snapshot.initial_deposit_total,
+            tuple(holdings),
+            portfolio_value,
+            portfolio_value - snapshot.initial_deposit_total,
+            snapshot.last_message,
+        )
+
     def get_holdings(self) -> Dict[str, int]:
         """
         Returns a copy of the current stock holdings.
@@ -258,19 +907,44 @@ class Account:
         """
         return self._initial_deposit_total
 
+    def reprice(self, prices: Dict[str, float] = None) -> None:
+        """
+        Re-marks held shares to new market prices. Only symbols whose price actually
+        changed touch the running market value, so a price tick costs O(changed symbols).
+
+        Args:
+            prices (Dict[str, float], optional): Symbol -> new price per share. Symbols
+                                                 not currently held are ignored. If omitted,
+                                                 every holding is re-priced with one bulk
+                                                 lookup from the price provider.
+        """
+        if prices is None:
+            prices = self.price_provider.get_prices(list(self._holdings))
+        changed = False
+        try:
+            for symbol, price in prices.items():
+                symbol_upper = symbol.upper()
+                quantity = self._holdings.get(symbol_upper)
+                if quantity is None or self._marks[symbol_upper] == price:
+                    continue
+                if not changed:
+                    self._version += 1  # Begin write
+                    changed = True
+                self._mark(symbol_upper, quantity, price)
+        finally:
+            if changed:
+                self._end_write()
+
     def get_portfolio_value(self) -> float:
         """
-        Calculates the total current value of the portfolio. This includes
-        the cash balance and the current market value of all held shares.
+        Returns the total current value of the portfolio. This includes
+        the cash balance and the market value of all held shares, as marked
+        by the most recent trade or reprice() call for each symbol.
 
         Returns:
             float: The total portfolio value.
         """
-        total_shares_value = 0.0
-        for symbol, quantity in self._holdings.items():
-            price = get_share_price(symbol)
-            total_shares_value += price * quantity
-        return self._balance + total_shares_value
+        return self._balance + self._holdings_value
 
     def get_profit_loss(self) -> float:
         """
@@ -282,16 +956,300 @@ class Account:
         """
         return self.get_portfolio_value() - self._initial_deposit_total
 
+    def get_cost_basis(self, symbol: str = None) -> float:
+        """
+        Returns the total cost of the shares currently held, under the account's
+        cost basis method.
+
+        Args:
+            symbol (str, optional): Limit to one stock symbol. Defaults to all holdings.
+
+        Returns:
+            float: The cost basis of the open position(s).
+        """
+        if symbol is None:
+            return self._cost_basis_total
+        lots = self._lots.get(symbol.upper())
+        return lots.cost_basis if lots else 0.0
+
+    def get_realized_profit_loss(self, symbol: str = None) -> float:
+        """
+        Returns the profit or loss locked in by past sales, each matched against
+        the lots it closed.
+
+        Args:
+            symbol (str, optional): Limit to one stock symbol. Defaults to all symbols.
+
+        Returns:
+            float: The realized profit (positive) or loss (negative).
+        """
+        if symbol is None:
+            return self._realized_total
+        lots = self._lots.get(symbol.upper())
+        return lots.realized if lots else 0.0
+
+    def get_unrealized_profit_loss(self, symbol: str = None) -> float:
+        """
+        Returns the profit or loss on shares still held, valued at their current marks.
+
+        Args:
+            symbol (str, optional): Limit to one stock symbol. Defaults to all holdings.
+
+        Returns:
+            float: Market value minus cost basis of the open position(s).
+        """
+        if symbol is None:
+            return self._holdings_value - self._cost_basis_total
+        symbol_upper = symbol.upper()
+        if symbol_upper not in self._holdings:
+            return 0.0
+        return self._lots[symbol_upper].unrealized(self._marks[symbol_upper])
+
+    def get_lots(self, symbol: str) -> List[Tuple[int, float]]:
+        """
+        Returns the open tax lots for a symbol.
+
+        Args:
+            symbol (str): The stock symbol.
+
+        Returns:
+            List[Tuple[int, float]]: (quantity, price per share) per lot, oldest first.
+                                     With the "average" method there is a single lot
+                                     at the average cost.
+        """
+        lots = self._lots.get(symbol.upper())
+        return lots.lots() if lots else []
+
+    def get_holdings_at(self, timestamp: datetime.datetime) -> Dict[str, int]:
+        """
+        Returns the stock holdings as they were at a given point in time.
+
+        Args:
+            timestamp (datetime.datetime): The point in time (inclusive), in the same
+                                           local wall-clock time as transaction timestamps.
+
+        Returns:
+            Dict[str, int]: A dictionary mapping stock symbols to quantities held at that time.
+        """
+        return self._state_at(timestamp)[2]
+
+    def get_profit_loss_at(self, timestamp: datetime.datetime, prices: Dict[str, float] = None) -> float:
+        """
+        Calculates the profit or loss as it stood at a given point in time, relative
+        to the total deposits made up to that time.
+
+        Args:
+            timestamp (datetime.datetime): The point in time (inclusive), in the same
+                                           local wall-clock time as transaction timestamps.
+            prices (Dict[str, float], optional): Symbol -> price to value the holdings at.
+                                                 Symbols not given are valued at their last
+                                                 trade price as of `timestamp`.
+
+        Returns:
+            float: The profit or loss at that time. Positive value for profit, negative for loss.
+        """
+        balance, deposits, holdings, marks = self._state_at(timestamp)
+        prices = {symbol.upper(): price for symbol, price in (prices or {}).items()}
+        shares_value = sum(
+            quantity * prices.get(symbol, marks[symbol]) for symbol, quantity in holdings.items()
+        )
+        return balance + shares_value - deposits
+
     def get_transactions(self) -> List[Dict[str, Any]]:
         """
         Returns a chronological list of all recorded transactions for the account.
 
         Returns:
             List[Dict[str, Any]]: A list where each element is a dictionary
-                                  representing a transaction. Returns a copy
-                                  to prevent external modification.
+                                  representing a transaction. The dictionaries are
+                                  built fresh from the ledger on every call, so
+                                  modifying them does not affect internal state.
+                                  This copies the whole history; prefer transactions()
+                                  or get_last_transaction() for partial reads.
+        """
+        return self._transactions.rows()
+
+    def transactions(
+        self,
+        transaction_type: str = None,
+        symbol: str = None,
+        success: bool = None,
+        start: datetime.datetime = None,
+        end: datetime.datetime = None,
+    ) -> TransactionView:
+        """
+        Returns a read-only, paginated view of the recorded transactions, optionally
+        filtered. Nothing is copied until rows are read from the view.
+
+        Args:
+            transaction_type (str, optional): Only "deposit", "withdraw", "buy" or "sell" rows.
+            symbol (str, optional): Only rows for this stock symbol (case-insensitive).
+            success (bool, optional): Only successful (True) or failed (False) transactions.
+                                      Rejected orders are kept by get_rejects() instead,
+                                      so only ledgers recovered from older journals hold
+                                      failed rows.
+            start (datetime.datetime, optional): Only transactions at or after this time.
+            end (datetime.datetime, optional): Only transactions at or before this time.
+
+        Returns:
+            TransactionView: The matching transactions, in chronological order.
+        """
+        return self._transactions.view(
+            transaction_type,
+            symbol,
+            success,
+            None if start is None else datetime_to_ns(start),
+            None if end is None else datetime_to_ns(end),
+        )
+
+    def ledger_columns(self) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Returns the ledger's raw column arrays and its symbol table, for vectorized
+        readers (e.g. valuation.equity_curve) that copy them into numpy in one step.
+        The arrays are live: do not modify them, and do not keep a buffer export of
+        them alive (see TransactionLedger.columns).
+
+        Returns:
+            Tuple[Dict[str, Any], List[str]]: The columns, keyed as TransactionLedger.columns()
+                                              describes them, and the symbol names indexed
+                                              by the 'symbols' column's codes.
+        """
+        return self._transactions.columns(), self._transactions.symbol_names()
+
+    def get_last_transaction(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the most recently recorded transaction.
+
+        Returns:
+            Optional[Dict[str, Any]]: A new dictionary for the last transaction, or None
+                                      if none have been recorded.
+        """
+        rows = len(self._transactions)
+        return self._transactions.row(rows - 1) if rows else None
+
+    def get_rejects(self, limit: int = None) -> List[Dict[str, Any]]:
+        """
+        Returns the most recent rejected orders. Only the last `reject_log_size` are kept.
+
+        Args:
+            limit (int, optional): Only the most recent `limit` rejects. Defaults to all kept.
+
+        Returns:
+            List[Dict[str, Any]]: New transaction dictionaries with 'success' False,
+                                  oldest first.
+        """
+        return self._rejects.rows(limit)
+
+    def get_last_reject(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the most recently rejected order.
+
+        Returns:
+            Optional[Dict[str, Any]]: A new dictionary for the last reject, or None if
+                                      no order has been rejected.
+        """
+        return self._rejects.last()
+
+    def get_reject_counts(self) -> Dict[str, int]:
+        """
+        Returns how many orders have been rejected, by reason, over the account's lifetime,
+        including rejects no longer kept in the log.
+
+        Returns:
+            Dict[str, int]: Reason (e.g. "insufficient_funds", "not_enough_shares") ->
+                            number of rejected orders.
+        """
+        return self._rejects.counts()
+
+    def get_sequence(self) -> int:
+        """
+        Returns the sequence number of the latest change feed event, i.e. the number of
+        ledger rows. Save it as a cursor to resume a feed later with changes() or subscribe().
+
+        Returns:
+            int: The latest sequence number, 0 if nothing has been recorded.
+        """
+        return self._feed.sequence
+
+    def changes(self, since: int = 0) -> List[Event]:
+        """
+        Returns the change feed events after a cursor, for consumers that poll.
+
+        Args:
+            since (int, optional): Last sequence number already applied. Defaults to 0,
+                                   the whole history.
+
+        Returns:
+            List[Event]: Events oldest first; see change_feed.py for their shape.
+
+        Raises:
+            ValueError: If `since` is negative or ahead of the feed.
+        """
+        return self._feed.events(self._transactions, since)
+
+    def subscribe(self, callback: Callable[[Event], None], since: int = None) -> int:
+        """
+        Registers a callback that receives every new ledger event right after it is
+        written, on the thread that made the change. An exception raised by the callback
+        propagates to that caller; the change itself is already applied.
+
+        Args:
+            callback (Callable[[Event], None]): Called with each event.
+            since (int, optional): Cursor to catch up from first: the events after it are
+                                   delivered before this method returns. Defaults to only
+                                   new events.
+
+        Returns:
+            int: Subscription id for unsubscribe().
+
+        Raises:
+            ValueError: If `since` is negative or ahead of the feed.
+        """
+        backlog = [] if since is None else self.changes(since)
+        for event in backlog:
+            callback(event)
+        return self._feed.subscribe(callback)
+
+    def unsubscribe(self, subscription_id: int) -> bool:
+        """
+        Stops a subscription.
+
+        Args:
+            subscription_id (int): Id returned by subscribe().
+
+        Returns:
+            bool: True if the subscription existed, False otherwise.
+        """
+        return self._feed.unsubscribe(subscription_id)
+
+    async def stream(self, since: int = None) -> AsyncIterator[Event]:
+        """
+        Yields every new ledger event, for asyncio consumers:
+
+            async for event in account.stream(since=cursor):
+                cursor = event['sequence']
+
+        Events are queued without bound until the consumer reads them. Changes made on
+        another thread are handed over to the event loop safely. The subscription ends
+        when the iteration stops.
+
+        Args:
+            since (int, optional): Cursor to catch up from first. Defaults to only new events.
+
+        Yields:
+            Event: Each event, oldest first.
+
+        Raises:
+            ValueError: If `since` is negative or ahead of the feed.
         """
-        return self._transactions.copy()
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        subscription_id = self.subscribe(lambda event: loop.call_soon_threadsafe(queue.put_nowait, event), since)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.unsubscribe(subscription_id)
 
 
 # --- Example Usage (for testing/demonstration) ---
@@ -389,4 +1347,8 @@ if __name__ == "__main__":
     if not transactions:
         print("No transactions recorded.")
     for i, transaction in enumerate(transactions):
-        print(f"  {i+1}. {transaction}")
\ No newline at end of file
+        print(f"  {i+1}. {transaction}")
+    print("\n--- Rejected Orders ---")
+    print(f"Counts by reason: {account.get_reject_counts()}")
+    for reject in account.get_rejects():
+        print(f"  {reject['message']}")
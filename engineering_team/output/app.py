@@ -1,83 +1,119 @@
+import os
+import threading
+
 import gradio as gr
-from accounts import Account, get_share_price
+from account_book import AccountBook
+from accounts import get_share_price
+from price_provider import CachingPriceProvider, CallablePriceProvider, FilePriceProvider
+from transaction_table import COLUMNS, TransactionTable
+
+# Prices come from the mock by default, or from a local CSV feed if PRICE_FEED_FILE is set
+price_source = (
+    FilePriceProvider(os.environ["PRICE_FEED_FILE"]) if os.environ.get("PRICE_FEED_FILE")
+    else CallablePriceProvider(get_share_price)
+)
+price_feed = CachingPriceProvider(price_source, ttl_seconds=5.0)
 
-# Initialize the single account for this demo
-trading_account = Account("demo_user")
+# Serving settings; handlers are safe to run concurrently, so these can be raised freely
+APP_CONCURRENCY = int(os.environ.get("APP_CONCURRENCY", "8"))  # Events processed at once
+APP_MAX_THREADS = int(os.environ.get("APP_MAX_THREADS", "40"))  # Worker threads for handlers
+APP_QUEUE_SIZE = int(os.environ.get("APP_QUEUE_SIZE", "0")) or None  # Waiting events; 0 is unbounded
+APP_SHARE = os.environ.get("APP_SHARE", "1") == "1"  # Create a public share link
+
+# Every browser session trades its own account, all held in one thread-safe registry
+account_book = AccountBook(price_provider=price_feed)
+# Rendered history rows per session, kept across clicks so each one only formats the new rows
+transaction_tables = {}
+transaction_tables_lock = threading.Lock()
 
 # --- Helper functions to interact with the account and format output ---
 
-def refresh_status():
-    """Fetches and formats the current status of the trading account."""
-    balance = trading_account.get_balance()
-    holdings = trading_account.get_holdings()
-    portfolio_value = trading_account.get_portfolio_value()
-    profit_loss = trading_account.get_profit_loss()
-    initial_deposit = trading_account.get_initial_deposit_total()
+def session_account_id(request: gr.Request) -> str:
+    """Returns the id of the calling session's account, opening it on first use."""
+    session = request.session_hash if request is not None and request.session_hash else "default"
+    account_id = f"session-{session}"
+    account_book.open_account(account_id)
+    return account_id
+
+def session_table(account_id: str) -> TransactionTable:
+    """Returns the session's transaction table cache, creating it on first use."""
+    with transaction_tables_lock:
+        table = transaction_tables.get(account_id)
+        if table is None:
+            table = transaction_tables[account_id] = TransactionTable(account_book.get_account(account_id), page_size=50)
+        return table
 
+def format_status(status):
+    """Formats an AccountStatus for the status outputs."""
     holdings_str = "No holdings."
-    if holdings:
-        holdings_list = []
-        for symbol, qty in holdings.items():
-            price = get_share_price(symbol)
-            holdings_list.append(f"{qty}x {symbol} (Current Price: ${price:.2f}, Value: ${qty * price:.2f})")
-        holdings_str = "\n".join(holdings_list)
+    if status.holdings:
+        holdings_str = "\n".join(
+            f"{holding.quantity}x {holding.symbol} (Current Price: ${holding.price:.2f}, Value: ${holding.value:.2f})"
+            for holding in status.holdings
+        )
 
     return (
-        f"${balance:.2f}",
+        f"${status.balance:.2f}",
         holdings_str,
-        f"${portfolio_value:.2f}",
-        f"${profit_loss:.2f}",
-        f"Total Initial Deposits: ${initial_deposit:.2f}"
+        f"${status.portfolio_value:.2f}",
+        f"${status.profit_loss:.2f}",
+        f"Total Initial Deposits: ${status.initial_deposit_total:.2f}"
     )
 
-def deposit_funds(amount: float):
-    """Deposits funds into the account and returns a message and updated status."""
-    success = trading_account.deposit(amount)
-    last_transaction = trading_account.get_transactions()[-1] if trading_account.get_transactions() else None
-    message = last_transaction['message'] if last_transaction else ("Deposit successful." if success else "Deposit failed.")
-    return message, *refresh_status()
-
-def withdraw_funds(amount: float):
-    """Withdraws funds from the account and returns a message and updated status."""
-    success = trading_account.withdraw(amount)
-    last_transaction = trading_account.get_transactions()[-1] if trading_account.get_transactions() else None
-    message = last_transaction['message'] if last_transaction else ("Withdrawal successful." if success else "Withdrawal failed.")
-    return message, *refresh_status()
-
-def buy_shares_action(symbol: str, quantity: int):
-    """Buys shares for the account and returns a message and updated status."""
-    success = trading_account.buy_shares(symbol, quantity)
-    last_transaction = trading_account.get_transactions()[-1] if trading_account.get_transactions() else None
-    message = last_transaction['message'] if last_transaction else ("Buy successful." if success else "Buy failed.")
-    return message, *refresh_status()
-
-def sell_shares_action(symbol: str, quantity: int):
-    """Sells shares from the account and returns a message and updated status."""
-    success = trading_account.sell_shares(symbol, quantity)
-    last_transaction = trading_account.get_transactions()[-1] if trading_account.get_transactions() else None
-    message = last_transaction['message'] if last_transaction else ("Sell successful." if success else "Sell failed.")
-    return message, *refresh_status()
-
-def get_transactions_display():
-    """Formats the transaction history for display in a Gradio Dataframe."""
-    transactions = trading_account.get_transactions()
-    if not transactions:
-        return [] # Empty list for gr.Dataframe
-    
-    data = []
-    for t in transactions:
-        data.append([
-            t['timestamp'],
-            t['type'],
-            t['symbol'] if t['symbol'] else '',
-            t['quantity'] if t['quantity'] is not None else '',
-            f"{t['price_per_share']:.2f}" if t['price_per_share'] is not None else '',
-            f"{t['amount_effect_on_cash']:.2f}",
-            f"{t['balance_after']:.2f}",
-            "Yes" if t['success'] else "No",
-            t['message']
-        ])
-    return data
+def refresh_status(request: gr.Request):
+    """Fetches and formats the current status of the session's account."""
+    # The status is built from a lock-free snapshot, so a refresh never waits on a trade
+    status = account_book.get_account(session_account_id(request)).get_status_snapshot()
+    return format_status(status)
+
+def account_action(account_id: str, action, fallback: str):
+    """Runs an action on the account and returns its message and the status right after it."""
+    # One locked block, so no other trade on the account lands between the two
+    with account_book.locked(account_id) as account:
+        success = action(account)
+        status = account.get_status_snapshot()
+    return status.last_message or f"{fallback} {'successful' if success else 'failed'}.", *format_status(status)
+
+def deposit_funds(amount: float, request: gr.Request):
+    """Deposits funds into the session's account and returns a message and updated status."""
+    return account_action(session_account_id(request), lambda account: account.deposit(amount), "Deposit")
+
+def withdraw_funds(amount: float, request: gr.Request):
+    """Withdraws funds from the session's account and returns a message and updated status."""
+    return account_action(session_account_id(request), lambda account: account.withdraw(amount), "Withdrawal")
+
+def buy_shares_action(symbol: str, quantity: int, request: gr.Request):
+    """Buys shares for the session's account and returns a message and updated status."""
+    return account_action(session_account_id(request), lambda account: account.buy_shares(symbol, quantity), "Buy")
+
+def sell_shares_action(symbol: str, quantity: int, request: gr.Request):
+    """Sells shares from the session's account and returns a message and updated status."""
+    return account_action(session_account_id(request), lambda account: account.sell_shares(symbol, quantity), "Sell")
+
+def get_transactions_display(page: float, request: gr.Request):
+    """Returns one page of the session's transaction history, newest first, and a page label."""
+    account_id = session_account_id(request)
+    table = session_table(account_id)
+    with account_book.locked(account_id):  # No trade lands while new rows are rendered
+        rows, page, pages = table.page(page or 1)
+    label = f"Page {page} of {pages} ({len(table)} transactions)"
+    return rows, page, label
+
+def older_transactions_page(page: float, request: gr.Request):
+    """Shows the next older page of the transaction history."""
+    return get_transactions_display((page or 1) + 1, request)
+
+def newer_transactions_page(page: float, request: gr.Request):
+    """Shows the next newer page of the transaction history."""
+    return get_transactions_display((page or 1) - 1, request)
+
+def end_session(request: gr.Request):
+    """Closes a finished session's account and drops its rendered rows."""
+    if request is not None and request.session_hash:
+        account_id = f"session-{request.session_hash}"
+        with transaction_tables_lock:
+            transaction_tables.pop(account_id, None)
+        account_book.close_account(account_id)
 
 # --- Gradio UI Definition ---
 
@@ -121,19 +157,20 @@ with gr.Blocks(title="Trading Account Simulator") as demo:
     
     gr.Markdown("---")
     gr.Markdown("## Transaction History")
-    transactions_columns = [
-        "Timestamp", "Type", "Symbol", "Quantity", "Price/Share",
-        "Cash Effect", "Balance After", "Success", "Message"
-    ]
     transactions_table = gr.Dataframe(
-        headers=transactions_columns,
-        col_count=(len(transactions_columns), "fixed"),
+        headers=COLUMNS,
+        col_count=(len(COLUMNS), "fixed"),
         type="array", # Use "array" when passing a list of lists
-        label="Full Transaction History",
+        label="Transaction History (newest first)",
         interactive=False,
         row_count=(5, "dynamic"),
         wrap=True # Allows text wrapping in cells
     )
+    with gr.Row():
+        newer_page_btn = gr.Button("< Newer")
+        transactions_page = gr.Number(label="Page", value=1, precision=0, minimum=1)
+        older_page_btn = gr.Button("Older >")
+    transactions_page_info = gr.Markdown()
     show_transactions_btn = gr.Button("Show/Refresh Transactions History")
 
 
@@ -147,6 +184,8 @@ with gr.Blocks(title="Trading Account Simulator") as demo:
         profit_loss_output,
         initial_deposit_total_output
     ]
+    # Outputs that are updated by showing a page of transactions
+    transactions_outputs = [transactions_table, transactions_page, transactions_page_info]
 
     # Initial load of the UI
     demo.load(
@@ -155,13 +194,14 @@ with gr.Blocks(title="Trading Account Simulator") as demo:
         outputs=status_outputs
     ).then( # Chain to also load transactions on startup
         get_transactions_display,
-        inputs=None,
-        outputs=[transactions_table]
+        inputs=[transactions_page],
+        outputs=transactions_outputs
     )
 
     # Refresh Status button
     refresh_btn.click(
         refresh_status,
+        api_name="status",
         inputs=None,
         outputs=status_outputs
     )
@@ -169,53 +209,80 @@ with gr.Blocks(title="Trading Account Simulator") as demo:
     # Deposit button
     deposit_btn.click(
         deposit_funds,
+        api_name="deposit",
         inputs=[deposit_amount],
         outputs=[action_message_output] + status_outputs
     ).then( # Update transactions after deposit
         get_transactions_display,
-        inputs=None,
-        outputs=[transactions_table]
+        inputs=[transactions_page],
+        outputs=transactions_outputs
     )
 
     # Withdraw button
     withdraw_btn.click(
         withdraw_funds,
+        api_name="withdraw",
         inputs=[withdraw_amount],
         outputs=[action_message_output] + status_outputs
     ).then( # Update transactions after withdrawal
         get_transactions_display,
-        inputs=None,
-        outputs=[transactions_table]
+        inputs=[transactions_page],
+        outputs=transactions_outputs
     )
 
     # Buy Shares button
     buy_btn.click(
         buy_shares_action,
+        api_name="buy",
         inputs=[buy_symbol, buy_quantity],
         outputs=[action_message_output] + status_outputs
     ).then( # Update transactions after buy
         get_transactions_display,
-        inputs=None,
-        outputs=[transactions_table]
+        inputs=[transactions_page],
+        outputs=transactions_outputs
     )
 
     # Sell Shares button
     sell_btn.click(
         sell_shares_action,
+        api_name="sell",
         inputs=[sell_symbol, sell_quantity],
         outputs=[action_message_output] + status_outputs
     ).then( # Update transactions after sell
         get_transactions_display,
-        inputs=None,
-        outputs=[transactions_table]
+        inputs=[transactions_page],
+        outputs=transactions_outputs
     )
 
     # Show Transactions button
     show_transactions_btn.click(
         get_transactions_display,
-        inputs=None,
-        outputs=[transactions_table]
+        api_name="transactions",
+        inputs=[transactions_page],
+        outputs=transactions_outputs
+    )
+
+    # Paging through the transaction history
+    newer_page_btn.click(
+        newer_transactions_page,
+        inputs=[transactions_page],
+        outputs=transactions_outputs
+    )
+    older_page_btn.click(
+        older_transactions_page,
+        inputs=[transactions_page],
+        outputs=transactions_outputs
     )
+    transactions_page.submit(
+        get_transactions_display,
+        inputs=[transactions_page],
+        outputs=transactions_outputs
+    )
+
+    # Free the session's account and cached rows when its browser tab closes
+    demo.unload(end_session)
 
 # Launch the Gradio application
-demo.launch(share=True)
\ No newline at end of file
+if __name__ == "__main__":
+    demo.queue(default_concurrency_limit=APP_CONCURRENCY, max_size=APP_QUEUE_SIZE)
+    demo.launch(share=APP_SHARE, max_threads=APP_MAX_THREADS)
\ No newline at end of file
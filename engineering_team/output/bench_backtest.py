@@ -0,0 +1,91 @@
+"""
+Measures backtest throughput: reading tick files, running strategies through
+Backtest, and sweeping parameters across processes.
+
+Usage:
+    python bench_backtest.py [--ticks 5000000] [--symbols 50] [--sweep-ticks 1000000] [--processes 4]
+
+Measured on CPython 3.11, x86-64, 5M ticks over 50 symbols:
+    read binary:                 ~5.1M ticks/s
+    read CSV:                    ~0.7M ticks/s
+    backtest, no-op strategy:    ~2.8M ticks/s
+    backtest, EMA crossover:     ~1.0M ticks/s
+The sweep runs one combination per process, so it scales with cores. On the
+single-CPU machine above, 8 combinations x 1M ticks took ~9.9 s serially and
+~10.4 s with 4 processes, i.e. ~5% process overhead and no gain.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from backtest import Backtest, MovingAverageCrossover, TickFile, parameter_grid, sweep, write_ticks
+
+
+def random_walk(ticks: int, symbols: int, seed: int = 0):
+    """Yields `ticks` random-walk ticks, one second apart, round-robin over symbols."""
+    rng = random.Random(seed)
+    names = [f"S{i:03d}" for i in range(symbols)]
+    prices = [rng.uniform(20, 500) for _ in names]
+    start_ns = 1_672_531_200 * 1_000_000_000
+    for i in range(ticks):
+        code = i % symbols
+        prices[code] *= 1.0 + rng.gauss(0.0, 0.002)
+        yield start_ns + i * 1_000_000_000, names[code], prices[code]
+
+
+def noop(backtest, timestamp_ns, symbol, price):
+    """Strategy that never trades, to measure the engine's own overhead."""
+
+
+def timed(label: str, ticks: int, run) -> None:
+    started = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {ticks / elapsed / 1e6:6.2f}M ticks/s  ({elapsed:.2f} s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ticks", type=int, default=5_000_000)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--sweep-ticks", type=int, default=1_000_000)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="bench_backtest_")
+    try:
+        binary_path = os.path.join(scratch, "ticks.bin")
+        csv_path = os.path.join(scratch, "ticks.csv")
+        write_ticks(binary_path, random_walk(args.ticks, args.symbols))
+        with open(csv_path, "w") as csv_file:
+            for timestamp_ns, symbol, price in random_walk(args.ticks, args.symbols):
+                csv_file.write(f"{timestamp_ns},{symbol},{price!r}\n")
+
+        def drain(path):
+            with TickFile(path) as ticks:
+                for _ in ticks:
+                    pass
+
+        def backtest(strategy):
+            with TickFile(binary_path) as ticks:
+                Backtest(strategy).run(ticks)
+
+        timed("read binary", args.ticks, lambda: drain(binary_path))
+        timed("read CSV", args.ticks, lambda: drain(csv_path))
+        timed("backtest, no-op strategy", args.ticks, lambda: backtest(noop))
+        timed("backtest, EMA crossover", args.ticks, lambda: backtest(MovingAverageCrossover()))
+
+        sweep_path = os.path.join(scratch, "sweep.bin")
+        write_ticks(sweep_path, random_walk(args.sweep_ticks, args.symbols))
+        grid = parameter_grid(fast=[5, 10], slow=[30, 60], quantity=[10, 20])
+        for processes in (1, args.processes):
+            started = time.perf_counter()
+            sweep(sweep_path, MovingAverageCrossover, grid, processes=processes)
+            print(f"sweep of {len(grid)} x {args.sweep_ticks:,} ticks on {processes} process(es): "
+                  f"{time.perf_counter() - started:.2f} s")
+    finally:
+        shutil.rmtree(scratch)
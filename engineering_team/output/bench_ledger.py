@@ -0,0 +1,79 @@
+"""
+Measures memory and append throughput of the columnar TransactionLedger
+against the previous list-of-dicts representation.
+
+Usage:
+    python bench_ledger.py [--rows 10000000] [--dict-rows 1000000] [--sample-rows 1000000]
+
+The dict baseline is measured on fewer rows (it needs ~5 GB at 10M) and
+reported per transaction, then extrapolated to --rows. Throughput is timed
+without tracing; memory is traced on a separate run of --sample-rows rows.
+"""
+
+import argparse
+import datetime
+import time
+import tracemalloc
+
+from ledger import TransactionLedger, MSG_BOUGHT
+
+
+def fill_columnar(rows: int) -> TransactionLedger:
+    """Appends `rows` buy transactions to a TransactionLedger."""
+    ledger = TransactionLedger()
+    now_ns = time.time_ns()
+    for i in range(rows):
+        ledger.append(now_ns + i, "buy", -1700.0, "AAPL", 10, 170.0, 1000.0 + i, True, MSG_BOUGHT)
+    return ledger
+
+
+def fill_dicts(rows: int) -> list:
+    """Appends `rows` transactions in the original nine-key dict shape."""
+    transactions = []
+    for i in range(rows):
+        quantity, price = 10, 170.0
+        transactions.append({
+            'timestamp': datetime.datetime.now().isoformat(),
+            'type': "buy",
+            'amount_effect_on_cash': -price * quantity,
+            'symbol': "AAPL",
+            'quantity': quantity,
+            'price_per_share': price,
+            'balance_after': 1000.0 + i,
+            'success': True,
+            'message': f"Bought {quantity} AAPL at {price:.2f} each.",
+        })
+    return transactions
+
+
+def measure(fill, rows: int, sample_rows: int) -> dict:
+    """Times `fill(rows)` and traces the memory of `fill(sample_rows)`."""
+    started = time.perf_counter()
+    fill(rows)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    kept = fill(sample_rows)
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return {"rows": rows, "appends_per_second": rows / elapsed, "bytes_per_row": traced / sample_rows}
+
+
+def report(name: str, result: dict, scale_to: int) -> None:
+    print(
+        f"{name:>12}: {result['rows']:>11,} rows  "
+        f"{result['appends_per_second']:>12,.0f} appends/s  "
+        f"{result['bytes_per_row']:>7.1f} B/txn  "
+        f"~{result['bytes_per_row'] * scale_to / 1e9:.2f} GB at {scale_to:,}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--dict-rows", type=int, default=1_000_000)
+    parser.add_argument("--sample-rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    report("columnar", measure(fill_columnar, args.rows, args.sample_rows), args.rows)
+    report("dicts", measure(fill_dicts, args.dict_rows, args.sample_rows), args.rows)
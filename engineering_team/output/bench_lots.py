@@ -0,0 +1,89 @@
+"""
+Compares reading per-symbol cost basis and realized/unrealized P&L from an
+Account's running tax lots against reconstructing them by scanning the ledger.
+
+Usage:
+    python bench_lots.py [--trades 1000000] [--symbols 20] [--reads 1000]
+
+Measured on CPython 3.11, x86-64, 1M trades over 20 symbols (FIFO):
+    lot reads:   ~1.4 us per symbol (realized + unrealized + cost basis)
+    ledger scan: ~0.9 s per symbol
+"""
+
+import argparse
+import random
+import time
+
+from accounts import Account
+from lots import LotQueue
+from price_provider import StaticPriceProvider
+
+
+def build(trades: int, symbols: int, seed: int = 0) -> Account:
+    """Returns an account that has made `trades` random buys and sells."""
+    rng = random.Random(seed)
+    names = [f"S{i:02d}" for i in range(symbols)]
+    prices = {name: rng.uniform(10, 500) for name in names}
+    account = Account("bench", price_provider=StaticPriceProvider(prices))
+    account.deposit(1e12)
+    for _ in range(trades):
+        symbol = rng.choice(names)
+        prices[symbol] *= rng.uniform(0.98, 1.02)
+        account.price_provider = StaticPriceProvider(prices)
+        if rng.random() < 0.55:
+            account.buy_shares(symbol, rng.randint(1, 50))
+        else:
+            account.sell_shares(symbol, rng.randint(1, 50))
+    return account
+
+
+def scan(account: Account, symbol: str) -> tuple:
+    """Rebuilds a symbol's (realized, unrealized, cost basis) by replaying the whole ledger."""
+    lots = LotQueue(account.cost_basis_method)
+    last_price = 0.0
+    ledger = account._transactions
+    for transaction_type, _, traded, quantity, price in ledger.iter_successful(0, len(ledger)):
+        if traded is None or traded.upper() != symbol:
+            continue
+        if transaction_type == "buy":
+            lots.buy(quantity, price)
+        else:
+            lots.sell(quantity, price)
+        last_price = price
+    return lots.realized, lots.unrealized(last_price), lots.cost_basis
+
+
+def read(account: Account, symbol: str) -> tuple:
+    """Reads a symbol's (realized, unrealized, cost basis) from the running lots."""
+    return (
+        account.get_realized_profit_loss(symbol),
+        account.get_unrealized_profit_loss(symbol),
+        account.get_cost_basis(symbol),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trades", type=int, default=1_000_000)
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--reads", type=int, default=1000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    account = build(args.trades, args.symbols)
+    print(f"built {args.trades:,} trades in {time.perf_counter() - started:.1f} s")
+    symbols = [f"S{i:02d}" for i in range(args.symbols)]
+
+    started = time.perf_counter()
+    for i in range(args.reads):
+        read(account, symbols[i % len(symbols)])
+    lot_seconds = (time.perf_counter() - started) / args.reads
+
+    started = time.perf_counter()
+    scanned = scan(account, symbols[0])
+    scan_seconds = time.perf_counter() - started
+
+    expected = read(account, symbols[0])
+    assert all(abs(a - b) <= 1e-6 * max(1.0, abs(b)) for a, b in zip(scanned, expected)), (scanned, expected)
+    print(f"lot reads:   {lot_seconds * 1e6:10.2f} us per symbol")
+    print(f"ledger scan: {scan_seconds * 1e3:10.1f} ms per symbol")
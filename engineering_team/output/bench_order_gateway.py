@@ -0,0 +1,110 @@
+"""
+Local load generator for OrderGateway: many concurrent clients submitting
+orders to a shared set of accounts, with per-order latency percentiles.
+
+Each client is a coroutine that sends its orders one after another (closed
+loop), each to a random account. The mix is 40% buys, 40% sells, 10%
+deposits and 10% withdrawals. Some orders fail, e.g. sells without shares,
+which exercises the batch fallback path. A monitor samples the total queue
+depth to show the bound holding under load.
+
+Usage:
+    python bench_order_gateway.py [--clients 1000] [--orders 50] [--accounts 100]
+                                  [--queue-size 64] [--batch-sizes 1 64]
+
+Measured on CPython 3.11, x86-64, 1000 clients x 50 orders over 100 accounts:
+    queue size 64 (bound 6,400 > clients, so the queues never fill):
+        max_batch=1:  ~20k orders/s, p50 ~39 ms, p99 ~153 ms
+        max_batch=64: ~46k orders/s, p50 ~21 ms, p99 ~34 ms, ~5 orders per batch
+    queue size 4 (bound 400 < clients, so producers are held back):
+        max_batch=1:  ~19k orders/s, p50 ~27 ms, p99 ~353 ms, peak queued 396
+        max_batch=64: ~35k orders/s, p50 ~21 ms, p99 ~105 ms, peak queued 360
+Each batch costs one hand-off to an executor thread, which is why batching
+pays off so much more than it did when batches ran on the loop thread.
+About a quarter of the batches fall back to one-by-one execution with this
+mix, because a failing order anywhere rejects the batch.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from account_book import AccountBook
+from order_gateway import OrderGateway
+from price_provider import StaticPriceProvider
+
+SYMBOLS = ("AAPL", "TSLA", "GOOGL", "MSFT", "AMZN")
+PRICES = StaticPriceProvider({"AAPL": 170.00, "TSLA": 250.00, "GOOGL": 120.00, "MSFT": 320.00, "AMZN": 130.00})
+
+
+def random_order(rng: random.Random) -> dict:
+    roll = rng.random()
+    if roll < 0.4:
+        return {'type': 'buy', 'symbol': rng.choice(SYMBOLS), 'quantity': rng.randint(1, 5)}
+    if roll < 0.8:
+        return {'type': 'sell', 'symbol': rng.choice(SYMBOLS), 'quantity': rng.randint(1, 5)}
+    if roll < 0.9:
+        return {'type': 'deposit', 'amount': rng.uniform(100, 1000)}
+    return {'type': 'withdraw', 'amount': rng.uniform(100, 1000)}
+
+
+async def client(gateway: OrderGateway, account_ids: list, orders: int, seed: int, latencies: list) -> None:
+    rng = random.Random(seed)
+    for _ in range(orders):
+        order = random_order(rng)
+        started = time.perf_counter()
+        await gateway.submit(rng.choice(account_ids), order)
+        latencies.append(time.perf_counter() - started)
+
+
+async def monitor(gateway: OrderGateway, peak: list) -> None:
+    while True:
+        peak[0] = max(peak[0], gateway.stats()['queued'])
+        await asyncio.sleep(0.001)
+
+
+async def run(clients: int, orders: int, accounts: int, queue_size: int, max_batch: int) -> dict:
+    book = AccountBook(price_provider=PRICES)
+    account_ids = [f"user{i}" for i in range(accounts)]
+    for account_id in account_ids:
+        book.open_account(account_id).deposit(100_000.0)
+    gateway = OrderGateway(book, queue_size=queue_size, max_batch=max_batch)
+    latencies: list = []
+    peak = [0]
+    watcher = asyncio.ensure_future(monitor(gateway, peak))
+    started = time.perf_counter()
+    await asyncio.gather(*[client(gateway, account_ids, orders, seed, latencies) for seed in range(clients)])
+    elapsed = time.perf_counter() - started
+    watcher.cancel()
+    await gateway.close()
+    stats = gateway.stats()
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        'orders_per_second': len(latencies) / elapsed,
+        'p50_ms': cuts[49] * 1e3,
+        'p99_ms': cuts[98] * 1e3,
+        'orders_per_batch': stats['orders'] / stats['batches'],
+        'fallbacks': stats['fallbacks'],
+        'peak_queued': peak[0],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--orders", type=int, default=50)
+    parser.add_argument("--accounts", type=int, default=100)
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64])
+    args = parser.parse_args()
+
+    for max_batch in args.batch_sizes:
+        result = asyncio.run(run(args.clients, args.orders, args.accounts, args.queue_size, max_batch))
+        print(
+            f"max_batch={max_batch:<3} {result['orders_per_second']:>9,.0f} orders/s  "
+            f"p50 {result['p50_ms']:6.2f} ms  p99 {result['p99_ms']:6.2f} ms  "
+            f"{result['orders_per_batch']:5.1f} orders/batch  {result['fallbacks']:,} fallbacks  "
+            f"peak queued {result['peak_queued']:,} (bound {args.accounts * args.queue_size:,})"
+        )
@@ -0,0 +1,111 @@
+"""
+Measures SQLiteAccountBook throughput and resident memory as the number of
+accounts grows, against the in-memory AccountBook.
+
+Usage:
+    python bench_sqlite_book.py [--accounts 10000 100000 1000000] [--ops 200000] [--cache 10000] [--memory]
+
+For each account count a fresh book opens every account with a deposit and
+a purchase, then runs --ops trades on accounts drawn with a skew (80% of
+them hit the 5% most active accounts, the rest are uniform, so most cold
+loads are of accounts traded once before). Each size runs in its own
+process, so the reported RSS belongs to that size alone. --memory also runs
+the plain AccountBook, which keeps every account and ledger in RAM.
+Measured on CPython 3.11, x86-64, one core, 200k trades, 10k cached accounts
+(the memory rows from a 100k-trade run):
+    accounts   book     open/s   trades/s  hit rate   RSS
+    10k        sqlite   ~10k     ~22k      100%       ~140 MB
+    100k       sqlite   ~9k      ~10k      ~79%       ~155 MB
+    1M         sqlite   ~7k      ~4.8k     ~13%       ~195 MB
+    10k        memory   ~17k     ~49k      -          ~115 MB
+    100k       memory   ~14k     ~58k      -          ~680 MB
+RSS grows slowly with the account count because only the LRU is resident
+(the in-memory book would need several GB at 1M accounts). Throughput
+follows the hit rate: at 1M the hot 5% is five times the cache, and each
+miss reads an account back from SQLite.
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+
+from account_book import AccountBook
+from price_provider import StaticPriceProvider
+from sqlite_book import SQLiteAccountBook
+
+SYMBOLS = ["AAPL", "TSLA", "MSFT"]
+
+
+def resident_mb() -> float:
+    """Returns this process's current resident set size in MB (peak RSS where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(kind: str, accounts: int, ops: int, cache: int, results) -> None:
+    """Runs one book at one size and puts its measurements on the results queue."""
+    provider = StaticPriceProvider({symbol: 100.00 for symbol in SYMBOLS})
+    with tempfile.TemporaryDirectory() as directory:
+        if kind == "sqlite":
+            book = SQLiteAccountBook(os.path.join(directory, "bench.db"), cache_size=cache, price_provider=provider)
+        else:
+            book = AccountBook(price_provider=provider)
+        ids = [f"acct{i:07d}" for i in range(accounts)]
+
+        started = time.perf_counter()
+        for account_id in ids:
+            book.open_account(account_id)
+            book.execute_batch(account_id, [
+                {'type': 'deposit', 'amount': 100000.00},
+                {'type': 'buy', 'symbol': 'AAPL', 'quantity': 10},
+            ])
+        opened = time.perf_counter() - started
+
+        rng = np.random.default_rng(0)
+        hot = max(accounts // 20, 1)
+        picks = np.where(rng.random(ops) < 0.8, rng.integers(0, hot, ops), rng.integers(0, accounts, ops)).tolist()
+        symbols = rng.integers(0, len(SYMBOLS), ops).tolist()
+        buys = (rng.random(ops) < 0.6).tolist()
+        loads = 0
+        started = time.perf_counter()
+        for pick, symbol, buy in zip(picks, symbols, buys):
+            account_id = ids[pick]
+            if kind == "sqlite" and account_id not in book._cache:
+                loads += 1
+            if buy:
+                book.buy_shares(account_id, SYMBOLS[symbol], 1)
+            else:
+                book.sell_shares(account_id, SYMBOLS[symbol], 1)
+        traded = time.perf_counter() - started
+        rss = resident_mb()
+        if kind == "sqlite":
+            book.close()
+    results.put((kind, accounts, accounts / opened, ops / traded, 1 - loads / ops if kind == "sqlite" else None, rss))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--accounts", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--cache", type=int, default=10_000)
+    parser.add_argument("--memory", action="store_true", help="also run the in-memory AccountBook")
+    args = parser.parse_args()
+
+    results = multiprocessing.Queue()
+    print(f"{'accounts':>9}  {'book':6}  {'open/s':>8}  {'trades/s':>8}  {'hit rate':>8}  {'RSS':>9}")
+    for kind in ("sqlite", "memory") if args.memory else ("sqlite",):
+        for accounts in args.accounts:
+            process = multiprocessing.Process(target=run, args=(kind, accounts, args.ops, args.cache, results))
+            process.start()
+            kind_, accounts_, open_rate, trade_rate, hit_rate, rss = results.get()
+            process.join()
+            hits = f"{hit_rate:.0%}" if hit_rate is not None else "-"
+            print(f"{accounts_:>9,}  {kind_:6}  {open_rate:>8,.0f}  {trade_rate:>8,.0f}  {hits:>8}  {rss:>6,.0f} MB")
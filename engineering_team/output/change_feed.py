@@ -0,0 +1,136 @@
+"""
+Change feed of Account ledger events, for consumers that mirror account state.
+
+Every row written to an account's ledger becomes one event, published to
+each subscriber right after the write. An event carries the ledger row and
+the balance and holdings deltas it caused, so a view can apply it in O(1)
+instead of re-reading the whole history:
+
+    {
+        'sequence': 42,                       # Ledger position + 1; 0 is "before any event"
+        'transaction': {...},                 # The row, in get_transactions() shape
+        'balance': 1500.0,                    # Cash balance after the row
+        'balance_change': -500.0,             # Effect of the row on cash
+        'holdings_change': {'AAPL': 5},       # Signed share change per symbol, {} for cash rows
+    }
+
+Sequence numbers are ledger positions, so they only ever increase and stay
+valid across journal recovery and ledger file reloads. A consumer that saves
+the last sequence it applied can resume from it as a cursor and miss
+nothing. Rejected orders are not ledger rows and produce no events.
+"""
+
+from typing import Any, Callable, Dict, List
+
+from ledger import TransactionLedger
+
+Event = Dict[str, Any]
+
+
+def ledger_event(ledger: TransactionLedger, index: int) -> Event:
+    """
+    Builds the change event for one ledger row.
+
+    Args:
+        ledger (TransactionLedger): The ledger holding the row.
+        index (int): Row position.
+
+    Returns:
+        Event: The event, with sequence number `index + 1`.
+    """
+    transaction = ledger.row(index)
+    holdings_change = {}
+    if transaction['type'] in ("buy", "sell") and transaction['success']:
+        quantity = transaction['quantity']
+        holdings_change[transaction['symbol'].upper()] = quantity if transaction['type'] == "buy" else -quantity
+    return {
+        'sequence': index + 1,
+        'transaction': transaction,
+        'balance': transaction['balance_after'],
+        'balance_change': transaction['amount_effect_on_cash'],
+        'holdings_change': holdings_change,
+    }
+
+
+class ChangeFeed:
+    """
+    Publishes new ledger rows to registered callbacks, in ledger order.
+    """
+
+    def __init__(self):
+        """
+        Initializes a feed with no subscribers.
+        """
+        self._subscribers: Dict[int, Callable[[Event], None]] = {}  # Subscription id -> callback
+        self._next_id = 1
+        self.sequence = 0  # Sequence number of the last published event
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, callback: Callable[[Event], None]) -> int:
+        """
+        Registers a callback for every event published from now on.
+
+        Args:
+            callback (Callable[[Event], None]): Called with each event.
+
+        Returns:
+            int: Subscription id for unsubscribe().
+        """
+        subscription_id = self._next_id
+        self._next_id += 1
+        self._subscribers[subscription_id] = callback
+        return subscription_id
+
+    def unsubscribe(self, subscription_id: int) -> bool:
+        """
+        Removes a callback.
+
+        Args:
+            subscription_id (int): Id returned by subscribe().
+
+        Returns:
+            bool: True if the subscription existed, False otherwise.
+        """
+        return self._subscribers.pop(subscription_id, None) is not None
+
+    def events(self, ledger: TransactionLedger, since: int = 0, stop: int = None) -> List[Event]:
+        """
+        Builds the events after a cursor, e.g. to catch up a consumer.
+
+        Args:
+            ledger (TransactionLedger): The ledger the feed publishes.
+            since (int, optional): Last sequence number already seen. Defaults to 0.
+            stop (int, optional): Last sequence number to include. Defaults to the
+                                  latest published event.
+
+        Returns:
+            List[Event]: Events with sequence numbers in (since, stop], oldest first.
+
+        Raises:
+            ValueError: If `since` is negative or ahead of the feed.
+        """
+        stop = self.sequence if stop is None else stop
+        if not 0 <= since <= self.sequence:
+            raise ValueError(f"Cursor {since} is outside the feed (0 to {self.sequence}).")
+        return [ledger_event(ledger, index) for index in range(since, stop)]
+
+    def publish(self, ledger: TransactionLedger) -> None:
+        """
+        Sends every row written since the last call to each subscriber. Without
+        subscribers this only moves the sequence number, so an unobserved account pays
+        nothing per row. The sequence number moves before any callback runs, so a
+        callback that raises cannot cause the rows to be published twice.
+
+        Args:
+            ledger (TransactionLedger): The ledger the feed publishes.
+        """
+        start, self.sequence = self.sequence, len(ledger)
+        if not self._subscribers:
+            return
+        callbacks = list(self._subscribers.values())  # Callbacks may unsubscribe themselves
+        for index in range(start, self.sequence):
+            event = ledger_event(ledger, index)
+            for callback in callbacks:
+                callback(event)
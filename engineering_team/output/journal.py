@@ -0,0 +1,309 @@
+"""
+Durable Account state backed by an append-only, memory-mapped journal.
+
+Every ledger row is written to `<account_id>.journal` as a fixed-size binary
+record through a memory map. Records become durable in groups: the journal
+header holds the committed length, which is advanced and flushed every
+`commit_every` records (group commit) or on an explicit commit(). A crash
+loses at most the uncommitted group. Records past the committed length are
+ignored on recovery and overwritten.
+
+Every `snapshot_every` rows, the balance, deposit total, holdings, marks and
+tax lots are written to `<account_id>.snapshot.json` with an atomic rename. On
+startup, the ledger history is reloaded from the journal. The account state
+is restored from the latest snapshot, and only the journal tail after it is
+replayed. A snapshot taken under a different cost basis method is ignored,
+and the whole journal is replayed instead.
+
+Free-text MSG_CUSTOM messages are not journaled; they come back empty.
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, List
+
+from accounts import Account
+from ledger import TRANSACTION_TYPES
+
+_MAGIC = b"ACCTJNL1"
+_HEADER = struct.Struct("<8sq")  # Magic, committed length in bytes
+HEADER_SIZE = 64
+RECORD_SIZE = 64
+
+_KIND_TRANSACTION = 1
+_KIND_SYMBOL = 2
+# kind, type, success, message code, symbol code, timestamp ns,
+# quantity, price, cash change, balance after, detail (NaN encodes "not set")
+_TRANSACTION = struct.Struct("<Bbbbiqddddd8x")
+# kind, symbol code, UTF-8 name (NUL padded)
+_SYMBOL = struct.Struct("<B3xi56s")
+
+_TYPE_CODES = {name: code for code, name in enumerate(TRANSACTION_TYPES)}
+_NAN = float("nan")
+
+
+def _decode_optional(value: float):
+    """Decodes a NaN-encoded optional number, giving back ints for whole values."""
+    if value != value:
+        return None
+    return int(value) if value.is_integer() else value
+
+
+class Journal:
+    """
+    Append-only file of fixed-size ledger records, written through a memory map.
+    """
+
+    def __init__(self, path: str, commit_every: int = 256, grow_bytes: int = 16 * 1024 * 1024):
+        """
+        Opens or creates a journal file.
+
+        Args:
+            path (str): Path to the journal file.
+            commit_every (int, optional): Records per group commit. Defaults to 256.
+            grow_bytes (int, optional): How much to extend the file by when it fills up.
+                                        Defaults to 16 MiB.
+        """
+        self.path = path
+        self.commit_every = commit_every
+        self._grow_bytes = grow_bytes
+        exists = os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE
+        self._file = open(path, "r+b" if exists else "w+b")
+        if not exists:
+            self._file.truncate(HEADER_SIZE + grow_bytes)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        if exists:
+            magic, committed = _HEADER.unpack_from(self._map, 0)
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is not an account journal")
+        else:
+            committed = HEADER_SIZE
+            _HEADER.pack_into(self._map, 0, _MAGIC, committed)
+            self._map.flush()
+        self._committed: int = committed
+        self._end: int = committed  # Next write position
+        self._pending: int = 0  # Records written since the last commit
+        self._symbol_codes: Dict[str, int] = {}
+        self._symbol_names: List[str] = []
+        self.transaction_count: int = 0
+
+        # Rebuild the symbol table and record count from what is already on disk
+        for offset in range(HEADER_SIZE, committed, RECORD_SIZE):
+            if self._map[offset] == _KIND_SYMBOL:
+                _, code, name = _SYMBOL.unpack_from(self._map, offset)
+                self._register_symbol(name.rstrip(b"\0").decode("utf-8"), code)
+            else:
+                self.transaction_count += 1
+
+    def _register_symbol(self, symbol: str, code: int) -> None:
+        """Adds a symbol to the in-memory symbol table."""
+        self._symbol_codes[symbol] = code
+        self._symbol_names.append(symbol)
+
+    def _reserve(self) -> int:
+        """Returns the offset for the next record, growing and remapping the file if it is full."""
+        if self._end + RECORD_SIZE > len(self._map):
+            self._map.flush()
+            size = len(self._map) + self._grow_bytes
+            self._map.close()
+            self._file.truncate(size)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        offset = self._end
+        self._end += RECORD_SIZE
+        return offset
+
+    def _symbol_code(self, symbol: str) -> int:
+        """Returns a symbol's journal code, writing a symbol record on first use."""
+        if symbol is None:
+            return -1
+        code = self._symbol_codes.get(symbol)
+        if code is None:
+            encoded = symbol.encode("utf-8")
+            if len(encoded) > _SYMBOL.size - 8:
+                raise ValueError(f"Symbol too long to journal: {symbol!r}")
+            code = len(self._symbol_names)
+            offset = self._reserve()  # May remap, so reserve before touching self._map
+            _SYMBOL.pack_into(self._map, offset, _KIND_SYMBOL, code, encoded)
+            self._register_symbol(symbol, code)
+        return code
+
+    def append(self, row: tuple) -> None:
+        """
+        Writes one ledger row. It becomes durable at the next group commit.
+
+        Args:
+            row (tuple): A row in TransactionLedger.raw_row() order.
+        """
+        (timestamp_ns, transaction_type, cash_change, symbol, quantity,
+         price_per_share, balance_after, success, message_code, detail) = row
+        symbol_code = self._symbol_code(symbol)
+        offset = self._reserve()
+        _TRANSACTION.pack_into(
+            self._map, offset,
+            _KIND_TRANSACTION,
+            _TYPE_CODES[transaction_type],
+            success,
+            message_code,
+            symbol_code,
+            timestamp_ns,
+            _NAN if quantity is None else quantity,
+            _NAN if price_per_share is None else price_per_share,
+            cash_change,
+            balance_after,
+            detail if isinstance(detail, (int, float)) else _NAN,
+        )
+        self.transaction_count += 1
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.commit()
+
+    def commit(self) -> None:
+        """
+        Makes every record written so far durable: flushes the records, then
+        advances and flushes the committed length in the header.
+        """
+        if self._end == self._committed:
+            return
+        self._map.flush()
+        _HEADER.pack_into(self._map, 0, _MAGIC, self._end)
+        self._map.flush(0, min(mmap.PAGESIZE, len(self._map)))
+        self._committed = self._end
+        self._pending = 0
+
+    def records(self) -> Iterator[tuple]:
+        """
+        Reads back every committed ledger row, in order.
+
+        Yields:
+            tuple: Rows in TransactionLedger.raw_row() order.
+        """
+        for offset in range(HEADER_SIZE, self._committed, RECORD_SIZE):
+            if self._map[offset] != _KIND_TRANSACTION:
+                continue
+            (_, type_code, success, message_code, symbol_code, timestamp_ns,
+             quantity, price, cash_change, balance_after, detail) = _TRANSACTION.unpack_from(self._map, offset)
+            yield (
+                timestamp_ns,
+                TRANSACTION_TYPES[type_code],
+                cash_change,
+                self._symbol_names[symbol_code] if symbol_code >= 0 else None,
+                _decode_optional(quantity),
+                None if price != price else price,
+                balance_after,
+                bool(success),
+                message_code,
+                _decode_optional(detail),
+            )
+
+    def size_bytes(self) -> int:
+        """
+        Returns the number of bytes of journal content written so far.
+
+        Returns:
+            int: Header plus records, excluding preallocated space.
+        """
+        return self._end
+
+    def close(self) -> None:
+        """
+        Commits outstanding records and trims the preallocated space from the file.
+        """
+        self.commit()
+        self._map.close()
+        self._file.truncate(self._committed)
+        self._file.close()
+
+
+class DurableAccount(Account):
+    """
+    An Account whose ledger is journaled to disk and recovered on construction.
+    """
+
+    def __init__(
+        self,
+        account_id: str,
+        directory: str,
+        snapshot_every: int = 100_000,
+        commit_every: int = 256,
+        **kwargs
+    ):
+        """
+        Opens a durable account, recovering any state already stored in `directory`.
+
+        Args:
+            account_id (str): A unique identifier for the account; also used as the
+                              file name stem, so it must be safe for the filesystem.
+            directory (str): Directory holding the journal and snapshot files.
+            snapshot_every (int, optional): Ledger rows between snapshots. Defaults to 100,000.
+            commit_every (int, optional): Records per journal group commit. Defaults to 256.
+            **kwargs: Passed on to Account (checkpoint_interval, price_provider,
+                      cost_basis_method).
+        """
+        super().__init__(account_id, **kwargs)
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, account_id)
+        self.snapshot_every: int = snapshot_every
+        self._snapshot_path: str = base + ".snapshot.json"
+        self._journal: Journal = Journal(base + ".journal", commit_every=commit_every)
+        self._snapshot_rows: int = 0  # Ledger length covered by the latest snapshot
+        self._recover()
+        self._journaled_rows: int = len(self._transactions)
+
+    def _recover(self) -> None:
+        """
+        Internal helper that reloads the ledger from the journal, restores the state
+        from the latest snapshot, replays only the journal rows after it and rebuilds
+        the point-in-time checkpoints.
+        """
+        for row in self._journal.records():
+            self._transactions.append(*row)
+
+        snapshot, snapshot_rows = None, 0
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path) as snapshot_file:
+                snapshot = json.load(snapshot_file)
+            snapshot_rows = snapshot['rows']
+        # Ignores a snapshot newer than the committed journal, or built with other lot rules
+        self._snapshot_rows = self._restore(snapshot, snapshot_rows)
+        Account._after_append(self)  # Not journaled again
+
+    def _after_append(self) -> None:
+        """
+        Journals every ledger row written since the last call, then takes a snapshot
+        once `snapshot_every` rows have accumulated since the previous one.
+        """
+        super()._after_append()
+        rows = len(self._transactions)
+        for index in range(self._journaled_rows, rows):
+            self._journal.append(self._transactions.raw_row(index))
+        self._journaled_rows = rows
+        if rows - self._snapshot_rows >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self) -> None:
+        """
+        Commits the journal and atomically writes a snapshot of the current state.
+        """
+        self._journal.commit()
+        rows = len(self._transactions)
+        temporary_path = self._snapshot_path + ".tmp"
+        with open(temporary_path, "w") as snapshot_file:
+            json.dump({'rows': rows, **self._export_state()}, snapshot_file)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temporary_path, self._snapshot_path)
+        self._snapshot_rows = rows
+
+    def commit(self) -> None:
+        """
+        Makes every transaction recorded so far durable without waiting for the group to fill.
+        """
+        self._journal.commit()
+
+    def close(self) -> None:
+        """
+        Commits outstanding records and closes the journal file.
+        """
+        self._journal.close()
@@ -0,0 +1,313 @@
+"""
+Columnar export and import of Account ledgers, for bulk analytics and fast
+reloads.
+
+A ledger file holds the ledgers of one or many accounts back to back, stored
+column by column like Parquet: each ledger column is split into row groups
+of `row_group_size` rows, and each group is compressed with zlib on its own.
+Timestamps are delta-encoded first, since consecutive rows are close in
+time. A JSON footer records where every block starts, the shared symbol
+table, each account's row range and a snapshot of its derived state
+(holdings, marks, tax lots).
+
+Readers only decompress what they ask for. LedgerFile.columns() reads the
+named columns, for one account's row range if given (column pruning), into
+numpy arrays. LedgerFile.load_account() rebuilds a full Account from the
+columns and the snapshot, with the secondary indexes built by numpy, instead
+of replaying each operation through the public methods, and takes a
+checkpoint every `checkpoint_interval` rows, so point-in-time queries on it
+cost what they cost on the original. If the account is loaded with a
+different cost basis method, its lots are rebuilt by replaying the trades. Rejected orders are not part of the ledger, so they
+are not exported. See bench_ledger_file.py for load and save times.
+"""
+
+import json
+import os
+import struct
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from accounts import Account
+from ledger import TRANSACTION_TYPES, TransactionLedger
+
+_MAGIC = b"ACCTLDG1"
+_TRAILER = struct.Struct("<q8s")  # Footer offset, magic
+
+# Column name -> (array typecode, stored numpy dtype)
+COLUMNS: Dict[str, tuple] = {
+    'timestamps': ("q", "<i8"),
+    'types': ("b", "i1"),
+    'symbols': ("i", "<i4"),
+    'quantities': ("d", "<f8"),
+    'prices': ("d", "<f8"),
+    'cash_changes': ("d", "<f8"),
+    'balances_after': ("d", "<f8"),
+    'successes': ("b", "i1"),
+    'message_codes': ("b", "i1"),
+}
+_DELTA_ENCODED = {'timestamps'}
+
+
+def _to_array(typecode: str, values: np.ndarray) -> array:
+    """Copies a numpy array into a new array.array of the given typecode."""
+    result = array(typecode)
+    # numpy reads array typecodes as the same native C types
+    result.frombytes(np.ascontiguousarray(values, dtype=np.dtype(typecode)).tobytes())
+    return result
+
+
+def export_ledgers(
+    path: str,
+    accounts: Iterable[Account],
+    row_group_size: int = 1 << 20,
+    compression_level: int = 1,
+) -> int:
+    """
+    Writes the ledgers of one or many accounts to a columnar file. The file is written
+    to a temporary name and renamed into place, so readers never see a partial file.
+
+    Args:
+        path (str): Destination file.
+        accounts (Iterable[Account]): The accounts to export; ids must be unique.
+        row_group_size (int, optional): Rows per compressed block. Defaults to 1,048,576.
+        compression_level (int, optional): zlib level, 1 (fastest) to 9 (smallest).
+                                           Defaults to 1.
+
+    Returns:
+        int: Number of ledger rows written.
+
+    Raises:
+        ValueError: If two accounts share an id.
+    """
+    accounts = list(accounts)
+    symbols: Dict[str, int] = {}  # Symbol as written -> code in the file's symbol table
+    code_maps: List[np.ndarray] = []  # Per account: ledger symbol code -> file code
+    entries: List[Dict[str, Any]] = []
+    details: List[list] = []
+    seen = set()
+    start = 0
+    for account in accounts:
+        if account.account_id in seen:
+            raise ValueError(f"Duplicate account id: {account.account_id!r}")
+        seen.add(account.account_id)
+        ledger = account._transactions
+        # A trailing -1 maps the "no symbol" code (-1) to itself
+        code_maps.append(np.array(
+            [symbols.setdefault(name, len(symbols)) for name in ledger.symbol_names()] + [-1], dtype=np.int32
+        ))
+        details.extend([start + row, value] for row, value in sorted(ledger.details().items()))
+        entries.append({
+            'account_id': account.account_id,
+            'start': start,
+            'stop': start + len(ledger),
+            'state': account._export_state(),
+        })
+        start += len(ledger)
+
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as out:
+        out.write(_MAGIC)
+        columns_meta = {}
+        for name, (_, dtype) in COLUMNS.items():
+            # One column at a time, so peak memory is one column of every ledger
+            parts = [np.array(account._transactions.columns()[name], dtype=dtype) for account in accounts]
+            if name == 'symbols':
+                parts = [code_map[part] for part, code_map in zip(parts, code_maps)]
+            values = np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+            blocks = []
+            for lo in range(0, len(values), row_group_size):
+                block = values[lo:lo + row_group_size]
+                if name in _DELTA_ENCODED:
+                    block = np.diff(block, prepend=0)  # First value kept as is
+                data = zlib.compress(block.astype(dtype, copy=False).tobytes(), compression_level)
+                blocks.append([out.tell(), len(data)])
+                out.write(data)
+            columns_meta[name] = {'dtype': dtype, 'blocks': blocks}
+        footer_offset = out.tell()
+        out.write(json.dumps({
+            'rows': start,
+            'row_group_size': row_group_size,
+            'symbols': list(symbols),
+            'accounts': entries,
+            'columns': columns_meta,
+            'details': details,
+        }).encode("utf-8"))
+        out.write(_TRAILER.pack(footer_offset, _MAGIC))
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(temporary_path, path)
+    return start
+
+
+class LedgerFile:
+    """
+    Reads columns and whole accounts back from a file written by export_ledgers().
+    Use as a context manager, or call close().
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens a ledger file and reads its footer.
+
+        Args:
+            path (str): File written by export_ledgers().
+
+        Raises:
+            ValueError: If the file is not a complete ledger file.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            if self._file.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"Not a ledger file: {path}")
+            trailer_offset = self._file.seek(-_TRAILER.size, os.SEEK_END)
+            footer_offset, magic = _TRAILER.unpack(self._file.read(_TRAILER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"Truncated ledger file: {path}")
+            self._file.seek(footer_offset)
+            footer = json.loads(self._file.read(trailer_offset - footer_offset))
+        except BaseException:
+            self._file.close()
+            raise
+        self.rows: int = footer['rows']
+        self.row_group_size: int = footer['row_group_size']
+        self.symbols: List[str] = footer['symbols']  # Indexed by the 'symbols' column codes
+        self._accounts: Dict[str, Dict[str, Any]] = {entry['account_id']: entry for entry in footer['accounts']}
+        self._columns: Dict[str, Dict[str, Any]] = footer['columns']
+        self._details: List[list] = footer['details']
+
+    def __enter__(self) -> "LedgerFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def account_ids(self) -> List[str]:
+        """
+        Returns the ids of the exported accounts, in file order.
+
+        Returns:
+            List[str]: Account ids.
+        """
+        return list(self._accounts)
+
+    def _read_column(self, name: str, lo: int, hi: int) -> np.ndarray:
+        """Decompresses only the blocks of one column that cover rows [lo, hi)."""
+        meta = self._columns[name]
+        size = self.row_group_size
+        first, last = lo // size, max(lo, hi - 1) // size
+        parts = []
+        for offset, length in meta['blocks'][first:last + 1]:
+            self._file.seek(offset)
+            block = np.frombuffer(zlib.decompress(self._file.read(length)), dtype=meta['dtype'])
+            if name in _DELTA_ENCODED:
+                block = np.cumsum(block)
+            parts.append(block)
+        values = np.concatenate(parts) if parts else np.zeros(0, dtype=meta['dtype'])
+        return values[lo - first * size:hi - first * size]
+
+    def columns(self, names: Sequence[str] = None, account_id: str = None) -> Dict[str, np.ndarray]:
+        """
+        Reads ledger columns into numpy arrays, decompressing only what is asked for.
+
+        Args:
+            names (Sequence[str], optional): Columns to read, from COLUMNS. Defaults to all.
+            account_id (str, optional): Only this account's rows. Defaults to every row.
+
+        Returns:
+            Dict[str, np.ndarray]: Column name -> values in ledger order. 'symbols' holds
+                                   codes into `self.symbols` (-1 if absent), 'types' codes
+                                   into ledger.TRANSACTION_TYPES.
+
+        Raises:
+            KeyError: If the account is not in the file.
+            ValueError: If a column name is unknown.
+        """
+        names = list(COLUMNS) if names is None else list(names)
+        for name in names:
+            if name not in COLUMNS:
+                raise ValueError(f"Unknown ledger column: {name!r}")
+        if account_id is None:
+            lo, hi = 0, self.rows
+        else:
+            entry = self._accounts[account_id]
+            lo, hi = entry['start'], entry['stop']
+        return {name: self._read_column(name, lo, hi) for name in names}
+
+    def load_account(self, account_id: str, **kwargs) -> Account:
+        """
+        Rebuilds an account, ledger and state, without replaying its operations.
+
+        Args:
+            account_id (str): The account to load.
+            **kwargs: Passed on to Account (checkpoint_interval, price_provider,
+                      cost_basis_method, clock, reject_log_size).
+
+        Returns:
+            Account: A new account equal to the exported one.
+
+        Raises:
+            KeyError: If the account is not in the file.
+        """
+        entry = self._accounts[account_id]
+        columns = self.columns(account_id=account_id)
+
+        # Renumber the file's symbol codes to the ones this account uses
+        codes = columns['symbols']
+        used = np.unique(codes[codes >= 0])
+        symbol_names = [self.symbols[code] for code in used]
+        local = np.where(codes >= 0, np.searchsorted(used, codes), -1).astype(np.int32)
+        columns['symbols'] = local
+
+        # Secondary indexes, built with numpy instead of one row at a time
+        uppers: Dict[str, int] = {}
+        group_of_code = np.array([uppers.setdefault(name.upper(), len(uppers)) for name in symbol_names], dtype=np.int64)
+        with_symbol = np.flatnonzero(local >= 0)
+        row_groups = group_of_code[local[with_symbol]]
+        order = np.argsort(row_groups, kind="stable")
+        bounds = np.searchsorted(row_groups[order], np.arange(len(uppers) + 1))
+        successes = columns['successes'] != 0
+        indexes = {
+            'types': [_to_array("i", np.flatnonzero(columns['types'] == code)) for code in range(len(TRANSACTION_TYPES))],
+            'successes': (_to_array("i", np.flatnonzero(~successes)), _to_array("i", np.flatnonzero(successes))),
+            'symbols': {
+                upper: _to_array("i", with_symbol[order[bounds[group]:bounds[group + 1]]])
+                for upper, group in uppers.items()
+            },
+        }
+        start, stop = entry['start'], entry['stop']
+        details = {row - start: value for row, value in self._details if start <= row < stop}
+        ledger = TransactionLedger.from_columns(
+            {name: _to_array(typecode, columns[name]) for name, (typecode, _) in COLUMNS.items()},
+            symbol_names,
+            details,
+            indexes,
+        )
+
+        account = Account(account_id, **kwargs)
+        account._transactions = ledger
+        # Replays every row only if the state was exported under other lot rules
+        account._restore(entry['state'], len(ledger))
+        account._after_append()
+        return account
+
+    def load_accounts(self, **kwargs) -> Dict[str, Account]:
+        """
+        Rebuilds every account in the file.
+
+        Args:
+            **kwargs: Passed on to each Account.
+
+        Returns:
+            Dict[str, Account]: Account id -> account, in file order.
+        """
+        return {account_id: self.load_account(account_id, **kwargs) for account_id in self._accounts}
+
+    def close(self) -> None:
+        """
+        Closes the file.
+        """
+        self._file.close()
@@ -0,0 +1,89 @@
+"""
+Drives simulated users against a running trading app and reports throughput
+and tail latency.
+
+Usage:
+    python app.py  # In another terminal; APP_SHARE=0 skips the public link
+    python load_test_app.py [--url http://127.0.0.1:7860/] [--users 20] [--seconds 30] [--think-ms 0]
+
+Each simulated user is a separate gradio_client session, so it trades its
+own account, exactly like a separate browser tab. It loops over a deposit,
+a buy, a sell and a transaction-history page, waiting --think-ms between
+calls. Latency is measured per call, end to end through the app's queue.
+Run it while varying APP_CONCURRENCY and APP_MAX_THREADS on the server to
+tune them.
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+from typing import Dict, List
+
+from gradio_client import Client
+
+SYMBOLS = ["AAPL", "TSLA", "GOOGL", "MSFT"]
+
+
+def user(url: str, deadline: float, think_ms: float, seed: int, latencies: Dict[str, List[float]], errors: List[str]) -> None:
+    """Runs one simulated user until the deadline, recording each call's latency by endpoint."""
+    rng = random.Random(seed)
+    client = Client(url, verbose=False)
+    calls = [
+        ("/deposit", lambda: client.predict(1000.00, api_name="/deposit")),
+        ("/buy", lambda: client.predict(rng.choice(SYMBOLS), rng.randint(1, 5), api_name="/buy")),
+        ("/sell", lambda: client.predict(rng.choice(SYMBOLS), rng.randint(1, 5), api_name="/sell")),
+        ("/transactions", lambda: client.predict(1, api_name="/transactions")),
+    ]
+    while time.perf_counter() < deadline:
+        for endpoint, call in calls:
+            started = time.perf_counter()
+            try:
+                call()
+            except Exception as error:  # Count and keep going: one failure should not end the run
+                errors.append(f"{endpoint}: {error}")
+                continue
+            latencies[endpoint].append((time.perf_counter() - started) * 1000)
+            if think_ms:
+                time.sleep(think_ms / 1000)
+
+
+def percentile(values: List[float], share: float) -> float:
+    """Returns the value below which `share` of the sorted values fall."""
+    ordered = sorted(values)
+    return ordered[min(int(share * len(ordered)), len(ordered) - 1)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:7860/")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--think-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    latencies: Dict[str, List[float]] = {"/deposit": [], "/buy": [], "/sell": [], "/transactions": []}
+    errors: List[str] = []
+    started = time.perf_counter()
+    deadline = started + args.seconds
+    threads = [
+        threading.Thread(target=user, args=(args.url, deadline, args.think_ms, seed, latencies, errors))
+        for seed in range(args.users)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    every = [latency for values in latencies.values() for latency in values]
+    print(f"{args.users} users, {len(every):,} calls in {elapsed:.1f} s: {len(every) / elapsed:,.1f} calls/s, "
+          f"{len(errors)} errors")
+    print(f"{'endpoint':14s} {'calls':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for endpoint, values in list(latencies.items()) + [("all", every)]:
+        if values:
+            print(f"{endpoint:14s} {len(values):>7,} {statistics.median(values):>8.1f} {percentile(values, 0.95):>8.1f} "
+                  f"{percentile(values, 0.99):>8.1f} {max(values):>8.1f}")
+    for error in errors[:5]:
+        print("error:", error)
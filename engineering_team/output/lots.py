@@ -0,0 +1,154 @@
+"""
+Per-symbol tax-lot tracking for Account.
+
+Each symbol's open position is kept as a queue of lots, one per buy. A sell
+consumes lots from the front (FIFO) or the back (LIFO), or draws down a
+single pooled lot at its average cost (AVERAGE). Every lot is pushed once
+and popped at most once, so buys and sells are O(1) amortized. The open cost
+basis and realized profit/loss are kept as running totals, so reading them
+never rescans the transaction ledger.
+"""
+
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+FIFO = "fifo"
+LIFO = "lifo"
+AVERAGE = "average"
+COST_BASIS_METHODS = (FIFO, LIFO, AVERAGE)
+
+
+class LotQueue:
+    """
+    Open lots and realized profit/loss for one symbol.
+    """
+
+    def __init__(self, method: str = FIFO):
+        """
+        Initializes an empty position.
+
+        Args:
+            method (str, optional): FIFO, LIFO or AVERAGE. Defaults to FIFO.
+
+        Raises:
+            ValueError: If method is not one of COST_BASIS_METHODS.
+        """
+        if method not in COST_BASIS_METHODS:
+            raise ValueError(f"Unknown cost basis method: {method!r}")
+        self.method: str = method
+        self._lots: deque = deque()  # [quantity, price per share] per open lot, oldest first
+        self.quantity: int = 0  # Shares held across all lots
+        self.cost_basis: float = 0.0  # Total cost of the shares held
+        self.realized: float = 0.0  # Cumulative realized profit/loss
+
+    def buy(self, quantity: int, price: float) -> None:
+        """
+        Opens a lot.
+
+        Args:
+            quantity (int): Shares bought.
+            price (float): Price paid per share.
+        """
+        self.quantity += quantity
+        self.cost_basis += quantity * price
+        if self.method == AVERAGE:
+            # One pooled lot, held at the average cost of everything still open
+            self._lots.clear()
+            self._lots.append([self.quantity, self.cost_basis / self.quantity])
+        else:
+            self._lots.append([quantity, price])
+
+    def sell(self, quantity: int, price: float) -> float:
+        """
+        Closes shares against open lots in this queue's order.
+
+        Args:
+            quantity (int): Shares sold; must not exceed the quantity held.
+            price (float): Sale price per share.
+
+        Returns:
+            float: The profit/loss realized by this sale.
+
+        Raises:
+            ValueError: If more shares are sold than are held.
+        """
+        if quantity > self.quantity:
+            raise ValueError(f"Cannot close {quantity} shares; only {self.quantity} held")
+        take = self._lots.popleft if self.method == FIFO else self._lots.pop
+        peek = 0 if self.method == FIFO else -1
+        remaining = quantity
+        closed_cost = 0.0
+        while remaining:
+            lot = self._lots[peek]
+            used = min(lot[0], remaining)
+            closed_cost += used * lot[1]
+            remaining -= used
+            if used == lot[0]:
+                take()
+            else:
+                lot[0] -= used
+        self.quantity -= quantity
+        # Snap to zero when flat so rounding error cannot linger in the basis
+        self.cost_basis = self.cost_basis - closed_cost if self.quantity else 0.0
+        realized = quantity * price - closed_cost
+        self.realized += realized
+        return realized
+
+    def average_cost(self) -> float:
+        """
+        Returns the average cost per share of the open position.
+
+        Returns:
+            float: Cost basis divided by quantity, or 0.0 when flat.
+        """
+        return self.cost_basis / self.quantity if self.quantity else 0.0
+
+    def unrealized(self, price: float) -> float:
+        """
+        Returns the profit/loss of the open position if it were closed at a price.
+
+        Args:
+            price (float): The price per share to value the position at.
+
+        Returns:
+            float: Market value minus cost basis.
+        """
+        return self.quantity * price - self.cost_basis
+
+    def lots(self) -> List[Tuple[int, float]]:
+        """
+        Returns the open lots.
+
+        Returns:
+            List[Tuple[int, float]]: (quantity, price per share) per lot, oldest first.
+        """
+        return [(quantity, price) for quantity, price in self._lots]
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        Returns a JSON-serializable copy of the queue, for snapshots.
+
+        Returns:
+            Dict[str, Any]: The open lots and realized profit/loss.
+        """
+        return {'lots': [list(lot) for lot in self._lots], 'realized': self.realized}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], method: str = FIFO) -> "LotQueue":
+        """
+        Rebuilds a queue saved with to_state().
+
+        Args:
+            state (Dict[str, Any]): The saved state.
+            method (str, optional): The cost basis method the state was built with.
+
+        Returns:
+            LotQueue: The restored queue.
+        """
+        queue = cls(method)
+        for quantity, price in state['lots']:
+            queue._lots.append([quantity, price])
+            queue.quantity += quantity
+            queue.cost_basis += quantity * price
+        queue.realized = state['realized']
+        return queue
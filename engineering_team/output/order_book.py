@@ -0,0 +1,492 @@
+"""
+Limit-order books and a matching engine that trades between Accounts.
+
+Each symbol has an OrderBook of resting limit orders in price-time priority:
+bids and asks are binary heaps keyed on (price, arrival sequence), so the
+best order is found in O(1) and an order is added in O(log n). Cancelling
+only marks the order; its heap entry is skipped when it reaches the top and
+the heap is compacted once half of it is dead, so cancel is O(1) and
+replace O(log n) amortized. Open quantity per price level is kept alongside
+for depth views.
+
+MatchingEngine routes orders to the books:
+    market      matches now at any price; the unfilled rest is cancelled
+    limit       matches up to its limit price; the rest rests on the book
+    stop        waits until a trade prints at or through the stop price
+                (at or above for buys, at or below for sells), then enters
+                as a market order, or as a limit order if it has a limit
+
+Fills execute at the resting order's price and settle straight into both
+Accounts through buy_shares()/sell_shares() with that price, so they appear
+in each ledger and change feed like any other trade. Nothing is reserved
+while an order rests: if, when a fill comes, the buyer lacks the cash or
+the seller the shares, that order is rejected (and logged in its account's
+reject log) and matching moves on. Should the buyer's purchase still fail
+after the seller has sold, the sale is bought back and the fill is dropped. See
+bench_order_book.py for throughput.
+"""
+
+import heapq
+from typing import Any, Dict, List, Optional
+
+from accounts import Account
+
+BUY = "buy"
+SELL = "sell"
+SIDES = (BUY, SELL)
+
+# Order statuses
+PENDING = "pending"  # A stop order waiting for its trigger
+OPEN = "open"  # Resting on the book, possibly partly filled
+FILLED = "filled"
+CANCELLED = "cancelled"  # By its owner, or the unfilled rest of a market order
+REJECTED = "rejected"  # Its account could not settle a fill
+
+_COMPACT_MIN = 64  # Heaps smaller than this are never compacted
+
+
+class _Order:
+    """One order and its fill progress."""
+
+    __slots__ = (
+        "order_id", "account", "symbol", "side", "quantity", "remaining",
+        "limit_price", "stop_price", "status", "sequence", "filled_value",
+    )
+
+    def __init__(self, order_id: int, account: Account, symbol: str, side: str, quantity: int,
+                 limit_price: Optional[float], stop_price: Optional[float]):
+        self.order_id = order_id
+        self.account = account
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity  # Shares ordered
+        self.remaining = quantity  # Shares not yet filled
+        self.limit_price = limit_price  # None for market orders
+        self.stop_price = stop_price  # None unless a stop order
+        self.status = PENDING if stop_price is not None else OPEN
+        self.sequence = 0  # Arrival order on the book; a heap entry is live only while it matches
+        self.filled_value = 0.0  # Sum of quantity * price over fills
+
+
+class OrderBook:
+    """
+    Resting orders and stop orders for one symbol.
+    """
+
+    def __init__(self, symbol: str):
+        """
+        Initializes an empty book.
+
+        Args:
+            symbol (str): Upper-cased stock symbol.
+        """
+        self.symbol: str = symbol
+        self.last_price: Optional[float] = None  # Price of the most recent fill
+        # Heap entries are (key, sequence, order); bids are keyed on -price so the best is on top
+        self._heaps: Dict[str, list] = {BUY: [], SELL: []}
+        self._dead: Dict[str, int] = {BUY: 0, SELL: 0}  # Heap entries no longer live, per side
+        self._levels: Dict[str, Dict[float, int]] = {BUY: {}, SELL: {}}  # Price -> open quantity
+        self._buy_stops: list = []  # (stop price, sequence, order); trigger when last >= stop
+        self._sell_stops: list = []  # (-stop price, sequence, order); trigger when last <= stop
+
+    def rest(self, order: _Order, sequence: int) -> None:
+        """
+        Puts a limit order on the book behind every order already at its price.
+
+        Args:
+            order (_Order): An open limit order with quantity remaining.
+            sequence (int): Arrival sequence, for time priority.
+        """
+        order.sequence = sequence
+        key = -order.limit_price if order.side == BUY else order.limit_price
+        heapq.heappush(self._heaps[order.side], (key, sequence, order))
+        levels = self._levels[order.side]
+        levels[order.limit_price] = levels.get(order.limit_price, 0) + order.remaining
+
+    def best(self, side: str) -> Optional[_Order]:
+        """
+        Returns the highest-priority live order on one side, dropping the entries of
+        removed orders above it.
+
+        Args:
+            side (str): BUY for the best bid, SELL for the best ask.
+
+        Returns:
+            Optional[_Order]: The order, or None if that side is empty.
+        """
+        heap = self._heaps[side]
+        while heap:
+            _, sequence, order = heap[0]
+            if order.status == OPEN and order.sequence == sequence:
+                return order
+            heapq.heappop(heap)
+            self._dead[side] -= 1
+        return None
+
+    def reduce(self, order: _Order, quantity: int) -> None:
+        """
+        Takes quantity off a resting order's price level, e.g. after a fill.
+
+        Args:
+            order (_Order): A resting order.
+            quantity (int): Shares to take off.
+        """
+        levels = self._levels[order.side]
+        left = levels[order.limit_price] - quantity
+        if left:
+            levels[order.limit_price] = left
+        else:
+            del levels[order.limit_price]
+
+    def remove(self, order: _Order) -> None:
+        """
+        Takes a resting order off the book. Its heap entry is left in place and skipped
+        later; the heap is rebuilt without dead entries once they are half of it.
+
+        Args:
+            order (_Order): A resting order; the caller changes its status or sequence.
+        """
+        self.reduce(order, order.remaining)
+        side = order.side
+        heap = self._heaps[side]
+        self._dead[side] += 1
+        if len(heap) >= _COMPACT_MIN and self._dead[side] * 2 > len(heap):
+            # The caller has not marked the order dead yet, so leave it out by identity
+            live = [entry for entry in heap
+                    if entry[2] is not order and entry[2].status == OPEN and entry[2].sequence == entry[1]]
+            heapq.heapify(live)
+            self._heaps[side] = live
+            self._dead[side] = 0
+
+    def pop_best(self, side: str) -> None:
+        """
+        Takes the order returned by best() off the book once it is completely filled.
+
+        Args:
+            side (str): The side best() was called for.
+        """
+        heapq.heappop(self._heaps[side])
+
+    def add_stop(self, order: _Order, sequence: int) -> None:
+        """
+        Holds a stop order until a trade reaches its stop price.
+
+        Args:
+            order (_Order): A pending stop order.
+            sequence (int): Arrival sequence, to trigger equal stops in arrival order.
+        """
+        order.sequence = sequence
+        if order.side == BUY:
+            heapq.heappush(self._buy_stops, (order.stop_price, sequence, order))
+        else:
+            heapq.heappush(self._sell_stops, (-order.stop_price, sequence, order))
+
+    def triggered(self) -> List[_Order]:
+        """
+        Pops every pending stop order that the last trade price has reached.
+
+        Returns:
+            List[_Order]: The triggered orders, lowest buy stops then highest sell stops.
+        """
+        result = []
+        price = self.last_price
+        if price is None:
+            return result
+        while self._buy_stops and self._buy_stops[0][0] <= price:
+            order = heapq.heappop(self._buy_stops)[2]
+            if order.status == PENDING:
+                result.append(order)
+        while self._sell_stops and -self._sell_stops[0][0] >= price:
+            order = heapq.heappop(self._sell_stops)[2]
+            if order.status == PENDING:
+                result.append(order)
+        return result
+
+    def depth(self, levels: int = 5) -> Dict[str, List[tuple]]:
+        """
+        Returns the open quantity at the best price levels on each side.
+
+        Args:
+            levels (int, optional): Price levels per side. Defaults to 5.
+
+        Returns:
+            Dict[str, List[tuple]]: 'bids' (highest first) and 'asks' (lowest first),
+                                    each a list of (price, open quantity).
+        """
+        bids, asks = self._levels[BUY], self._levels[SELL]
+        return {
+            'bids': [(price, bids[price]) for price in heapq.nlargest(levels, bids)],
+            'asks': [(price, asks[price]) for price in heapq.nsmallest(levels, asks)],
+        }
+
+
+class MatchingEngine:
+    """
+    Order entry, matching and settlement for every symbol traded between Accounts.
+    """
+
+    def __init__(self):
+        """
+        Initializes an engine with no books and no orders.
+        """
+        self._books: Dict[str, OrderBook] = {}  # Upper-cased symbol -> book
+        self._orders: Dict[int, _Order] = {}  # Order id -> order, including finished ones
+        self._next_order_id: int = 1
+        self._sequence: int = 0  # Arrival counter shared by every book
+        self.fills: int = 0  # Fills settled since creation
+
+    def _book(self, symbol: str) -> OrderBook:
+        """Returns the book for a symbol, creating it on first use."""
+        symbol_upper = symbol.upper()
+        book = self._books.get(symbol_upper)
+        if book is None:
+            book = self._books[symbol_upper] = OrderBook(symbol_upper)
+        return book
+
+    def _next_sequence(self) -> int:
+        self._sequence += 1
+        return self._sequence
+
+    def submit(
+        self,
+        account: Account,
+        symbol: str,
+        side: str,
+        quantity: int,
+        limit_price: float = None,
+        stop_price: float = None
+    ) -> int:
+        """
+        Enters an order, matching it immediately as far as it can.
+
+        Args:
+            account (Account): The account that trades, and settles, the order.
+            symbol (str): The stock ticker symbol (case-insensitive).
+            side (str): BUY or SELL.
+            quantity (int): Shares to trade.
+            limit_price (float, optional): Worst acceptable price. Defaults to a market order.
+            stop_price (float, optional): Trade price that activates the order. Defaults to
+                                          an order that is active immediately.
+
+        Returns:
+            int: The order id, for get_order(), cancel() and replace().
+
+        Raises:
+            ValueError: If side is unknown, or the quantity or a price is not positive.
+        """
+        if side not in SIDES:
+            raise ValueError(f"Unknown order side: {side!r}")
+        if quantity <= 0:
+            raise ValueError("Order quantity must be positive.")
+        for price in (limit_price, stop_price):
+            if price is not None and price <= 0:
+                raise ValueError("Order prices must be positive.")
+        book = self._book(symbol)
+        order = _Order(self._next_order_id, account, book.symbol, side, quantity, limit_price, stop_price)
+        self._next_order_id += 1
+        self._orders[order.order_id] = order
+        if stop_price is None:
+            self._execute(book, order)
+        else:
+            book.add_stop(order, self._next_sequence())  # It may already be reached
+        self._run_stops(book)
+        return order.order_id
+
+    def _execute(self, book: OrderBook, order: _Order) -> None:
+        """Matches an active order, then rests or cancels whatever is left of it."""
+        self._match(book, order)
+        if order.status == OPEN:
+            if order.remaining == 0:
+                order.status = FILLED
+            elif order.limit_price is None:
+                order.status = CANCELLED  # Market orders never rest
+            else:
+                book.rest(order, self._next_sequence())
+
+    def _run_stops(self, book: OrderBook) -> None:
+        """Activates and executes stop orders until no more are triggered."""
+        triggered = book.triggered()
+        while triggered:
+            for order in triggered:
+                order.status = OPEN
+                self._execute(book, order)
+            triggered = book.triggered()
+
+    def _match(self, book: OrderBook, order: _Order) -> None:
+        """
+        Fills an incoming order against the opposite side of the book, best price first,
+        at each resting order's price, until it is filled or its limit is reached.
+        """
+        opposite = SELL if order.side == BUY else BUY
+        limit = order.limit_price
+        while order.remaining:
+            resting = book.best(opposite)
+            if resting is None:
+                return
+            price = resting.limit_price
+            if limit is not None and (price > limit if order.side == BUY else price < limit):
+                return
+            quantity = min(order.remaining, resting.remaining)
+            buy, sell = (order, resting) if order.side == BUY else (resting, order)
+
+            # Check the buyer before selling, so a fill either settles on both sides or not at all
+            if not buy.account.can_buy(book.symbol, quantity, price):
+                failed = buy
+            elif not sell.account.sell_shares(book.symbol, quantity, price):
+                failed = sell
+            elif not buy.account.buy_shares(book.symbol, quantity, price):
+                # The buyer changed since the check (e.g. another thread traded on it): undo the sale
+                sell.account.buy_shares(book.symbol, quantity, price)
+                failed = buy
+            else:
+                failed = None
+
+            if failed is resting:
+                book.remove(resting)
+                resting.status = REJECTED
+                continue
+            if failed is order:
+                order.status = REJECTED
+                return
+            self.fills += 1
+            book.last_price = price
+            book.reduce(resting, quantity)
+            for filled in (order, resting):
+                filled.remaining -= quantity
+                filled.filled_value += quantity * price
+            if resting.remaining == 0:
+                resting.status = FILLED
+                book.pop_best(opposite)
+
+    def cancel(self, order_id: int) -> bool:
+        """
+        Cancels the unfilled part of an open or pending order.
+
+        Args:
+            order_id (int): Id returned by submit().
+
+        Returns:
+            bool: True if the order was cancelled, False if it had already finished.
+
+        Raises:
+            KeyError: If the order id is unknown.
+        """
+        order = self._orders[order_id]
+        if order.status == OPEN:
+            self._books[order.symbol].remove(order)
+        elif order.status != PENDING:
+            return False
+        order.status = CANCELLED
+        return True
+
+    def replace(self, order_id: int, quantity: int = None, limit_price: float = None) -> bool:
+        """
+        Changes the unfilled quantity or the limit price of an open or pending order.
+        Reducing the quantity of a resting order keeps its place in the queue; any other
+        change sends it to the back of its price level, and a new limit price may make
+        it match immediately.
+
+        Args:
+            order_id (int): Id returned by submit().
+            quantity (int, optional): New unfilled quantity. Defaults to unchanged.
+            limit_price (float, optional): New limit price. Defaults to unchanged.
+
+        Returns:
+            bool: True if the order was changed, False if it had already finished.
+
+        Raises:
+            KeyError: If the order id is unknown.
+            ValueError: If the quantity or limit price is not positive, or a limit price
+                        is given for a market order.
+        """
+        order = self._orders[order_id]
+        if order.status not in (OPEN, PENDING):
+            return False
+        quantity = order.remaining if quantity is None else quantity
+        if quantity <= 0:
+            raise ValueError("Order quantity must be positive.")
+        if limit_price is not None:
+            if limit_price <= 0:
+                raise ValueError("Order prices must be positive.")
+            if order.limit_price is None:
+                raise ValueError("A market order has no limit price to replace.")
+        else:
+            limit_price = order.limit_price
+
+        if order.status == PENDING:
+            order.quantity += quantity - order.remaining
+            order.remaining = quantity
+            order.limit_price = limit_price
+            return True
+
+        book = self._books[order.symbol]
+        if limit_price == order.limit_price and quantity <= order.remaining:
+            book.reduce(order, order.remaining - quantity)  # Keeps time priority
+            order.quantity -= order.remaining - quantity
+            order.remaining = quantity
+            return True
+        book.remove(order)
+        order.sequence = 0  # Kills the old heap entry
+        order.quantity += quantity - order.remaining
+        order.remaining = quantity
+        order.limit_price = limit_price
+        self._execute(book, order)
+        self._run_stops(book)
+        return True
+
+    def get_order(self, order_id: int) -> Dict[str, Any]:
+        """
+        Returns the details and fill progress of an order.
+
+        Args:
+            order_id (int): Id returned by submit().
+
+        Returns:
+            Dict[str, Any]: 'order_id', 'account_id', 'symbol', 'side', 'quantity',
+                            'filled', 'remaining', 'limit_price', 'stop_price',
+                            'average_price' (None before the first fill) and 'status'.
+
+        Raises:
+            KeyError: If the order id is unknown.
+        """
+        order = self._orders[order_id]
+        filled = order.quantity - order.remaining
+        return {
+            'order_id': order.order_id,
+            'account_id': order.account.account_id,
+            'symbol': order.symbol,
+            'side': order.side,
+            'quantity': order.quantity,
+            'filled': filled,
+            'remaining': order.remaining,
+            'limit_price': order.limit_price,
+            'stop_price': order.stop_price,
+            'average_price': order.filled_value / filled if filled else None,
+            'status': order.status,
+        }
+
+    def depth(self, symbol: str, levels: int = 5) -> Dict[str, List[tuple]]:
+        """
+        Returns the open quantity at the best price levels of a symbol's book.
+
+        Args:
+            symbol (str): The stock ticker symbol (case-insensitive).
+            levels (int, optional): Price levels per side. Defaults to 5.
+
+        Returns:
+            Dict[str, List[tuple]]: 'bids' (highest first) and 'asks' (lowest first),
+                                    each a list of (price, open quantity).
+        """
+        return self._book(symbol).depth(levels)
+
+    def last_price(self, symbol: str) -> Optional[float]:
+        """
+        Returns the price of a symbol's most recent fill.
+
+        Args:
+            symbol (str): The stock ticker symbol (case-insensitive).
+
+        Returns:
+            Optional[float]: The price, or None if the symbol has not traded.
+        """
+        return self._book(symbol).last_price
@@ -0,0 +1,263 @@
+"""
+Asyncio order gateway in front of an AccountBook.
+
+Clients submit orders concurrently with `await gateway.submit(account_id, order)`.
+Each account has its own bounded queue and a single writer task. The writer
+takes whatever has queued up, up to `max_batch` orders, and tries it as one
+Account.execute_batch call: one bulk price lookup and one ledger write. If
+that batch is rejected because any one order would fail, the writer applies
+the orders one by one instead. Each order then succeeds or fails on its own,
+exactly as if it had been sent alone.
+
+When an account's queue is full, submit() waits for room. This slows
+producers down to the writer's pace instead of letting memory grow
+(backpressure). try_submit() raises asyncio.QueueFull instead of waiting.
+
+Batches run in the default executor, not on the event loop thread: taking an
+account's lock may wait for another thread that holds it, and that must not
+stall every other account's writer and client on the loop. If an account is
+closed in the book, its pending orders fail with KeyError and its writer
+stops; later submits for it raise KeyError straight away.
+See bench_order_gateway.py for latency and throughput figures.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+from account_book import AccountBook
+from accounts import Account
+
+ORDER_TYPES = ("deposit", "withdraw", "buy", "sell")
+
+
+def apply_order(account: Account, order: Dict[str, Any]) -> bool:
+    """
+    Executes one order dictionary (in Account.execute_batch format) with the matching
+    single-order Account method.
+
+    Args:
+        account (Account): The account to trade on.
+        order (Dict[str, Any]): The order, e.g. {'type': 'buy', 'symbol': 'AAPL', 'quantity': 10}.
+
+    Returns:
+        bool: True if the order succeeded, False otherwise.
+    """
+    order_type = order['type']
+    if order_type == "deposit":
+        return account.deposit(order['amount'])
+    if order_type == "withdraw":
+        return account.withdraw(order['amount'])
+    if order_type == "buy":
+        return account.buy_shares(order['symbol'], order['quantity'])
+    return account.sell_shares(order['symbol'], order['quantity'])
+
+
+class OrderGateway:
+    """
+    Accepts orders from many concurrent clients and applies them through one writer per account.
+    """
+
+    def __init__(self, book: AccountBook, queue_size: int = 1024, max_batch: int = 64):
+        """
+        Initializes a gateway. Writer tasks start on the running event loop as accounts
+        receive their first order.
+
+        Args:
+            book (AccountBook): The accounts to trade on. Orders are applied under the
+                                book's per-account lock, so other threads may use it too.
+            queue_size (int, optional): Maximum orders waiting per account. Defaults to 1024.
+            max_batch (int, optional): Maximum orders coalesced into one batch. Defaults to 64.
+        """
+        self.book = book
+        self.queue_size = queue_size
+        self.max_batch = max_batch
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._writers: Dict[str, asyncio.Task] = {}
+        self.orders = 0  # Orders applied
+        self.batches = 0  # Writer wake-ups, each applying one batch
+        self.fallbacks = 0  # Batches rejected as a whole and retried order by order
+
+    def _queue_for(self, account_id: str) -> asyncio.Queue:
+        """Returns an account's queue, starting its writer on first use."""
+        queue = self._queues.get(account_id)
+        if queue is None:
+            if account_id not in self.book:
+                raise KeyError(account_id)
+            queue = self._queues[account_id] = asyncio.Queue(self.queue_size)
+            self._writers[account_id] = asyncio.get_running_loop().create_task(self._write(account_id, queue))
+        return queue
+
+    @staticmethod
+    def _check(order: Dict[str, Any]) -> None:
+        """Rejects malformed orders in the caller, before they reach a batch."""
+        order_type = order.get('type')
+        if order_type not in ORDER_TYPES:
+            raise ValueError(f"Unknown order type: {order_type!r}")
+        fields = ('amount',) if order_type in ("deposit", "withdraw") else ('quantity',)
+        for field in fields:
+            value = order.get(field)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"A {order_type} order needs a numeric {field!r}, got {value!r}")
+        if order_type in ("buy", "sell") and not isinstance(order.get('symbol'), str):
+            raise ValueError(f"A {order_type} order needs a string 'symbol', got {order.get('symbol')!r}")
+
+    async def enqueue(self, account_id: str, order: Dict[str, Any]) -> asyncio.Future:
+        """
+        Queues an order, waiting for room if the account's queue is full.
+
+        Args:
+            account_id (str): An account already opened in the book.
+            order (Dict[str, Any]): The order, in Account.execute_batch format.
+
+        Returns:
+            asyncio.Future: Resolves to True if the order succeeded, False otherwise.
+
+        Raises:
+            KeyError: If the account is not in the book.
+            ValueError: If the order type is unknown or a field it needs is missing or mistyped.
+        """
+        self._check(order)
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queue_for(account_id)
+        await queue.put((order, future))
+        if self._queues.get(account_id) is not queue:  # Its writer stopped while this waited for room
+            queue.task_done()
+            raise KeyError(account_id)
+        return future
+
+    async def submit(self, account_id: str, order: Dict[str, Any]) -> bool:
+        """
+        Queues an order and waits for it to be applied.
+
+        Args:
+            account_id (str): An account already opened in the book.
+            order (Dict[str, Any]): The order, in Account.execute_batch format.
+
+        Returns:
+            bool: True if the order succeeded, False otherwise.
+
+        Raises:
+            KeyError: If the account is not in the book.
+            ValueError: If the order type is unknown or a field it needs is missing or mistyped.
+        """
+        return await (await self.enqueue(account_id, order))
+
+    def try_submit(self, account_id: str, order: Dict[str, Any]) -> asyncio.Future:
+        """
+        Queues an order without waiting; must be called from the event loop thread.
+
+        Args:
+            account_id (str): An account already opened in the book.
+            order (Dict[str, Any]): The order, in Account.execute_batch format.
+
+        Returns:
+            asyncio.Future: Resolves to True if the order succeeded, False otherwise.
+
+        Raises:
+            asyncio.QueueFull: If the account's queue is full; the order was not accepted.
+            KeyError: If the account is not in the book.
+            ValueError: If the order type is unknown or a field it needs is missing or mistyped.
+        """
+        self._check(order)
+        future = asyncio.get_running_loop().create_future()
+        self._queue_for(account_id).put_nowait((order, future))
+        return future
+
+    def _apply(self, account_id: str, orders: List[Dict[str, Any]]) -> Tuple[List[Any], bool]:
+        """
+        Applies a batch under the account's lock, falling back to one order at a time.
+        Runs in an executor thread.
+
+        Returns:
+            Tuple[List[Any], bool]: Per order, True or False, or the exception it raised;
+                                    and whether the batch fell back to one order at a time.
+        """
+        with self.book.locked(account_id) as account:
+            if len(orders) > 1:
+                try:
+                    if account.execute_batch(orders, record_failure=False):
+                        return [True] * len(orders), False
+                except Exception:  # Fall back: each order then fails or succeeds on its own
+                    pass
+            results: List[Any] = []
+            for order in orders:
+                try:
+                    results.append(apply_order(account, order))
+                except Exception as error:
+                    # Drop the traceback: it holds this thread's frames, and a client clearing
+                    # frames (e.g. unittest's assertRaises) must not reach into them
+                    results.append(error.with_traceback(None))
+            return results, len(orders) > 1
+
+    async def _write(self, account_id: str, queue: asyncio.Queue) -> None:
+        """Writer loop for one account: drains the queue in micro-batches."""
+        while True:
+            batch: List[Tuple[Dict[str, Any], asyncio.Future]] = [await queue.get()]
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                try:
+                    results, fell_back = await asyncio.to_thread(self._apply, account_id, [order for order, _ in batch])
+                except Exception as error:  # E.g. KeyError: the account was closed in the book
+                    error = error.with_traceback(None)
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(error)
+                    if account_id not in self.book:
+                        self._stop(account_id, queue, error)
+                        return
+                    continue
+                self.fallbacks += fell_back
+                for (_, future), result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        if not future.done():
+                            future.set_exception(result)
+                        continue
+                    self.orders += 1
+                    if not future.done():  # The client may have been cancelled
+                        future.set_result(result)
+            finally:
+                self.batches += 1
+                for _ in batch:
+                    queue.task_done()
+
+    def _stop(self, account_id: str, queue: asyncio.Queue, error: Exception) -> None:
+        """
+        Retires the writer of an account that has left the book: fails the orders still
+        queued for it, and lets the next submit() raise KeyError or start a fresh writer.
+        """
+        if self._queues.get(account_id) is queue:
+            del self._queues[account_id]
+            del self._writers[account_id]
+        while not queue.empty():
+            _, future = queue.get_nowait()
+            if not future.done():
+                future.set_exception(error)
+            queue.task_done()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns gateway counters.
+
+        Returns:
+            Dict[str, int]: 'orders' applied, 'batches' run, 'fallbacks' to one-by-one
+                            execution, and 'queued' orders still waiting.
+        """
+        return {
+            'orders': self.orders,
+            'batches': self.batches,
+            'fallbacks': self.fallbacks,
+            'queued': sum(queue.qsize() for queue in self._queues.values()),
+        }
+
+    async def close(self) -> None:
+        """
+        Waits for every queued order to be applied, then stops the writer tasks.
+        """
+        for queue in list(self._queues.values()):
+            await queue.join()
+        for writer in self._writers.values():
+            writer.cancel()
+        await asyncio.gather(*self._writers.values(), return_exceptions=True)
+        self._queues.clear()
+        self._writers.clear()
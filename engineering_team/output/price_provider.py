@@ -0,0 +1,205 @@
+"""
+Pluggable share-price sources for Account.
+
+A PriceProvider answers bulk lookups through get_prices(symbols). Concrete
+providers wrap a per-symbol function (such as accounts.get_share_price), a
+fixed table, or a local file feed. CachingPriceProvider sits in front of any
+of them with a TTL and a size bound so repeated lookups do not reach the
+source once per symbol per call.
+"""
+
+import csv
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable
+
+
+class PriceProvider:
+    """
+    Interface for share-price sources. Unknown symbols are priced at 0.0,
+    matching the convention of get_share_price.
+    """
+
+    def get_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        """
+        Looks up the current price of several symbols at once.
+
+        Args:
+            symbols (Iterable[str]): Stock ticker symbols, in any case.
+
+        Returns:
+            Dict[str, float]: Each requested symbol, exactly as given, mapped to its price.
+        """
+        raise NotImplementedError
+
+    def get_price(self, symbol: str) -> float:
+        """
+        Looks up the current price of a single symbol.
+
+        Args:
+            symbol (str): The stock ticker symbol.
+
+        Returns:
+            float: The price of one share, or 0.0 if the symbol is unknown.
+        """
+        return self.get_prices([symbol])[symbol]
+
+
+class CallablePriceProvider(PriceProvider):
+    """
+    Adapts a per-symbol price function, such as get_share_price, to the PriceProvider interface.
+    """
+
+    def __init__(self, fetch: Callable[[str], float]):
+        """
+        Args:
+            fetch (Callable[[str], float]): Function returning the price of one symbol.
+        """
+        self._fetch = fetch
+
+    def get_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        return {symbol: self._fetch(symbol) for symbol in symbols}
+
+    def get_price(self, symbol: str) -> float:
+        return self._fetch(symbol)
+
+
+class StaticPriceProvider(PriceProvider):
+    """
+    Serves prices from a fixed symbol -> price table.
+    """
+
+    def __init__(self, prices: Dict[str, float]):
+        """
+        Args:
+            prices (Dict[str, float]): Symbol -> price per share. Symbols are matched case-insensitively.
+        """
+        self._prices = {symbol.upper(): price for symbol, price in prices.items()}
+
+    def get_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        return {symbol: self._prices.get(symbol.upper(), 0.0) for symbol in symbols}
+
+
+class FilePriceProvider(PriceProvider):
+    """
+    Serves prices from a local CSV feed with one `symbol,price` row per line.
+    The file is re-read only when its modification time changes, so another
+    process can refresh the feed by rewriting it.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Path to the CSV price file.
+        """
+        self.path = path
+        self._prices: Dict[str, float] = {}
+        self._loaded_mtime_ns: int = -1
+        self._lock = threading.Lock()
+
+    def _reload_if_changed(self) -> Dict[str, float]:
+        """Re-reads the feed if the file changed since the last read, returning the price table."""
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        with self._lock:
+            if mtime_ns != self._loaded_mtime_ns:
+                prices = {}
+                with open(self.path, newline="") as feed:
+                    for row in csv.reader(feed):
+                        if len(row) < 2 or row[0].strip().lower() == "symbol":
+                            continue  # Skip blank lines and an optional header
+                        prices[row[0].strip().upper()] = float(row[1])
+                self._prices = prices
+                self._loaded_mtime_ns = mtime_ns
+            return self._prices
+
+    def get_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        prices = self._reload_if_changed()
+        return {symbol: prices.get(symbol.upper(), 0.0) for symbol in symbols}
+
+
+class CachingPriceProvider(PriceProvider):
+    """
+    Caches another provider's prices with a time-to-live and a least-recently-used
+    size bound. All cache misses of a lookup are fetched from the source in one
+    bulk call. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        source: PriceProvider,
+        ttl_seconds: float = 1.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            source (PriceProvider): The provider to fetch misses from.
+            ttl_seconds (float, optional): How long a cached price stays valid. Defaults to 1.0.
+            max_entries (int, optional): Maximum number of cached symbols. Defaults to 1024.
+            clock (Callable[[], float], optional): Time source in seconds. Defaults to time.monotonic.
+        """
+        self._source = source
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # Upper symbol -> (price, fetched_at)
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        symbols = list(symbols)
+        now = self._clock()
+        found: Dict[str, float] = {}
+        missing: Dict[str, str] = {}  # Upper symbol -> symbol as first requested
+        with self._lock:
+            for symbol in symbols:
+                symbol_upper = symbol.upper()
+                if symbol_upper in found or symbol_upper in missing:
+                    continue
+                entry = self._entries.get(symbol_upper)
+                if entry is not None and now - entry[1] < self.ttl_seconds:
+                    self._entries.move_to_end(symbol_upper)
+                    found[symbol_upper] = entry[0]
+                    self.hits += 1
+                else:
+                    missing[symbol_upper] = symbol
+                    self.misses += 1
+
+        if missing:
+            fetched = self._source.get_prices(list(missing.values()))
+            with self._lock:
+                for symbol_upper, symbol in missing.items():
+                    found[symbol_upper] = fetched[symbol]
+                    self._entries[symbol_upper] = (fetched[symbol], now)
+                    self._entries.move_to_end(symbol_upper)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return {symbol: found[symbol.upper()] for symbol in symbols}
+
+    def invalidate(self, symbols: Iterable[str] = None) -> None:
+        """
+        Drops cached prices so the next lookup goes to the source.
+
+        Args:
+            symbols (Iterable[str], optional): Symbols to drop. Drops everything if omitted.
+        """
+        with self._lock:
+            if symbols is None:
+                self._entries.clear()
+            else:
+                for symbol in symbols:
+                    self._entries.pop(symbol.upper(), None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns cache counters.
+
+        Returns:
+            Dict[str, int]: 'hits', 'misses' and current number of cached 'entries'.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
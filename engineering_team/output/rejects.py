@@ -0,0 +1,159 @@
+"""
+Bounded log of rejected orders, kept apart from the transaction ledger.
+
+A rejected deposit, withdrawal, buy or sell changes nothing, so it is not
+part of the account's history. Recording it in the ledger would let a client
+that sends invalid orders in a loop grow the ledger, its indexes and every
+history read without limit. RejectLog keeps only the most recent `capacity`
+rejects in a ring buffer, plus lifetime counters by reason, so memory stays
+fixed however many orders are rejected.
+
+Rejects are held in memory only; they are not journaled.
+"""
+
+from collections import deque
+from itertools import islice
+from typing import Any, Dict, List, Optional
+
+from ledger import (
+    format_message,
+    ns_to_datetime,
+    MSG_CUSTOM,
+    MSG_DEPOSIT_NOT_POSITIVE,
+    MSG_WITHDRAW_NOT_POSITIVE,
+    MSG_INSUFFICIENT_FUNDS,
+    MSG_QUANTITY_NOT_POSITIVE,
+    MSG_UNKNOWN_SYMBOL,
+    MSG_INSUFFICIENT_FUNDS_TO_BUY,
+    MSG_NOT_ENOUGH_SHARES,
+)
+
+# Reason counted for each rejection message code
+REJECT_REASONS: Dict[int, str] = {
+    MSG_CUSTOM: "other",
+    MSG_DEPOSIT_NOT_POSITIVE: "amount_not_positive",
+    MSG_WITHDRAW_NOT_POSITIVE: "amount_not_positive",
+    MSG_INSUFFICIENT_FUNDS: "insufficient_funds",
+    MSG_QUANTITY_NOT_POSITIVE: "quantity_not_positive",
+    MSG_UNKNOWN_SYMBOL: "unknown_symbol",
+    MSG_INSUFFICIENT_FUNDS_TO_BUY: "insufficient_funds",
+    MSG_NOT_ENOUGH_SHARES: "not_enough_shares",
+}
+
+
+class RejectLog:
+    """
+    Fixed-size ring buffer of the most recent rejected orders, with counters by reason.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        """
+        Initializes an empty reject log.
+
+        Args:
+            capacity (int, optional): Number of most recent rejects kept. Defaults to 1000.
+
+        Raises:
+            ValueError: If capacity is negative.
+        """
+        if capacity < 0:
+            raise ValueError("Reject log capacity must not be negative.")
+        self.capacity = capacity
+        self._entries: deque = deque(maxlen=capacity)  # Raw tuples, oldest first
+        self._counts: Dict[str, int] = {}  # Reason -> rejects since creation
+        self.total = 0  # Rejects since creation, including those no longer kept
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(
+        self,
+        timestamp_ns: int,
+        transaction_type: str,
+        cash_change: float,
+        symbol: Optional[str],
+        quantity,
+        price_per_share: Optional[float],
+        balance: float,
+        message_code: int,
+        detail: Any = None,
+    ) -> None:
+        """
+        Records one rejected order, evicting the oldest if the log is full.
+
+        Args:
+            timestamp_ns (int): When the order was rejected, in nanoseconds since the epoch.
+            transaction_type (str): "deposit", "withdraw", "buy" or "sell".
+            cash_change (float): The cash effect the order would have had, if known.
+            symbol (Optional[str]): Stock symbol, for share orders.
+            quantity: Number of shares, for share orders.
+            price_per_share (Optional[float]): The quoted price, if one was fetched.
+            balance (float): The unchanged cash balance.
+            message_code (int): Ledger message template explaining the rejection.
+            detail (Any, optional): Extra value required by the message template, if any.
+        """
+        self._entries.append((
+            timestamp_ns, transaction_type, cash_change, symbol, quantity,
+            price_per_share, balance, message_code, detail,
+        ))
+        reason = REJECT_REASONS.get(message_code, "other")
+        self._counts[reason] = self._counts.get(reason, 0) + 1
+        self.total += 1
+
+    @property
+    def dropped(self) -> int:
+        """Rejects counted but evicted from the ring buffer."""
+        return self.total - len(self._entries)
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Returns how many orders were rejected for each reason since the log was created.
+
+        Returns:
+            Dict[str, int]: Reason (e.g. "insufficient_funds") -> number of rejects.
+        """
+        return dict(self._counts)
+
+    @staticmethod
+    def _row(entry: tuple) -> Dict[str, Any]:
+        """Materializes a raw entry in the ledger's transaction dict shape."""
+        (timestamp_ns, transaction_type, cash_change, symbol, quantity,
+         price_per_share, balance, message_code, detail) = entry
+        return {
+            'timestamp': ns_to_datetime(timestamp_ns).isoformat(),
+            'type': transaction_type,
+            'amount_effect_on_cash': cash_change,
+            'symbol': symbol,
+            'quantity': quantity,
+            'price_per_share': price_per_share,
+            'balance_after': balance,
+            'success': False,
+            'message': format_message(
+                message_code, cash_change, balance, symbol, quantity, price_per_share,
+                "" if detail is None else detail,
+            ),
+        }
+
+    def last(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the most recent reject.
+
+        Returns:
+            Optional[Dict[str, Any]]: A new transaction dictionary, or None if the log is empty.
+        """
+        return self._row(self._entries[-1]) if self._entries else None
+
+    def rows(self, limit: int = None) -> List[Dict[str, Any]]:
+        """
+        Materializes the kept rejects.
+
+        Args:
+            limit (int, optional): Only the most recent `limit` rejects. Defaults to all kept.
+
+        Returns:
+            List[Dict[str, Any]]: New transaction dictionaries, oldest first.
+        """
+        entries = self._entries
+        if limit is not None:
+            entries = reversed(list(islice(reversed(entries), limit)))
+        return [self._row(entry) for entry in entries]
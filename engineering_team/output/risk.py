@@ -0,0 +1,167 @@
+"""
+Portfolio risk analytics for Account holdings over a price history.
+
+A RiskModel is built once per price history: a periods-by-symbols matrix of
+closing prices, e.g. a year of daily closes. It precomputes the per-symbol
+price changes, returns and return covariance. Each account is then a row of
+share quantities, and every figure below is computed for all accounts at
+once with matrix products over symbols and reductions over periods, with no
+Python loop over accounts:
+
+    volatility      annualized standard deviation of portfolio returns
+    var_parametric  one-period loss not exceeded at `confidence`, assuming
+                    normally distributed P&L (mean - z * standard deviation)
+    var_historical  the same loss taken from the empirical P&L distribution
+    max_drawdown    largest peak-to-trough fall of portfolio value, as a fraction
+    contribution    each symbol's share of portfolio return variance at the
+                    latest prices (Euler allocation; shares sum to 1)
+
+Holdings are held constant over the history: the figures describe the
+current portfolio's risk, not the risk of the trades that built it. Cash is
+included in portfolio value, so it dampens volatility and drawdown but not
+the currency VaR. See bench_risk.py for timings.
+"""
+
+from statistics import NormalDist
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from accounts import Account
+
+
+class RiskModel:
+    """
+    Risk figures for many portfolios against one shared price history.
+    """
+
+    def __init__(self, symbols: Sequence[str], prices: Any, periods_per_year: int = 252):
+        """
+        Precomputes price changes, returns and covariance for a price history.
+
+        Args:
+            symbols (Sequence[str]): Column names of `prices` (case-insensitive).
+            prices (Any): Array-like of shape (periods, symbols), oldest period first,
+                          with every price positive.
+            periods_per_year (int, optional): Used to annualize volatility, e.g. 252 for
+                                              daily closes. Defaults to 252.
+
+        Raises:
+            ValueError: If the matrix shape does not match `symbols`, it has fewer than
+                        three periods (two price changes), or a price is not positive.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        if prices.ndim != 2 or prices.shape[1] != len(symbols):
+            raise ValueError(f"Expected a (periods, {len(symbols)}) price matrix, got shape {prices.shape}.")
+        if prices.shape[0] < 3:
+            raise ValueError("At least three periods of prices are needed.")
+        if not (prices > 0).all():
+            raise ValueError("Prices must be positive.")
+        self.symbols: List[str] = [symbol.upper() for symbol in symbols]
+        self._columns: Dict[str, int] = {symbol: column for column, symbol in enumerate(self.symbols)}
+        self.periods_per_year = periods_per_year
+        self._prices = prices  # (periods, symbols)
+        self._changes = np.diff(prices, axis=0)  # Per-share P&L per period
+        self._covariance = np.atleast_2d(np.cov(self._changes / prices[:-1], rowvar=False))
+
+    def holdings_matrix(self, accounts: Iterable[Account]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Collects the accounts' current holdings and cash into the batch() layout.
+
+        Args:
+            accounts (Iterable[Account]): The accounts to analyze.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (accounts, symbols) share quantities and
+                                           per-account cash balances.
+
+        Raises:
+            ValueError: If an account holds a symbol with no price history.
+        """
+        accounts = list(accounts)
+        quantities = np.zeros((len(accounts), len(self.symbols)), dtype=np.float64)
+        cash = np.zeros(len(accounts), dtype=np.float64)
+        for row, account in enumerate(accounts):
+            cash[row] = account.get_balance()
+            for symbol, quantity in account.get_holdings().items():
+                column = self._columns.get(symbol.upper())
+                if column is None:
+                    raise ValueError(f"No price history for {symbol!r} held by {account.account_id!r}.")
+                quantities[row, column] = quantity
+        return quantities, cash
+
+    def batch(self, quantities: Any, cash: Any = None, confidence: float = 0.95) -> Dict[str, np.ndarray]:
+        """
+        Computes every risk figure for many portfolios in one vectorized pass.
+
+        Args:
+            quantities (Any): Array-like of shape (accounts, symbols): shares held.
+            cash (Any, optional): Per-account cash balances. Defaults to no cash.
+            confidence (float, optional): VaR confidence level. Defaults to 0.95.
+
+        Returns:
+            Dict[str, np.ndarray]: 'value' (current portfolio value), 'volatility',
+                                   'var_parametric', 'var_historical' and
+                                   'max_drawdown' with one entry per account, and
+                                   'contribution' of shape (accounts, symbols).
+                                   Portfolios without holdings get zeros.
+
+        Raises:
+            ValueError: If `quantities` does not have one column per symbol, or
+                        confidence is not between 0 and 1.
+        """
+        quantities = np.atleast_2d(np.asarray(quantities, dtype=np.float64))
+        if quantities.shape[1] != len(self.symbols):
+            raise ValueError(f"Expected {len(self.symbols)} quantity columns, got {quantities.shape[1]}.")
+        if not 0.0 < confidence < 1.0:
+            raise ValueError("Confidence must be between 0 and 1.")
+        cash = np.zeros(len(quantities)) if cash is None else np.asarray(cash, dtype=np.float64)
+
+        values = quantities @ self._prices.T + cash[:, None]  # (accounts, periods)
+        pnl = quantities @ self._changes.T  # (accounts, periods - 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = np.where(values[:, :-1] > 0, pnl / values[:, :-1], 0.0)
+            peaks = np.maximum.accumulate(values, axis=1)
+            drawdowns = np.where(peaks > 0, 1.0 - values / peaks, 0.0)
+
+        z = NormalDist().inv_cdf(confidence)
+        pnl_mean = pnl.mean(axis=1)
+        pnl_std = pnl.std(axis=1, ddof=1)
+
+        exposures = quantities * self._prices[-1]  # Currency amount per symbol
+        marginal = exposures @ self._covariance
+        variance = (marginal * exposures).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            contribution = np.where(variance[:, None] > 0, exposures * marginal / variance[:, None], 0.0)
+
+        return {
+            'value': values[:, -1],
+            'volatility': returns.std(axis=1, ddof=1) * np.sqrt(self.periods_per_year),
+            'var_parametric': np.maximum(z * pnl_std - pnl_mean, 0.0),
+            'var_historical': np.maximum(-np.quantile(pnl, 1.0 - confidence, axis=1), 0.0),
+            'max_drawdown': drawdowns.max(axis=1),
+            'contribution': contribution,
+        }
+
+    def account_risk(self, account: Account, confidence: float = 0.95) -> Dict[str, Any]:
+        """
+        Computes the risk figures for a single account's current holdings and cash.
+
+        Args:
+            account (Account): The account to analyze.
+            confidence (float, optional): VaR confidence level. Defaults to 0.95.
+
+        Returns:
+            Dict[str, Any]: 'value', 'volatility', 'var_parametric', 'var_historical'
+                            and 'max_drawdown' as floats, and 'contribution' as a
+                            symbol -> share of variance dict for the symbols held.
+
+        Raises:
+            ValueError: If the account holds a symbol with no price history.
+        """
+        quantities, cash = self.holdings_matrix([account])
+        figures = self.batch(quantities, cash, confidence)
+        result: Dict[str, Any] = {name: float(column[0]) for name, column in figures.items() if name != 'contribution'}
+        held = np.flatnonzero(quantities[0])
+        result['contribution'] = {self.symbols[column]: float(figures['contribution'][0, column]) for column in held}
+        return result
@@ -0,0 +1,357 @@
+"""
+AccountBook backed by SQLite, keeping only recently used accounts in memory.
+
+Every account and every ledger row is stored in one SQLite database in WAL
+mode, so readers never block the writer and a crash loses at most the last
+uncommitted group. Only the `cache_size` most recently used accounts are
+kept as Account objects, in an LRU. An account outside it is loaded on
+demand: its ledger rows are read back and its state is restored from the
+snapshot stored when it was last evicted, replaying only rows written after
+that snapshot, and its point-in-time checkpoints are rebuilt. The state snapshot (holdings, marks, tax lots) is written on
+eviction and on close().
+
+New ledger rows are inserted after each operation, and the database commits
+once every `commit_every` operations (group commit) or on commit(). SQL
+statements are fixed module-level strings, so sqlite3's statement cache
+prepares each one once and reuses it. Locking follows AccountBook: one
+striped lock per account, plus a lock around the shared connection.
+
+Free-form ledger details are stored as SQLite values; ints, floats and
+strings round-trip exactly.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import islice
+from typing import Dict, Iterator, List
+
+from account_book import AccountBook
+from accounts import Account
+from ledger import TRANSACTION_TYPES
+from price_provider import PriceProvider
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS accounts (
+        account_id TEXT PRIMARY KEY,
+        state TEXT,
+        state_rows INTEGER NOT NULL DEFAULT 0
+    )""",
+    """CREATE TABLE IF NOT EXISTS transactions (
+        account_id TEXT NOT NULL,
+        row INTEGER NOT NULL,
+        timestamp_ns INTEGER NOT NULL,
+        type INTEGER NOT NULL,
+        cash_change REAL NOT NULL,
+        symbol TEXT,
+        quantity INTEGER,
+        price REAL,
+        balance_after REAL NOT NULL,
+        success INTEGER NOT NULL,
+        message_code INTEGER NOT NULL,
+        detail,
+        PRIMARY KEY (account_id, row)
+    ) WITHOUT ROWID""",
+)
+_INSERT_ACCOUNT = "INSERT INTO accounts (account_id) VALUES (?)"
+_UPDATE_STATE = "UPDATE accounts SET state = ?, state_rows = ? WHERE account_id = ?"
+_SELECT_ACCOUNT = "SELECT state, state_rows FROM accounts WHERE account_id = ?"
+_SELECT_ROWS = (
+    "SELECT timestamp_ns, type, cash_change, symbol, quantity, price, balance_after, success, message_code, detail"
+    " FROM transactions WHERE account_id = ? ORDER BY row"
+)
+_INSERT_ROW = "INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_COUNT_ACCOUNTS = "SELECT COUNT(*) FROM accounts"
+_SELECT_IDS = "SELECT account_id FROM accounts ORDER BY rowid"
+
+_TYPE_CODES = {name: code for code, name in enumerate(TRANSACTION_TYPES)}
+
+
+class SQLiteAccountBook(AccountBook):
+    """
+    An AccountBook whose accounts live in SQLite, with an LRU of hot accounts in memory.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        cache_size: int = 10_000,
+        commit_every: int = 1000,
+        stripes: int = 64,
+        price_provider: PriceProvider = None
+    ):
+        """
+        Opens or creates a book stored in a SQLite database file.
+
+        Args:
+            path (str): Database file; created if it does not exist.
+            cache_size (int, optional): Accounts kept in memory. Defaults to 10,000.
+            commit_every (int, optional): Operations per group commit. Defaults to 1,000.
+            stripes (int, optional): Number of account locks. Defaults to 64.
+            price_provider (PriceProvider, optional): Price source given to every account.
+                                                      Defaults to each Account's own default.
+
+        Raises:
+            ValueError: If cache_size or commit_every is less than 1.
+        """
+        if cache_size < 1 or commit_every < 1:
+            raise ValueError("cache_size and commit_every must be at least 1.")
+        super().__init__(stripes=stripes, price_provider=price_provider)
+        self.path = path
+        self.cache_size = cache_size
+        self.commit_every = commit_every
+        self._cache: "OrderedDict[str, Account]" = OrderedDict()  # Least recently used first
+        self._saved_rows: Dict[str, int] = {}  # Cached account id -> ledger rows already stored
+        self._pinned: Dict[str, int] = {}  # Account id -> open locked() blocks; never evicted
+        self._pending = 0  # Operations since the last commit
+        self._db_lock = threading.Lock()  # A sqlite3 connection is not safe to share unguarded
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")  # With WAL: durable at checkpoints, never corrupt
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        self._db.commit()
+
+    def __len__(self) -> int:
+        with self._db_lock:
+            return self._db.execute(_COUNT_ACCOUNTS).fetchone()[0]
+
+    def __contains__(self, account_id: str) -> bool:
+        if account_id in self._cache:
+            return True
+        with self._db_lock:
+            return self._db.execute(_SELECT_ACCOUNT, (account_id,)).fetchone() is not None
+
+    def account_ids(self) -> List[str]:
+        """
+        Returns the ids of all accounts in the database, hot or cold.
+
+        Returns:
+            List[str]: Account ids, in the order they were opened.
+        """
+        with self._db_lock:
+            return [account_id for (account_id,) in self._db.execute(_SELECT_IDS)]
+
+    def open_account(self, account_id: str) -> Account:
+        """
+        Returns the account with the given id, loading it or creating it if needed.
+
+        Args:
+            account_id (str): A unique identifier for the account.
+
+        Returns:
+            Account: The existing or newly created account.
+        """
+        with self._lock_for(account_id):
+            try:
+                return self._cached(account_id)
+            except KeyError:
+                pass
+            account = Account(account_id, price_provider=self.price_provider)
+            with self._db_lock:
+                self._db.execute(_INSERT_ACCOUNT, (account_id,))
+            self._remember(account, 0)
+            return account
+
+    def close_account(self, account_id: str) -> bool:
+        """
+        Stores an account's rows and state and drops it from memory. Unlike AccountBook,
+        the account stays in the database, and opening the same id again loads it.
+
+        Args:
+            account_id (str): The account id.
+
+        Returns:
+            bool: True if the account was in memory and has been dropped, False if it was
+                  not cached or is inside a locked() block on this thread.
+        """
+        with self._lock_for(account_id):
+            if account_id in self._pinned:
+                return False
+            with self._registry_lock:
+                account = self._cache.pop(account_id, None)
+            if account is None:
+                return False
+            self._store_rows(account)
+            self._store_state(account)
+            del self._saved_rows[account_id]
+            return True
+
+    def get_account(self, account_id: str) -> Account:
+        """
+        Returns an account, loading it if it is cold. Callers that read or trade on it
+        directly must hold locked(account_id): that also keeps it from being evicted, and
+        stores the rows it writes.
+
+        Args:
+            account_id (str): The account id.
+
+        Returns:
+            Account: The account.
+
+        Raises:
+            KeyError: If no account with that id has been opened.
+        """
+        with self._lock_for(account_id):
+            return self._cached(account_id)
+
+    @contextmanager
+    def locked(self, account_id: str) -> Iterator[Account]:
+        """
+        Holds an account's lock for a multi-step read or update, loading it if it is cold.
+        Ledger rows written inside the block are stored when it exits.
+
+        Args:
+            account_id (str): The account id.
+
+        Yields:
+            Account: The account, exclusively owned by the caller until the block exits.
+
+        Raises:
+            KeyError: If no account with that id has been opened.
+        """
+        with self._lock_for(account_id):
+            account = self._cached(account_id)
+            self._pinned[account_id] = self._pinned.get(account_id, 0) + 1
+            try:
+                yield account
+            finally:
+                if self._pinned[account_id] == 1:
+                    del self._pinned[account_id]
+                else:
+                    self._pinned[account_id] -= 1
+                self._store_rows(account)
+
+    def _cached(self, account_id: str) -> Account:
+        """
+        Internal helper that returns an account from the LRU, or loads it into the LRU.
+        The caller holds the account's lock.
+
+        Raises:
+            KeyError: If the account is not in the database.
+        """
+        with self._registry_lock:
+            account = self._cache.get(account_id)
+            if account is not None:
+                self._cache.move_to_end(account_id)
+                return account
+        account, rows = self._load(account_id)
+        self._remember(account, rows)
+        return account
+
+    def _remember(self, account: Account, stored_rows: int) -> None:
+        """Internal helper that adds an account to the LRU, evicting cold ones past cache_size."""
+        with self._registry_lock:
+            self._cache[account.account_id] = account
+            self._saved_rows[account.account_id] = stored_rows
+            excess = len(self._cache) - self.cache_size
+            candidates = list(islice(self._cache, max(excess, 0) * 2 + 1))  # Some may be busy
+        for account_id in candidates:
+            if excess <= 0:
+                break
+            # Stripe locks are reentrant, so this thread may be inside a block on the victim
+            if account_id == account.account_id or account_id in self._pinned:
+                continue
+            lock = self._lock_for(account_id)
+            # Never wait: another thread may hold this stripe while waiting for ours
+            if not lock.acquire(blocking=False):
+                continue
+            try:
+                with self._registry_lock:
+                    victim = self._cache.pop(account_id, None)
+                if victim is not None:
+                    self._store_rows(victim)
+                    self._store_state(victim)
+                    del self._saved_rows[account_id]
+                    excess -= 1
+            finally:
+                lock.release()
+
+    def _load(self, account_id: str) -> tuple:
+        """
+        Internal helper that rebuilds a cold account from its stored rows and state snapshot.
+
+        Returns:
+            tuple: (account, number of ledger rows loaded).
+
+        Raises:
+            KeyError: If the account is not in the database.
+        """
+        with self._db_lock:
+            found = self._db.execute(_SELECT_ACCOUNT, (account_id,)).fetchone()
+            if found is None:
+                raise KeyError(account_id)
+            state, state_rows = found
+            stored = self._db.execute(_SELECT_ROWS, (account_id,)).fetchall()
+
+        account = Account(account_id, price_provider=self.price_provider)
+        ledger = account._transactions
+        for (timestamp_ns, type_code, cash_change, symbol, quantity, price,
+             balance_after, success, message_code, detail) in stored:
+            ledger.append(timestamp_ns, TRANSACTION_TYPES[type_code], cash_change, symbol, quantity,
+                          price, balance_after, bool(success), message_code, detail)
+        account._restore(json.loads(state) if state is not None else None, state_rows)
+        account._after_append()
+        return account, len(ledger)
+
+    def _store_rows(self, account: Account) -> None:
+        """Internal helper that inserts an account's new ledger rows, committing every commit_every calls."""
+        account_id = account.account_id
+        stored = self._saved_rows.get(account_id)
+        if stored is None:
+            return  # Evicted since the caller got it, and stored then
+        ledger = account._transactions
+        rows = len(ledger)
+        with self._db_lock:
+            if rows > stored:
+                self._db.executemany(_INSERT_ROW, (
+                    (account_id, index, timestamp_ns, _TYPE_CODES[transaction_type], *rest)
+                    for index in range(stored, rows)
+                    for timestamp_ns, transaction_type, *rest in (ledger.raw_row(index),)
+                ))
+                self._saved_rows[account_id] = rows
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self._db.commit()
+                self._pending = 0
+
+    def _store_state(self, account: Account) -> None:
+        """Internal helper that stores an account's state snapshot, so loading skips the replay."""
+        state = json.dumps(account._export_state())
+        with self._db_lock:
+            self._db.execute(_UPDATE_STATE, (state, len(account._transactions), account.account_id))
+
+    def cached_ids(self) -> List[str]:
+        """
+        Returns the ids of the accounts currently held in memory.
+
+        Returns:
+            List[str]: Account ids, least recently used first.
+        """
+        with self._registry_lock:
+            return list(self._cache)
+
+    def commit(self) -> None:
+        """
+        Makes every ledger row stored so far durable without waiting for the group to fill.
+        """
+        with self._db_lock:
+            self._db.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        """
+        Stores the rows and state of every cached account, commits and closes the database.
+        """
+        for account_id in self.cached_ids():
+            with self._lock_for(account_id):
+                with self._registry_lock:
+                    account = self._cache.get(account_id)
+                if account is not None:
+                    self._store_rows(account)
+                    self._store_state(account)
+        self.commit()
+        with self._db_lock:
+            self._db.close()
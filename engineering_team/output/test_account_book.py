@@ -0,0 +1,122 @@
+import threading
+import unittest
+
+from account_book import AccountBook
+from price_provider import StaticPriceProvider
+
+
+class TestAccountBook(unittest.TestCase):
+    """
+    Unit tests for the AccountBook class in account_book.py.
+    """
+
+    def setUp(self):
+        """
+        Set up a fresh book with fixed prices before each test.
+        """
+        self.book = AccountBook(stripes=4, price_provider=StaticPriceProvider({"AAPL": 10.00}))
+
+    def test_open_account_is_idempotent(self):
+        """
+        Test opening an id twice returns the same account.
+        """
+        account = self.book.open_account("alice")
+        self.assertIs(self.book.open_account("alice"), account)
+        self.assertIs(self.book.get_account("alice"), account)
+        self.assertIn("alice", self.book)
+        self.assertEqual(len(self.book), 1)
+        self.assertEqual(self.book.account_ids(), ["alice"])
+        with self.assertRaises(KeyError):
+            self.book.get_account("bob")
+
+    def test_operations_delegate_to_account(self):
+        """
+        Test the book's trading methods act on the right account.
+        """
+        self.book.open_account("alice")
+        self.book.open_account("bob")
+        self.assertTrue(self.book.deposit("alice", 100.00))
+        self.assertTrue(self.book.buy_shares("alice", "AAPL", 5))
+        self.assertTrue(self.book.sell_shares("alice", "AAPL", 2))
+        self.assertTrue(self.book.withdraw("alice", 10.00))
+        self.assertTrue(self.book.execute_batch("bob", [{'type': 'deposit', 'amount': 50.00}]))
+        with self.book.locked("alice") as alice:
+            self.assertAlmostEqual(alice.get_balance(), 60.00)
+            self.assertEqual(alice.get_holdings(), {"AAPL": 3})
+        self.assertAlmostEqual(self.book.get_account("bob").get_balance(), 50.00)
+
+    def test_close_account_removes_it(self):
+        """
+        Test a closed account leaves the book, and reopening its id starts afresh.
+        """
+        self.book.open_account("alice")
+        self.book.deposit("alice", 100.00)
+        self.assertTrue(self.book.close_account("alice"))
+        self.assertNotIn("alice", self.book)
+        self.assertEqual(len(self.book), 0)
+        with self.assertRaises(KeyError):
+            self.book.get_account("alice")
+        self.assertFalse(self.book.close_account("alice"))
+        self.assertAlmostEqual(self.book.open_account("alice").get_balance(), 0.00)
+
+    def test_locked_never_yields_a_closed_account(self):
+        """
+        Test locked() waiting on an account that is closed meanwhile raises KeyError.
+        """
+        self.book.open_account("alice")
+        outcome = []
+
+        def trade():
+            try:
+                with self.book.locked("alice") as alice:
+                    outcome.append("alice" in self.book and alice.deposit(1.00))
+            except KeyError:
+                outcome.append(KeyError)
+
+        with self.book.locked("alice"):
+            thread = threading.Thread(target=trade)
+            thread.start()
+            thread.join(timeout=0.1)  # Let it reach the lock
+            self.assertTrue(self.book.close_account("alice"))
+        thread.join()
+        self.assertEqual(outcome, [KeyError])
+
+    def test_concurrent_withdrawals_never_overdraw(self):
+        """
+        Test threads racing to withdraw from one account cannot take more than it holds.
+        """
+        self.book.open_account("shared")
+        self.book.deposit("shared", 1000.00)
+        successes = []
+
+        def drain():
+            count = 0
+            for _ in range(200):
+                if self.book.withdraw("shared", 7.00):
+                    count += 1
+            successes.append(count)
+
+        threads = [threading.Thread(target=drain) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum(successes), 142)  # floor(1000 / 7)
+        self.assertAlmostEqual(self.book.get_account("shared").get_balance(), 1000.00 - 142 * 7.00)
+
+    def test_concurrent_open_account(self):
+        """
+        Test threads opening the same id all get one shared account.
+        """
+        opened = []
+        threads = [threading.Thread(target=lambda: opened.append(self.book.open_account("x"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(account) for account in opened}), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,12 @@
 ```python
 import unittest
 import datetime
+import threading
 from unittest.mock import patch, ANY
 
 # Assuming accounts.py is in the same directory
 from accounts import Account, get_share_price 
+from price_provider import StaticPriceProvider
 
 class TestAccount(unittest.TestCase):
     """
@@ -66,7 +68,8 @@ class TestAccount(unittest.TestCase):
         self.assertFalse(self.account.deposit(-50.00))
         self.assertAlmostEqual(self.account.get_balance(), 0.0)
         self.assertAlmostEqual(self.account.get_initial_deposit_total(), 0.0)
-        transactions = self.account.get_transactions()
+        self.assertEqual(len(self.account.get_transactions()), 0)  # Rejects stay out of the ledger
+        transactions = self.account.get_rejects()
         self.assertEqual(len(transactions), 1)
         self.assertDictContainsSubset({
             'timestamp': "2023-01-01T10:00:00",
@@ -88,7 +91,8 @@ class TestAccount(unittest.TestCase):
         self.assertFalse(self.account.deposit(0.0))
         self.assertAlmostEqual(self.account.get_balance(), 0.0)
         self.assertAlmostEqual(self.account.get_initial_deposit_total(), 0.0)
-        transactions = self.account.get_transactions()
+        self.assertEqual(len(self.account.get_transactions()), 0)  # Rejects stay out of the ledger
+        transactions = self.account.get_rejects()
         self.assertEqual(len(transactions), 1)
         self.assertDictContainsSubset({
             'timestamp': "2023-01-01T10:00:00",
@@ -132,8 +136,9 @@ class TestAccount(unittest.TestCase):
         self.account.deposit(50.00)
         self.assertFalse(self.account.withdraw(100.00))
         self.assertAlmostEqual(self.account.get_balance(), 50.00) # Balance should remain unchanged
-        transactions = self.account.get_transactions()
-        self.assertEqual(len(transactions), 2)
+        self.assertEqual(len(self.account.get_transactions()), 1)  # Rejects stay out of the ledger
+        transactions = self.account.get_rejects()
+        self.assertEqual(len(transactions), 1)
         self.assertDictContainsSubset({
             'timestamp': "2023-01-01T10:00:00",
             'type': 'withdraw',
@@ -141,8 +146,8 @@ class TestAccount(unittest.TestCase):
             'balance_after': 50.00, # Balance should be what it was before failed transaction
             'success': False,
             'message': ANY # Message will contain dynamic balance, so check with ANY
-        }, transactions[1])
-        self.assertIn("Insufficient funds", transactions[1]['message'])
+        }, transactions[0])
+        self.assertIn("Insufficient funds", transactions[0]['message'])
 
     @patch('accounts.datetime')
     def test_withdraw_negative_amount(self, mock_datetime):
@@ -155,8 +160,9 @@ class TestAccount(unittest.TestCase):
         self.account.deposit(100.00)
         self.assertFalse(self.account.withdraw(-10.00))
         self.assertAlmostEqual(self.account.get_balance(), 100.00)
-        transactions = self.account.get_transactions()
-        self.assertEqual(len(transactions), 2)
+        self.assertEqual(len(self.account.get_transactions()), 1)  # Rejects stay out of the ledger
+        transactions = self.account.get_rejects()
+        self.assertEqual(len(transactions), 1)
         self.assertDictContainsSubset({
             'timestamp': "2023-01-01T10:00:00",
             'type': 'withdraw',
@@ -164,7 +170,7 @@ class TestAccount(unittest.TestCase):
             'balance_after': 100.00,
             'success': False,
             'message': 'Withdrawal amount must be positive.'
-        }, transactions[1])
+        }, transactions[0])
 
     @patch('accounts.datetime')
     def test_withdraw_zero_amount(self, mock_datetime):
@@ -177,8 +183,9 @@ class TestAccount(unittest.TestCase):
         self.account.deposit(100.00)
         self.assertFalse(self.account.withdraw(0.0))
         self.assertAlmostEqual(self.account.get_balance(), 100.00)
-        transactions = self.account.get_transactions()
-        self.assertEqual(len(transactions), 2)
+        self.assertEqual(len(self.account.get_transactions()), 1)  # Rejects stay out of the ledger
+        transactions = self.account.get_rejects()
+        self.assertEqual(len(transactions), 1)
         self.assertDictContainsSubset({
             'timestamp': "2023-01-01T10:00:00",
             'type': 'withdraw',
@@ -186,7 +193,7 @@ class TestAccount(unittest.TestCase):
             'balance_after': 100.00,
             'success': False,
             'message': 'Withdrawal amount must be positive.'
-        }, transactions[1])
+        }, transactions[0])
 
     @patch('accounts.get_share_price')
     @patch('accounts.datetime')
@@ -233,8 +240,9 @@ class TestAccount(unittest.TestCase):
         self.assertAlmostEqual(self.account.get_balance(), 500.00)
         self.assertEqual(self.account.get_holdings(), {}) # Holdings should remain empty
 
-        transactions = self.account.get_transactions()
-        self.assertEqual(len(transactions), 2)
+        self.assertEqual(len(self.account.get_transactions()), 1)  # Rejects stay out of the ledger
+        transactions = self.account.get_rejects()
+        self.assertEqual(len(transactions), 1)
         self.assertDictContainsSubset({
             'timestamp': "2023-01-01T10:00:00",
             'type': 'buy',
@@ -245,8 +253,8 @@ class TestAccount(unittest.TestCase):
             'balance_after': 500.00,
             'success': False,
             'message': ANY
-        }, transactions[1])
-        self.assertIn("Insufficient funds", transactions[1]['message'])
+        }, transactions[0])
+        self.assertIn("Insufficient funds", transactions[0]['message'])
 
     @patch('accounts.get_share_price')
     @patch('accounts.datetime')
@@ -264,14 +272,15 @@ class TestAccount(unittest.TestCase):
         self.assertAlmostEqual(self.account.get_balance(), 1000.00)
         self.assertEqual(self.account.get_holdings(), {})
 
-        transactions = self.account.get_transactions()
-        self.assertEqual(len(transactions), 3) # Deposit + two failed buys
+        self.assertEqual(len(self.account.get_transactions()), 1)  # Rejects stay out of the ledger
+        transactions = self.account.get_rejects()
+        self.assertEqual(len(transactions), 2)
         self.assertDictContainsSubset({
             'type': 'buy', 'quantity': 0, 'success': False, 'message': 'Quantity must be positive.'
-        }, transactions[1])
+        }, transactions[0])
         self.assertDictContainsSubset({
             'type': 'buy', 'quantity': -5, 'success': False, 'message': 'Quantity must be positive.'
-        }, transactions[2])
+        }, transactions[1])
         mock_get_share_price.assert_not_called() # Price lookup should not happen for invalid quantity
 
     @patch('accounts.get_share_price')
@@ -289,8 +298,9 @@ class TestAccount(unittest.TestCase):
         self.assertAlmostEqual(self.account.get_balance(), 1000.00)
         self.assertEqual(self.account.get_holdings(), {})
 
-        transactions = self.account.get_transactions()
-        self.assertEqual(len(transactions), 2)
+        self.assertEqual(len(self.account.get_transactions()), 1)  # Rejects stay out of the ledger
+        transactions = self.account.get_rejects()
+        self.assertEqual(len(transactions), 1)
         self.assertDictContainsSubset({
             'timestamp': "2023-01-01T10:00:00",
             'type': 'buy',
@@ -299,7 +309,7 @@ class TestAccount(unittest.TestCase):
             'price_per_share': 0.0,
             'success': False,
             'message': 'Invalid or unknown symbol: UNKNOWN. Cannot get price.'
-        }, transactions[1])
+        }, transactions[0])
         mock_get_share_price.assert_called_with("UNKNOWN")
 
     @patch('accounts.get_share_price')
@@ -368,8 +378,9 @@ class TestAccount(unittest.TestCase):
         self.assertAlmostEqual(self.account.get_balance(), 10000.00 - (170.00 * 10)) # Balance unchanged from before failed sell
         self.assertEqual(self.account.get_holdings(), {"AAPL": 10}) # Holdings unchanged
 
-        transactions = self.account.get_transactions()
-        self.assertEqual(len(transactions), 3)
+        self.assertEqual(len(self.account.get_transactions()), 2)  # Rejects stay out of the ledger
+        transactions = self.account.get_rejects()
+        self.assertEqual(len(transactions), 1)
         self.assertDictContainsSubset({
             'timestamp': "2023-01-01T10:02:00",
             'type': 'sell',
@@ -378,8 +389,8 @@ class TestAccount(unittest.TestCase):
             'quantity': 20,
             'success': False,
             'message': ANY
-        }, transactions[2])
-        self.assertIn("Not enough AAPL shares to sell", transactions[2]['message'])
+        }, transactions[0])
+        self.assertIn("Not enough AAPL shares to sell", transactions[0]['message'])
         # get_share_price should not be called if holding check fails first
         # For simplicity, if it's called, it's fine as long as transaction fails.
         # But, ideally, it's short-circuited.
@@ -401,16 +412,17 @@ class TestAccount(unittest.TestCase):
         self.assertAlmostEqual(self.account.get_balance(), 1000.00)
         self.assertEqual(self.account.get_holdings(), {})
 
-        transactions = self.account.get_transactions()
-        self.assertEqual(len(transactions), 2)
+        self.assertEqual(len(self.account.get_transactions()), 1)  # Rejects stay out of the ledger
+        transactions = self.account.get_rejects()
+        self.assertEqual(len(transactions), 1)
         self.assertDictContainsSubset({
             'type': 'sell',
             'symbol': 'MSFT',
             'quantity': 5,
             'success': False,
             'message': ANY
-        }, transactions[1])
-        self.assertIn("Not enough MSFT shares to sell", transactions[1]['message'])
+        }, transactions[0])
+        self.assertIn("Not enough MSFT shares to sell", transactions[0]['message'])
         mock_get_share_price.assert_not_called() # Price lookup should not happen if stock not held
 
     @patch('accounts.get_share_price')
@@ -432,13 +444,15 @@ class TestAccount(unittest.TestCase):
         self.assertAlmostEqual(self.account.get_balance(), 1000.00) # 2000 - (100 * 10)
         self.assertEqual(self.account.get_holdings(), {"GOOGL": 10})
 
-        transactions = self.account.get_transactions()
-        self.assertEqual(len(transactions), 3) # Deposit + Buy + 1 failed sell
+        self.assertEqual(len(self.account.get_transactions()), 2)  # Rejects stay out of the ledger
+        transactions = self.account.get_rejects()
+        self.assertEqual(len(transactions), 2)
         self.assertDictContainsSubset({
             'type': 'sell', 'quantity': 0, 'success': False, 'message': 'Quantity must be positive.'
-        }, transactions[2])
-        # The second invalid sell would also be recorded if it were allowed to proceed,
-        # but the test stops at the first failure.
+        }, transactions[0])
+        self.assertDictContainsSubset({
+            'type': 'sell', 'quantity': -5, 'success': False, 'message': 'Quantity must be positive.'
+        }, transactions[1])
         mock_get_share_price.assert_called_with("GOOGL") # Called for buy. Not called for invalid sell quantity.
 
     @patch('accounts.get_share_price')
@@ -462,8 +476,9 @@ class TestAccount(unittest.TestCase):
         self.assertAlmostEqual(self.account.get_balance(), 1000.00) # 2000 - (100 * 10)
         self.assertEqual(self.account.get_holdings(), {"XYZ": 10})
 
-        transactions = self.account.get_transactions()
-        self.assertEqual(len(transactions), 3) # Deposit + Buy + Failed Sell
+        self.assertEqual(len(self.account.get_transactions()), 2)  # Rejects stay out of the ledger
+        transactions = self.account.get_rejects()
+        self.assertEqual(len(transactions), 1)
         self.assertDictContainsSubset({
             'type': 'sell',
             'symbol': 'XYZ',
@@ -471,7 +486,7 @@ class TestAccount(unittest.TestCase):
             'price_per_share': 0.0,
             'success': False,
             'message': 'Invalid or unknown symbol: XYZ. Cannot get price.'
-        }, transactions[2])
+        }, transactions[0])
         # get_share_price should have been called twice, once for buy, once for sell
         self.assertEqual(mock_get_share_price.call_count, 2)
         mock_get_share_price.assert_any_call("XYZ")
@@ -534,7 +549,7 @@ class TestAccount(unittest.TestCase):
         """
         Test get_portfolio_value calculates total value correctly.
         """
-        mock_get_share_price.side_effect = [170.00, 250.00, 175.00, 260.00] # For buy/sell and then for portfolio value check
+        mock_get_share_price.side_effect = [170.00, 250.00] # Prices for the two buys
 
         self.assertEqual(self.account.get_portfolio_value(), 0.0)
 
@@ -542,28 +557,35 @@ class TestAccount(unittest.TestCase):
         self.assertAlmostEqual(self.account.get_portfolio_value(), 10000.00)
 
         self.account.buy_shares("AAPL", 10) # Buy at 170. Balance: 10000 - 1700 = 8300. Holdings: {'AAPL': 10}
-                                            # Mock for portfolio value: AAPL price 175
-        expected_value = 8300.00 + (10 * 175.00) # 8300 + 1750 = 10050
+        self.assertAlmostEqual(self.account.get_portfolio_value(), 10000.00) # Marked at the trade price
+
+        # Reading the value must not hit the price feed
         mock_get_share_price.reset_mock()
-        mock_get_share_price.side_effect = [175.00] # Price for AAPL for portfolio calculation
+        self.account.get_portfolio_value()
+        mock_get_share_price.assert_not_called()
+
+        # Full re-price pulls one price per holding: AAPL 175
+        expected_value = 8300.00 + (10 * 175.00) # 8300 + 1750 = 10050
+        mock_get_share_price.side_effect = [175.00]
+        self.account.reprice()
         self.assertAlmostEqual(self.account.get_portfolio_value(), expected_value)
         mock_get_share_price.assert_called_once_with("AAPL")
 
+        mock_get_share_price.side_effect = [250.00]
         self.account.buy_shares("TSLA", 5) # Buy at 250. Balance: 8300 - 1250 = 7050. Holdings: {'AAPL': 10, 'TSLA': 5}
-                                            # Mock for portfolio value: AAPL 175, TSLA 260
+        # Explicit tick for TSLA only: AAPL 175, TSLA 260
         expected_value = 7050.00 + (10 * 175.00) + (5 * 260.00) # 7050 + 1750 + 1300 = 10100
         mock_get_share_price.reset_mock()
-        mock_get_share_price.side_effect = [175.00, 260.00] # Prices for AAPL, TSLA
+        self.account.reprice({"TSLA": 260.00, "MSFT": 999.00}) # MSFT is not held and is ignored
         self.assertAlmostEqual(self.account.get_portfolio_value(), expected_value)
-        mock_get_share_price.assert_any_call("AAPL")
-        mock_get_share_price.assert_any_call("TSLA")
+        mock_get_share_price.assert_not_called()
 
     @patch('accounts.get_share_price')
     def test_get_profit_loss(self, mock_get_share_price):
         """
         Test get_profit_loss calculates profit/loss correctly.
         """
-        mock_get_share_price.side_effect = [170.00, 250.00, 175.00, 260.00] # For buy/sell and then for portfolio value check
+        mock_get_share_price.side_effect = [170.00, 250.00] # Prices for the two buys
 
         self.assertEqual(self.account.get_profit_loss(), 0.0)
 
@@ -571,32 +593,36 @@ class TestAccount(unittest.TestCase):
         self.assertAlmostEqual(self.account.get_profit_loss(), 0.0) # Portfolio value = 10000, P/L = 10000 - 10000 = 0
 
         self.account.buy_shares("AAPL", 10) # Buy at 170. Balance: 8300. Holdings: {'AAPL': 10}
-        # For portfolio value: AAPL price 175
+        # AAPL moves to 175
         # Portfolio Value = 8300 + (10 * 175) = 10050
         # P/L = 10050 - 10000 = 50
-        mock_get_share_price.reset_mock()
-        mock_get_share_price.side_effect = [175.00]
+        self.account.reprice({"AAPL": 175.00})
         self.assertAlmostEqual(self.account.get_profit_loss(), 50.00)
 
         self.account.buy_shares("TSLA", 5) # Buy at 250. Balance: 7050. Holdings: {'AAPL': 10, 'TSLA': 5}
-        # For portfolio value: AAPL 175, TSLA 260
+        # TSLA moves to 260
         # Portfolio Value = 7050 + (10 * 175) + (5 * 260) = 10100
         # P/L = 10100 - 10000 = 100
-        mock_get_share_price.reset_mock()
-        mock_get_share_price.side_effect = [175.00, 260.00]
+        self.account.reprice({"TSLA": 260.00})
         self.assertAlmostEqual(self.account.get_profit_loss(), 100.00)
 
         # Simulate a loss
-        # Sell AAPL for less than bought, or prices drop
         self.account.deposit(5000) # Initial deposit total now 15000.
                                    # Balance: 12050 (7050 + 5000). Holdings: {'AAPL':10, 'TSLA':5}
                                    # P/L base should be 15000.
-        mock_get_share_price.reset_mock()
-        mock_get_share_price.side_effect = [160.00, 240.00] # New prices for AAPL, TSLA
+        self.account.reprice({"AAPL": 160.00, "TSLA": 240.00}) # New prices for AAPL, TSLA
         # Current PV = 12050 + (10 * 160) + (5 * 240) = 12050 + 1600 + 1200 = 14850
         # P/L = 14850 - 15000 = -150
         self.assertAlmostEqual(self.account.get_profit_loss(), -150.00)
 
+        # Selling everything leaves only cash in the portfolio value
+        mock_get_share_price.side_effect = [160.00, 240.00]
+        self.account.sell_shares("AAPL", 10)
+        self.account.sell_shares("TSLA", 5)
+        self.assertEqual(self.account.get_holdings(), {})
+        self.assertAlmostEqual(self.account.get_portfolio_value(), self.account.get_balance())
+        self.assertAlmostEqual(self.account.get_profit_loss(), -150.00)
+
 
     @patch('accounts.datetime')
     @patch('accounts.get_share_price')
@@ -627,7 +653,7 @@ class TestAccount(unittest.TestCase):
         self.account.withdraw(2000.00) # 5 - Failed withdrawal
 
         transactions = self.account.get_transactions()
-        self.assertEqual(len(transactions), 5)
+        self.assertEqual(len(transactions), 4) # The failed withdrawal goes to the reject log
 
         # Check types and order
         self.assertEqual(transactions[0]['type'], 'deposit')
@@ -656,10 +682,12 @@ class TestAccount(unittest.TestCase):
         self.assertEqual(transactions[3]['timestamp'], "2023-01-01T10:03:00")
         self.assertAlmostEqual(transactions[3]['balance_after'], 650.00) # 450 + 2*100 = 650
 
-        self.assertEqual(transactions[4]['type'], 'withdraw')
-        self.assertFalse(transactions[4]['success'])
-        self.assertEqual(transactions[4]['timestamp'], "2023-01-01T10:04:00")
-        self.assertAlmostEqual(transactions[4]['balance_after'], 650.00) # Balance should not change for failed transactions
+        rejects = self.account.get_rejects()
+        self.assertEqual(len(rejects), 1)
+        self.assertEqual(rejects[0]['type'], 'withdraw')
+        self.assertFalse(rejects[0]['success'])
+        self.assertEqual(rejects[0]['timestamp'], "2023-01-01T10:04:00")
+        self.assertAlmostEqual(rejects[0]['balance_after'], 650.00) # Balance should not change for failed transactions
 
 
     def test_holdings_copy_integrity(self):
@@ -692,6 +720,401 @@ class TestAccount(unittest.TestCase):
         self.assertNotEqual(self.account.get_transactions(), transactions_copy)
 
 
+    @patch('accounts.get_share_price')
+    def test_execute_batch_successful(self, mock_get_share_price):
+        """
+        Test a batch is applied in full with one price lookup per symbol.
+        """
+        mock_get_share_price.side_effect = lambda symbol: {"AAPL": 100.00, "TSLA": 200.00}[symbol.upper()]
+
+        self.assertTrue(self.account.execute_batch([
+            {'type': 'deposit', 'amount': 5000.00},
+            {'type': 'buy', 'symbol': 'AAPL', 'quantity': 10},   # -1000
+            {'type': 'buy', 'symbol': 'TSLA', 'quantity': 5},    # -1000
+            {'type': 'sell', 'symbol': 'aapl', 'quantity': 4},   # +400
+            {'type': 'withdraw', 'amount': 400.00},
+        ]))
+        self.assertAlmostEqual(self.account.get_balance(), 3000.00)
+        self.assertAlmostEqual(self.account.get_initial_deposit_total(), 5000.00)
+        self.assertEqual(self.account.get_holdings(), {"AAPL": 6, "TSLA": 5})
+        self.assertAlmostEqual(self.account.get_portfolio_value(), 3000.00 + 600.00 + 1000.00)
+        self.assertEqual(mock_get_share_price.call_count, 2) # AAPL priced once for both orders
+
+        transactions = self.account.get_transactions()
+        self.assertEqual([t['type'] for t in transactions], ['deposit', 'buy', 'buy', 'sell', 'withdraw'])
+        self.assertEqual([t['balance_after'] for t in transactions], [5000.00, 4000.00, 3000.00, 3400.00, 3000.00])
+        self.assertEqual(transactions[3]['message'], 'Sold 4 aapl at 100.00 each.')
+        self.assertTrue(all(t['success'] for t in transactions))
+        self.assertEqual(len({t['timestamp'] for t in transactions}), 1) # Written as one bulk append
+
+    @patch('accounts.get_share_price')
+    def test_execute_batch_all_or_nothing(self, mock_get_share_price):
+        """
+        Test a batch with one failing order leaves the account untouched.
+        """
+        mock_get_share_price.return_value = 100.00
+        self.account.deposit(1000.00)
+
+        self.assertFalse(self.account.execute_batch([
+            {'type': 'buy', 'symbol': 'AAPL', 'quantity': 5},    # -500, fine on its own
+            {'type': 'withdraw', 'amount': 600.00},              # Only 500 left in the batch
+            {'type': 'deposit', 'amount': 100.00},
+        ]))
+        self.assertAlmostEqual(self.account.get_balance(), 1000.00)
+        self.assertAlmostEqual(self.account.get_initial_deposit_total(), 1000.00)
+        self.assertEqual(self.account.get_holdings(), {})
+
+        self.assertEqual(len(self.account.get_transactions()), 1) # Only the deposit
+        self.assertDictContainsSubset({
+            'type': 'withdraw',
+            'amount_effect_on_cash': -600.00,
+            'balance_after': 1000.00,
+            'success': False,
+        }, self.account.get_last_reject())
+        self.assertIn("Insufficient funds", self.account.get_last_reject()['message'])
+
+        # Callers retrying the orders one by one can skip logging the batch's reject
+        self.assertFalse(self.account.execute_batch([{'type': 'withdraw', 'amount': 5000.00}], record_failure=False))
+        self.assertEqual(len(self.account.get_rejects()), 1)
+
+    def test_execute_batch_rejects_symbol_missing_from_snapshot(self):
+        """
+        Test a symbol the provider's batch snapshot leaves out is rejected as unknown, not raised.
+        """
+        class PartialPriceProvider(StaticPriceProvider):
+            def get_prices(self, symbols):
+                return {symbol: price for symbol, price in super().get_prices(symbols).items() if price > 0}
+
+        account = Account("partial", price_provider=PartialPriceProvider({"AAPL": 100.00}))
+        account.deposit(1000.00)
+        self.assertFalse(account.execute_batch([
+            {'type': 'buy', 'symbol': 'AAPL', 'quantity': 2},
+            {'type': 'buy', 'symbol': 'NOPE', 'quantity': 1},
+        ]))
+        self.assertEqual(account.get_holdings(), {})
+        self.assertEqual(account.get_reject_counts(), {"unknown_symbol": 1})
+        self.assertEqual(account.get_last_reject()['symbol'], "NOPE")
+        self.assertTrue(account.execute_batch([{'type': 'buy', 'symbol': 'AAPL', 'quantity': 2}]))
+
+    @patch('accounts.get_share_price')
+    def test_execute_batch_sell_checks_shares_bought_in_batch(self, mock_get_share_price):
+        """
+        Test holdings are validated against the running state of the batch.
+        """
+        mock_get_share_price.return_value = 10.00
+        self.account.deposit(1000.00)
+
+        self.assertTrue(self.account.execute_batch([
+            {'type': 'buy', 'symbol': 'XYZ', 'quantity': 10},
+            {'type': 'sell', 'symbol': 'XYZ', 'quantity': 10},
+        ]))
+        self.assertEqual(self.account.get_holdings(), {})
+        self.assertAlmostEqual(self.account.get_portfolio_value(), 1000.00)
+
+        self.assertFalse(self.account.execute_batch([{'type': 'sell', 'symbol': 'XYZ', 'quantity': 1}]))
+        self.assertIn("Not enough XYZ shares to sell. Have: 0", self.account.get_last_reject()['message'])
+
+        with self.assertRaises(ValueError):
+            self.account.execute_batch([{'type': 'short', 'symbol': 'XYZ', 'quantity': 1}])
+
+    @patch('accounts.get_share_price')
+    @patch('accounts.datetime')
+    def test_point_in_time_queries(self, mock_datetime, mock_get_share_price):
+        """
+        Test holdings and profit/loss can be queried as of past points in time.
+        """
+        self.account = Account("test_account_123", checkpoint_interval=2)
+        mock_get_share_price.side_effect = [100.00, 120.00, 130.00]
+        mock_datetime.datetime.now.side_effect = [
+            datetime.datetime(2023, 1, 1, 10, 0, 0), # Deposit 2000
+            datetime.datetime(2023, 1, 1, 10, 1, 0), # Buy 10 AAPL at 100
+            datetime.datetime(2023, 1, 1, 10, 2, 0), # Failed withdrawal
+            datetime.datetime(2023, 1, 1, 10, 3, 0), # Buy 5 TSLA at 120
+            datetime.datetime(2023, 1, 1, 10, 4, 0), # Sell 10 AAPL at 130
+        ]
+        self.account.deposit(2000.00)
+        self.account.buy_shares("AAPL", 10)
+        self.account.withdraw(5000.00)
+        self.account.buy_shares("TSLA", 5)
+        self.account.sell_shares("AAPL", 10)
+
+        self.assertEqual(self.account.get_holdings_at(datetime.datetime(2023, 1, 1, 9, 59, 0)), {})
+        self.assertEqual(self.account.get_profit_loss_at(datetime.datetime(2023, 1, 1, 9, 59, 0)), 0.0)
+        self.assertEqual(self.account.get_holdings_at(datetime.datetime(2023, 1, 1, 10, 1, 0)), {"AAPL": 10})
+        self.assertEqual(self.account.get_holdings_at(datetime.datetime(2023, 1, 1, 10, 3, 30)), {"AAPL": 10, "TSLA": 5})
+        self.assertEqual(self.account.get_holdings_at(datetime.datetime(2023, 1, 1, 11, 0, 0)), {"TSLA": 5})
+        self.assertEqual(self.account.get_holdings_at(datetime.datetime(2023, 1, 1, 11, 0, 0)), self.account.get_holdings())
+
+        # Valued at the last trade prices known at that time: 1400 cash + 10 * 100 + 5 * 120 - 2000
+        self.assertAlmostEqual(self.account.get_profit_loss_at(datetime.datetime(2023, 1, 1, 10, 3, 0)), 0.0)
+        # Or at explicit prices
+        self.assertAlmostEqual(
+            self.account.get_profit_loss_at(datetime.datetime(2023, 1, 1, 10, 3, 0), {"aapl": 110.00}), 100.00
+        )
+        self.assertAlmostEqual(
+            self.account.get_profit_loss_at(datetime.datetime(2023, 1, 1, 12, 0, 0)), self.account.get_profit_loss()
+        )
+
+    def test_ledger_columns(self):
+        """
+        Test the raw ledger columns and symbol table line up with the recorded transactions.
+        """
+        account = Account("columns", price_provider=StaticPriceProvider({"AAPL": 100.00, "TSLA": 50.00}))
+        account.deposit(1000.00)
+        account.buy_shares("tsla", 2)
+        account.buy_shares("AAPL", 3)
+        columns, symbol_names = account.ledger_columns()
+        self.assertEqual(len(columns['timestamps']), 3)
+        self.assertEqual([symbol_names[code] if code >= 0 else None for code in columns['symbols']], [None, "tsla", "AAPL"])
+        self.assertEqual(list(columns['balances_after']), [1000.00, 900.00, 600.00])
+
+    @patch('accounts.get_share_price')
+    @patch('accounts.datetime')
+    def test_transaction_views(self, mock_datetime, mock_get_share_price):
+        """
+        Test filtered, paginated and reverse reads of the transaction history.
+        """
+        mock_get_share_price.return_value = 10.00
+        mock_datetime.datetime.now.side_effect = [
+            datetime.datetime(2023, 1, 1, 10, 0, 0), # Deposit 1000
+            datetime.datetime(2023, 1, 1, 10, 1, 0), # Buy 5 AAPL
+            datetime.datetime(2023, 1, 1, 10, 2, 0), # Failed withdrawal
+            datetime.datetime(2023, 1, 1, 10, 3, 0), # Buy 2 tsla
+            datetime.datetime(2023, 1, 1, 10, 4, 0), # Sell 5 AAPL
+            datetime.datetime(2023, 1, 1, 10, 5, 0), # Failed sell of AAPL
+        ]
+        self.assertIsNone(self.account.get_last_transaction())
+        self.assertIsNone(self.account.transactions().last())
+
+        self.account.deposit(1000.00)
+        self.account.buy_shares("AAPL", 5)
+        self.account.withdraw(5000.00)
+        self.account.buy_shares("tsla", 2)
+        self.account.sell_shares("AAPL", 5)
+        self.account.sell_shares("AAPL", 1)
+        everything = self.account.get_transactions()
+
+        view = self.account.transactions()
+        self.assertEqual(len(view), 4) # The two failed orders went to the reject log
+        self.assertEqual(list(view), everything)
+        self.assertEqual(list(reversed(view)), everything[::-1])
+        self.assertEqual(view[-1], everything[-1])
+        self.assertEqual(view.last(), self.account.get_last_transaction())
+        self.assertEqual(view.page(offset=1, limit=2), everything[1:3])
+        self.assertEqual(view.page(offset=1, limit=2, reverse=True), [everything[2], everything[1]])
+
+        self.assertEqual([t['type'] for t in self.account.transactions(transaction_type="buy")], ["buy", "buy"])
+        self.assertEqual(len(self.account.transactions(symbol="TSLA")), 1)
+        self.assertEqual(len(self.account.transactions(success=False)), 0)
+        self.assertEqual(len(self.account.get_rejects()), 2)
+        self.assertEqual(
+            self.account.get_last_reject()['message'],
+            "Not enough AAPL shares to sell. Have: 0, Requested: 1",
+        )
+        self.assertEqual(len(self.account.transactions(transaction_type="sell", success=True)), 1)
+        window = self.account.transactions(
+            start=datetime.datetime(2023, 1, 1, 10, 1, 0), end=datetime.datetime(2023, 1, 1, 10, 3, 0)
+        )
+        self.assertEqual(list(window), everything[1:3])
+        self.assertEqual(len(self.account.transactions(transaction_type="deposit", end=datetime.datetime(2023, 1, 1))), 0)
+
+        # Cursor pagination in both directions, stable across new appends
+        rows, cursor = view.page_after(limit=3)
+        self.assertEqual(rows, everything[:3])
+        mock_datetime.datetime.now.side_effect = [datetime.datetime(2023, 1, 1, 10, 6, 0)]
+        self.account.deposit(1.00)
+        rows, cursor = view.page_after(cursor, limit=4)
+        self.assertEqual((rows, cursor), (everything[3:], None))
+        rows, cursor = self.account.transactions().page_after(limit=3, reverse=True)
+        self.assertEqual(rows[0]['amount_effect_on_cash'], 1.00)
+        rows, cursor = self.account.transactions().page_after(cursor, limit=3, reverse=True)
+        self.assertEqual(rows, everything[1::-1])
+
+        with self.assertRaises(ValueError):
+            self.account.transactions(transaction_type="short")
+
+
+    @patch('accounts.get_share_price')
+    def test_tax_lots_and_realized_profit_loss(self, mock_get_share_price):
+        """
+        Test per-symbol cost basis and realized/unrealized profit and loss under FIFO.
+        """
+        mock_get_share_price.side_effect = [100.00, 120.00, 50.00, 130.00]
+        self.account.deposit(10000.00)
+        self.account.buy_shares("AAPL", 10)  # 10 @ 100
+        self.account.buy_shares("aapl", 10)  # 10 @ 120
+        self.account.buy_shares("TSLA", 4)  # 4 @ 50
+        self.account.sell_shares("AAPL", 15)  # Closes 10 @ 100 and 5 @ 120 at 130
+
+        self.assertEqual(self.account.get_lots("AAPL"), [(5, 120.00)])
+        self.assertAlmostEqual(self.account.get_cost_basis("aapl"), 600.00)
+        self.assertAlmostEqual(self.account.get_realized_profit_loss("AAPL"), 15 * 130.00 - 1600.00)
+        self.assertAlmostEqual(self.account.get_unrealized_profit_loss("AAPL"), 5 * 130.00 - 600.00)
+        self.assertEqual(self.account.get_realized_profit_loss("TSLA"), 0.0)
+        self.assertEqual(self.account.get_unrealized_profit_loss("MSFT"), 0.0)
+        self.assertEqual(self.account.get_lots("MSFT"), [])
+
+        # Totals: realized plus unrealized is the overall profit/loss
+        self.assertAlmostEqual(self.account.get_cost_basis(), 800.00)
+        self.assertAlmostEqual(
+            self.account.get_realized_profit_loss() + self.account.get_unrealized_profit_loss(),
+            self.account.get_profit_loss(),
+        )
+        self.account.reprice({"TSLA": 60.00})
+        self.assertAlmostEqual(self.account.get_unrealized_profit_loss("TSLA"), 40.00)
+        self.assertAlmostEqual(
+            self.account.get_realized_profit_loss() + self.account.get_unrealized_profit_loss(),
+            self.account.get_profit_loss(),
+        )
+
+    def test_cost_basis_methods(self):
+        """
+        Test LIFO and average-cost accounts, including trades made in a batch.
+        """
+        lifo = Account("lifo", cost_basis_method="lifo")
+        average = Account("average", cost_basis_method="average")
+        for account in (lifo, average):
+            account.deposit(10000.00)
+            account.price_provider = StaticPriceProvider({"AAPL": 100.00})
+            account.buy_shares("AAPL", 10)
+            account.price_provider = StaticPriceProvider({"AAPL": 200.00})
+            self.assertTrue(account.execute_batch([
+                {'type': 'buy', 'symbol': 'AAPL', 'quantity': 10},
+                {'type': 'sell', 'symbol': 'AAPL', 'quantity': 5},
+            ]))
+
+        self.assertEqual(lifo.get_lots("AAPL"), [(10, 100.00), (5, 200.00)])
+        self.assertAlmostEqual(lifo.get_realized_profit_loss(), 0.0)
+        self.assertEqual(average.get_lots("AAPL"), [(15, 150.00)])
+        self.assertAlmostEqual(average.get_realized_profit_loss(), 250.00)
+
+        with self.assertRaises(ValueError):
+            Account("bad", cost_basis_method="hifo")
+
+    def test_snapshots_are_consistent_and_immutable(self):
+        """
+        Test snapshots describe one moment and are not changed by later trades or reprices.
+        """
+        self.account.price_provider = StaticPriceProvider({"AAPL": 100.00, "TSLA": 50.00})
+        self.account.deposit(1000.00)
+        self.account.buy_shares("AAPL", 2)
+        before = self.account.get_snapshot()
+
+        self.account.buy_shares("AAPL", 1)
+        self.account.sell_shares("AAPL", 3)
+        self.account.deposit(50.00)
+        self.account.reprice({"AAPL": 120.00})  # Nothing held; no new snapshot
+
+        self.assertEqual(before.sequence, 2)
+        self.assertEqual(before.balance, 800.00)
+        self.assertEqual(dict(before.holdings), {"AAPL": 2})
+        self.assertEqual(before.portfolio_value, 1000.00)
+        self.assertEqual(before.profit_loss, 0.0)
+        with self.assertRaises(TypeError):
+            before.holdings["AAPL"] = 5
+
+        self.account.buy_shares("TSLA", 4)
+        self.account.reprice({"TSLA": 60.00})
+        after = self.account.get_snapshot()
+        self.assertEqual(after.sequence, len(self.account.get_transactions()))
+        self.assertEqual(dict(after.holdings), self.account.get_holdings())
+        self.assertEqual(after.marks["TSLA"], 60.00)
+        self.assertAlmostEqual(after.portfolio_value, self.account.get_portfolio_value())
+        self.assertAlmostEqual(after.profit_loss, self.account.get_profit_loss())
+        self.assertAlmostEqual(after.cost_basis, 200.00)
+        self.assertEqual(dict(before.holdings), {"AAPL": 2})
+
+    def test_failed_write_does_not_block_snapshots(self):
+        """
+        Test a write that raises midway still ends, so later snapshots do not wait forever.
+        """
+        self.account.price_provider = StaticPriceProvider({"AAPL": 100.00})
+        self.account.deposit(1000.00)
+        with patch.object(self.account, "_fill", side_effect=RuntimeError("lot store failed")):
+            with self.assertRaises(RuntimeError):
+                self.account.buy_shares("AAPL", 1)
+        with patch.object(self.account._transactions, "extend", side_effect=MemoryError):
+            with self.assertRaises(MemoryError):
+                self.account.execute_batch([{'type': 'deposit', 'amount': 1.00}])
+        self.assertEqual(self.account._version % 2, 0)
+
+        snapshots = []
+        reader = threading.Thread(target=lambda: snapshots.append(self.account.get_snapshot()))
+        reader.start()
+        reader.join(timeout=5)
+        self.assertFalse(reader.is_alive())
+        self.assertEqual(snapshots[0].sequence, 1)
+        self.assertTrue(self.account.deposit(1.00))
+        self.assertEqual(self.account.get_snapshot().sequence, 2)
+
+    def test_status_snapshot(self):
+        """
+        Test the status snapshot prices holdings with one lookup, without changing the
+        account, and reports the latest message from the same snapshot.
+        """
+        provider = StaticPriceProvider({"AAPL": 100.00, "TSLA": 50.00})
+        self.account.price_provider = provider
+        self.assertIsNone(self.account.get_status_snapshot().last_message)
+        self.account.deposit(1000.00)
+        self.account.buy_shares("AAPL", 2)
+        self.account.buy_shares("TSLA", 4)
+
+        provider = self.account.price_provider = StaticPriceProvider({"AAPL": 110.00, "TSLA": 50.00})
+        version = self.account._version
+        with patch.object(provider, "get_prices", wraps=provider.get_prices) as get_prices:
+            status = self.account.get_status_snapshot()
+        get_prices.assert_called_once_with(["AAPL", "TSLA"])
+        self.assertEqual(self.account._version, version)  # A read, not a reprice
+        self.assertEqual(self.account.get_snapshot().marks["AAPL"], 100.00)
+        self.assertAlmostEqual(self.account.get_portfolio_value(), 1000.00)
+        self.assertEqual(status.sequence, 3)
+        self.assertEqual(status.balance, 600.00)
+        self.assertEqual(status.holdings, (("AAPL", 2, 110.00, 220.00), ("TSLA", 4, 50.00, 200.00)))
+        self.assertEqual(status.holdings[0].value, 220.00)
+        self.assertAlmostEqual(status.portfolio_value, 1020.00)
+        self.assertAlmostEqual(status.profit_loss, 20.00)
+        self.assertEqual(status.initial_deposit_total, 1000.00)
+        self.assertEqual(status.last_message, self.account.get_last_transaction()['message'])
+
+        self.account.sell_shares("AAPL", 5)  # Rejected
+        status = self.account.get_status_snapshot({"aapl": 90.00})
+        self.assertEqual(status.last_message, self.account.get_last_reject()['message'])
+        self.assertEqual(status.last_message, self.account.get_snapshot().last_message)
+        self.assertEqual(status.holdings[0].price, 90.00)
+        self.assertEqual(status.holdings[1].price, 50.00)  # Unpriced: its last mark
+        self.account.deposit(1.00)
+        self.assertIn("Deposited", self.account.get_status_snapshot().last_message)
+
+    def test_snapshots_while_another_thread_trades(self):
+        """
+        Test every snapshot taken during concurrent trading is internally consistent.
+        """
+        self.account.price_provider = StaticPriceProvider({"AAPL": 100.00, "TSLA": 50.00})
+        self.account.deposit(1_000_000.00)
+
+        def trade():
+            for _ in range(2000):
+                self.account.buy_shares("AAPL", 3)
+                self.account.execute_batch([
+                    {'type': 'buy', 'symbol': 'TSLA', 'quantity': 2},
+                    {'type': 'sell', 'symbol': 'AAPL', 'quantity': 3},
+                ])
+                self.account.sell_shares("TSLA", 2)
+
+        writer = threading.Thread(target=trade)
+        writer.start()
+        snapshots = 0
+        while writer.is_alive() or snapshots == 0:
+            snapshot = self.account.get_snapshot()
+            held = sum(quantity * snapshot.marks[symbol] for symbol, quantity in snapshot.holdings.items())
+            self.assertAlmostEqual(snapshot.portfolio_value, snapshot.balance + held)
+            self.assertAlmostEqual(snapshot.portfolio_value, 1_000_000.00)
+            self.assertEqual(snapshot.balance, self.account._transactions.balance_after(snapshot.sequence - 1))
+            snapshots += 1
+        writer.join()
+        self.assertEqual(self.account.get_snapshot().sequence, 8001)
+
+
 # This allows running the tests directly from the file
 if __name__ == '__main__':
     unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,138 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+from backtest import (
+    Backtest,
+    MovingAverageCrossover,
+    TickFile,
+    TickPriceProvider,
+    csv_to_binary,
+    parameter_grid,
+    sweep,
+    write_ticks,
+)
+from ledger import datetime_to_ns
+
+T0 = datetime_to_ns(datetime.datetime(2023, 1, 2, 9, 30, 0))
+SECOND = 1_000_000_000
+# AAPL rises then falls; TSLA drifts down
+TICKS = [
+    (T0 + i * SECOND, symbol, price)
+    for i, (symbol, price) in enumerate([
+        ("AAPL", 100.00), ("TSLA", 50.00), ("AAPL", 101.00), ("AAPL", 103.00),
+        ("TSLA", 49.00), ("AAPL", 106.00), ("AAPL", 104.00), ("AAPL", 98.00),
+        ("TSLA", 48.00), ("AAPL", 95.00),
+    ])
+]
+
+
+def buy_first_sell_last(backtest, timestamp_ns, symbol, price):
+    """Buys 10 AAPL on the first AAPL tick and sells them on the 8th tick overall."""
+    if symbol == "AAPL" and not backtest.account.get_holdings() and timestamp_ns == T0:
+        backtest.account.buy_shares("aapl", 10)
+    elif timestamp_ns == T0 + 7 * SECOND:
+        backtest.account.sell_shares("AAPL", 10)
+
+
+class TestBacktest(unittest.TestCase):
+    """
+    Unit tests for the tick files, Backtest engine and parameter sweeps in backtest.py.
+    """
+
+    def setUp(self):
+        """
+        Write the sample ticks as both a binary and a CSV tick file.
+        """
+        self._directory = tempfile.TemporaryDirectory()
+        self.binary_path = os.path.join(self._directory.name, "ticks.bin")
+        self.csv_path = os.path.join(self._directory.name, "ticks.csv")
+        write_ticks(self.binary_path, TICKS)
+        with open(self.csv_path, "w") as csv_file:
+            csv_file.write("timestamp,symbol,price\n")
+            for i, (timestamp_ns, symbol, price) in enumerate(TICKS):
+                # Mix ISO and nanosecond timestamps, and lower-case symbols
+                stamp = (datetime.datetime(2023, 1, 2, 9, 30, i).isoformat() if i % 2 else str(timestamp_ns))
+                csv_file.write(f"{stamp},{symbol.lower()},{price}\n")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_tick_files_round_trip(self):
+        """
+        Test binary and CSV tick files yield the same ticks, and CSV converts to binary.
+        """
+        with TickFile(self.binary_path) as ticks:
+            self.assertTrue(ticks.binary)
+            self.assertEqual(ticks.symbols, ["AAPL", "TSLA"])
+            self.assertEqual(list(ticks), TICKS)
+        with TickFile(self.csv_path) as ticks:
+            self.assertFalse(ticks.binary)
+            self.assertEqual(list(ticks), TICKS)
+
+        converted = os.path.join(self._directory.name, "converted.bin")
+        self.assertEqual(csv_to_binary(self.csv_path, converted), len(TICKS))
+        with TickFile(converted) as ticks:
+            self.assertEqual(list(ticks), TICKS)
+
+    def test_tick_price_provider(self):
+        """
+        Test prices come from the latest tick, case-insensitively, with 0.0 for unseen symbols.
+        """
+        provider = TickPriceProvider()
+        provider.prices["AAPL"] = 101.50
+        self.assertEqual(provider.get_prices(["aapl", "MSFT"]), {"aapl": 101.50, "MSFT": 0.0})
+
+    def test_trades_at_tick_prices_and_times(self):
+        """
+        Test strategy orders fill at the current tick's price and are stamped with its time.
+        """
+        with TickFile(self.binary_path) as ticks:
+            result = Backtest(buy_first_sell_last, initial_cash=10000.00, equity_every=4).run(ticks)
+
+        trades = result.trades()
+        self.assertEqual([(t['type'], t['price_per_share']) for t in trades], [("buy", 100.00), ("sell", 98.00)])
+        self.assertEqual(trades[0]['timestamp'], "2023-01-02T09:30:00")
+        self.assertEqual(trades[1]['timestamp'], "2023-01-02T09:30:07")
+
+        summary = result.summary()
+        self.assertEqual(summary['ticks'], 10)
+        self.assertEqual(summary['trades'], 2)
+        self.assertAlmostEqual(summary['profit_loss'], -20.00)
+        self.assertAlmostEqual(summary['realized_profit_loss'], -20.00)
+        self.assertEqual(summary['unrealized_profit_loss'], 0.0)
+
+        # Samples after ticks 4 and 8, plus the last tick; held 10 AAPL at 103 at tick 4
+        self.assertEqual(list(result.equity_timestamps), [T0 + 3 * SECOND, T0 + 7 * SECOND, T0 + 9 * SECOND])
+        self.assertEqual(list(result.equity), [10030.00, 9980.00, 9980.00])
+
+    def test_moving_average_crossover(self):
+        """
+        Test the example strategy enters on the upswing and exits on the downturn.
+        """
+        with TickFile(self.csv_path) as ticks:
+            result = Backtest(MovingAverageCrossover(fast=2, slow=4, quantity=5)).run(ticks)
+        trades = result.trades()
+        self.assertEqual([t['type'] for t in trades], ["buy", "sell"])
+        self.assertEqual(trades[0]['symbol'], "AAPL")
+        self.assertEqual(result.account.get_holdings(), {})
+
+    def test_sweep(self):
+        """
+        Test a parameter sweep gives the same results in worker processes as in-process.
+        """
+        grid = parameter_grid(fast=[2, 3], slow=[4, 6])
+        self.assertEqual(len(grid), 4)
+        self.assertEqual(grid[1], {'fast': 2, 'slow': 6})
+
+        serial = sweep(self.binary_path, MovingAverageCrossover, grid, processes=1, initial_cash=5000.00)
+        parallel = sweep(self.binary_path, MovingAverageCrossover, grid, processes=2, initial_cash=5000.00)
+        self.assertEqual([r['params'] for r in parallel], grid)
+        for expected, actual in zip(serial, parallel):
+            self.assertEqual(expected['profit_loss'], actual['profit_loss'])
+            self.assertEqual(expected['trades'], actual['trades'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import asyncio
+import shutil
+import tempfile
+import threading
+import unittest
+
+from accounts import Account
+from journal import DurableAccount
+from price_provider import StaticPriceProvider
+
+PRICES = StaticPriceProvider({"AAPL": 100.00, "TSLA": 50.00})
+
+
+class TestChangeFeed(unittest.TestCase):
+    """
+    Unit tests for the Account change feed in accounts.py and change_feed.py.
+    """
+
+    def setUp(self):
+        """
+        Set up an account with two ledger rows already written.
+        """
+        self.account = Account("feed", price_provider=PRICES)
+        self.account.deposit(1000.00)
+        self.account.buy_shares("aapl", 2)
+
+    def test_subscriber_receives_each_row_with_deltas(self):
+        """
+        Test a callback gets one event per ledger row, with balance and holdings deltas.
+        """
+        events = []
+        self.account.subscribe(events.append)
+        self.account.sell_shares("AAPL", 1)
+        self.account.withdraw(5000.00)  # Rejected; not a ledger row
+        self.account.execute_batch([
+            {'type': 'buy', 'symbol': 'TSLA', 'quantity': 4},
+            {'type': 'withdraw', 'amount': 50.00},
+        ])
+
+        self.assertEqual([event['sequence'] for event in events], [3, 4, 5])
+        self.assertEqual(self.account.get_sequence(), 5)
+        sell, buy, withdraw = events
+        self.assertEqual(sell['transaction'], self.account.get_transactions()[2])
+        self.assertEqual(sell['holdings_change'], {"AAPL": -1})
+        self.assertEqual(sell['balance_change'], 100.00)
+        self.assertEqual(buy['holdings_change'], {"TSLA": 4})
+        self.assertEqual(withdraw['holdings_change'], {})
+        self.assertEqual(withdraw['balance'], self.account.get_balance())
+
+        # Applying the deltas reproduces the account's state
+        holdings = {"AAPL": 2}
+        for event in events:
+            for symbol, change in event['holdings_change'].items():
+                holdings[symbol] = holdings.get(symbol, 0) + change
+        self.assertEqual(holdings, self.account.get_holdings())
+
+    def test_resume_from_a_cursor(self):
+        """
+        Test changes() and subscribe(since=...) deliver exactly the events after a cursor.
+        """
+        self.assertEqual([event['sequence'] for event in self.account.changes()], [1, 2])
+        cursor = self.account.get_sequence()
+        self.account.deposit(10.00)
+        self.assertEqual([event['transaction']['type'] for event in self.account.changes(cursor)], ["deposit"])
+
+        events = []
+        subscription_id = self.account.subscribe(events.append, since=1)
+        self.account.deposit(20.00)
+        self.assertEqual([event['sequence'] for event in events], [2, 3, 4])
+
+        self.assertTrue(self.account.unsubscribe(subscription_id))
+        self.assertFalse(self.account.unsubscribe(subscription_id))
+        self.account.deposit(30.00)
+        self.assertEqual(len(events), 3)
+
+        with self.assertRaises(ValueError):
+            self.account.changes(-1)
+        with self.assertRaises(ValueError):
+            self.account.subscribe(events.append, since=99)
+
+    def test_sequence_survives_recovery(self):
+        """
+        Test a durable account continues its sequence numbers after being reopened.
+        """
+        directory = tempfile.mkdtemp(prefix="feed_")
+        try:
+            durable = DurableAccount("durable", directory, price_provider=PRICES)
+            durable.deposit(100.00)
+            durable.deposit(200.00)
+            durable.close()
+
+            reopened = DurableAccount("durable", directory, price_provider=PRICES)
+            events = []
+            reopened.subscribe(events.append, since=1)
+            reopened.deposit(300.00)
+            self.assertEqual([event['balance'] for event in events], [300.00, 600.00])
+            self.assertEqual([event['sequence'] for event in events], [2, 3])
+            reopened.close()
+        finally:
+            shutil.rmtree(directory)
+
+    def test_async_stream(self):
+        """
+        Test stream() yields catch-up and new events, including changes from another thread.
+        """
+        async def consume():
+            received = []
+            async for event in self.account.stream(since=1):
+                received.append(event['sequence'])
+                if event['sequence'] == 2:
+                    self.account.deposit(5.00)
+                    worker = threading.Thread(target=self.account.deposit, args=(6.00,))
+                    worker.start()
+                    worker.join()
+                elif event['sequence'] == 4:
+                    break
+            return received
+
+        self.assertEqual(asyncio.run(consume()), [2, 3, 4])
+        self.assertEqual(len(self.account._feed), 0)  # Ending the iteration unsubscribes
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import os
+import tempfile
+import unittest
+
+from journal import DurableAccount, Journal
+from price_provider import StaticPriceProvider
+
+PRICES = StaticPriceProvider({"AAPL": 100.00, "TSLA": 50.00})
+
+
+class TestDurableAccount(unittest.TestCase):
+    """
+    Unit tests for the Journal and DurableAccount classes in journal.py.
+    """
+
+    def setUp(self):
+        """
+        Give each test its own data directory.
+        """
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def open(self, **kwargs) -> DurableAccount:
+        return DurableAccount("acct", self.directory, price_provider=PRICES, **kwargs)
+
+    def trade(self, account: DurableAccount) -> None:
+        account.deposit(10000.00)
+        account.buy_shares("AAPL", 20)
+        account.buy_shares("tsla", 10)
+        account.withdraw(50000.00)  # Fails
+        account.sell_shares("AAPL", 5)
+        account.execute_batch([
+            {'type': 'withdraw', 'amount': 100.00},
+            {'type': 'buy', 'symbol': 'TSLA', 'quantity': 2},
+        ])
+
+    def assert_same_account(self, recovered: DurableAccount, original: DurableAccount) -> None:
+        self.assertAlmostEqual(recovered.get_balance(), original.get_balance())
+        self.assertAlmostEqual(recovered.get_initial_deposit_total(), original.get_initial_deposit_total())
+        self.assertEqual(recovered.get_holdings(), original.get_holdings())
+        self.assertAlmostEqual(recovered.get_portfolio_value(), original.get_portfolio_value())
+        self.assertEqual(recovered.get_transactions(), original.get_transactions())
+
+    def test_recovers_after_close(self):
+        """
+        Test a reopened account has the same state and history.
+        """
+        account = self.open()
+        self.trade(account)
+        account.close()
+
+        recovered = self.open()
+        self.assert_same_account(recovered, account)
+        # The rejected withdrawal was only logged in memory; rejects are not journaled
+        self.assertIn("Insufficient funds", account.get_last_reject()['message'])
+        self.assertEqual(recovered.get_rejects(), [])
+
+        # Keeps journaling after recovery, reusing the stored symbol table
+        recovered.sell_shares("TSLA", 12)
+        recovered.close()
+        again = self.open()
+        self.assert_same_account(again, recovered)
+        self.assertEqual(again.get_holdings(), {"AAPL": 15})
+        again.close()
+
+    def test_recovers_from_snapshot_and_tail(self):
+        """
+        Test recovery restores state from the snapshot and replays only the rows after it.
+        """
+        account = self.open(snapshot_every=4)
+        self.trade(account)  # 7 rows: one snapshot after row 4, then a 3-row tail
+        account.close()
+        self.assertTrue(os.path.exists(os.path.join(self.directory, "acct.snapshot.json")))
+
+        recovered = self.open(snapshot_every=4, checkpoint_interval=2)
+        self.assert_same_account(recovered, account)
+        self.assertEqual(recovered._snapshot_rows, 4)
+        # Checkpoints are rebuilt across the whole history, before and after the snapshot
+        self.assertEqual(recovered._checkpoint_rows, [0, 2, 4, 6])
+        self.assertEqual(recovered._checkpoints[1][1], {"AAPL": 20})
+        recovered.close()
+
+    def test_recovers_tax_lots(self):
+        """
+        Test lots and realized P&L survive recovery, and a snapshot taken under another
+        cost basis method is ignored in favour of a full replay.
+        """
+        account = self.open(snapshot_every=4)
+        self.trade(account)
+        account.close()
+
+        recovered = self.open(snapshot_every=4)
+        self.assertEqual(recovered._snapshot_rows, 4)
+        for symbol in ("AAPL", "TSLA"):
+            self.assertEqual(recovered.get_lots(symbol), account.get_lots(symbol))
+            self.assertAlmostEqual(recovered.get_realized_profit_loss(symbol), account.get_realized_profit_loss(symbol))
+        self.assertAlmostEqual(recovered.get_cost_basis(), account.get_cost_basis())
+        recovered.close()
+
+        averaged = self.open(snapshot_every=4, cost_basis_method="average")
+        self.assertEqual(averaged._snapshot_rows, 0)
+        self.assertEqual(averaged.get_lots("TSLA"), [(12, 50.00)])
+        self.assertEqual(averaged.get_holdings(), account.get_holdings())
+        averaged.close()
+
+    def test_uncommitted_records_are_lost_on_crash(self):
+        """
+        Test a crash keeps only the rows covered by the last group commit.
+        """
+        account = self.open(commit_every=4)
+        self.trade(account)  # 6 rows, only the first 4 committed
+
+        crashed = self.open()  # Opened without closing the first instance
+        self.assertEqual(len(crashed.get_transactions()), 4)
+        self.assertEqual(crashed.get_transactions(), account.get_transactions()[:4])
+        self.assertAlmostEqual(crashed.get_balance(), account.get_transactions()[3]['balance_after'])
+        self.assertEqual(crashed.get_holdings(), {"AAPL": 15, "TSLA": 10})
+        crashed.close()
+        account.close()
+
+    def test_journal_grows_past_preallocation(self):
+        """
+        Test the journal remaps and keeps every record when it outgrows its file.
+        """
+        path = os.path.join(self.directory, "small.journal")
+        journal = Journal(path, commit_every=10, grow_bytes=256)
+        rows = [(i, "deposit", 1.0, None, None, None, float(i), True, 1, None) for i in range(100)]
+        for row in rows:
+            journal.append(row)
+        journal.close()
+        self.assertEqual(list(Journal(path).records()), rows)
+
+    def test_rejects_foreign_file(self):
+        """
+        Test opening a file that is not a journal fails loudly.
+        """
+        path = os.path.join(self.directory, "other.journal")
+        with open(path, "wb") as other:
+            other.write(b"x" * 128)
+        with self.assertRaises(ValueError):
+            Journal(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import datetime
+import itertools
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from accounts import Account
+from ledger import TRANSACTION_TYPES, datetime_to_ns
+from ledger_file import LedgerFile, export_ledgers
+from price_provider import StaticPriceProvider
+
+PRICES = StaticPriceProvider({"AAPL": 100.00, "TSLA": 50.00})
+
+
+class TestLedgerFile(unittest.TestCase):
+    """
+    Unit tests for export_ledgers and LedgerFile in ledger_file.py.
+    """
+
+    def setUp(self):
+        """
+        Set up two traded accounts and a scratch directory.
+        """
+        self.directory = tempfile.mkdtemp(prefix="ledger_file_")
+        self.path = os.path.join(self.directory, "ledgers.bin")
+        self.alice = Account("alice", price_provider=PRICES)
+        self.alice.deposit(10000.00)
+        self.alice.buy_shares("AAPL", 10)
+        self.alice.buy_shares("tsla", 20)
+        self.alice.buy_shares("AAPL", 5)
+        self.alice.sell_shares("aapl", 12)
+        self.alice.withdraw(99999.00)  # Rejected; not part of the ledger
+        self.alice.execute_batch([
+            {'type': 'withdraw', 'amount': 100.00},
+            {'type': 'sell', 'symbol': 'TSLA', 'quantity': 5},
+        ])
+        self.bob = Account("bob", price_provider=PRICES)
+        self.bob.deposit(500.00)
+        self.bob.buy_shares("TSLA", 2)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def assert_same_account(self, loaded: Account, original: Account) -> None:
+        self.assertEqual(loaded.account_id, original.account_id)
+        self.assertEqual(loaded.get_transactions(), original.get_transactions())
+        self.assertAlmostEqual(loaded.get_balance(), original.get_balance())
+        self.assertAlmostEqual(loaded.get_initial_deposit_total(), original.get_initial_deposit_total())
+        self.assertEqual(loaded.get_holdings(), original.get_holdings())
+        self.assertAlmostEqual(loaded.get_portfolio_value(), original.get_portfolio_value())
+        self.assertAlmostEqual(loaded.get_cost_basis(), original.get_cost_basis())
+        self.assertAlmostEqual(loaded.get_realized_profit_loss(), original.get_realized_profit_loss())
+
+    def test_round_trip_of_many_accounts(self):
+        """
+        Test exported accounts load back with the same history, state and indexes.
+        """
+        self.assertEqual(export_ledgers(self.path, [self.alice, self.bob], row_group_size=3), 9)
+
+        with LedgerFile(self.path) as ledger_file:
+            self.assertEqual(ledger_file.account_ids(), ["alice", "bob"])
+            loaded = ledger_file.load_accounts(price_provider=PRICES)
+        self.assert_same_account(loaded["alice"], self.alice)
+        self.assert_same_account(loaded["bob"], self.bob)
+
+        alice = loaded["alice"]
+        self.assertEqual(alice.get_lots("AAPL"), self.alice.get_lots("AAPL"))
+        self.assertEqual(list(alice.transactions(symbol="TSLA")), list(self.alice.transactions(symbol="tsla")))
+        self.assertEqual(len(alice.transactions("sell")), 2)
+        self.assertEqual(alice.get_rejects(), [])
+        # The loaded account keeps trading normally
+        self.assertTrue(alice.sell_shares("TSLA", 15))
+        self.assertEqual(alice.get_holdings(), {"AAPL": 3})
+
+    def test_loaded_account_keeps_its_checkpoints(self):
+        """
+        Test a loaded account has a checkpoint every interval and answers point-in-time queries.
+        """
+        start = datetime.datetime(2023, 1, 1, 10, 0, 0)
+        minutes = itertools.count()
+        clock = lambda: datetime_to_ns(start + datetime.timedelta(minutes=next(minutes)))
+        original = Account("carol", price_provider=PRICES, checkpoint_interval=3, clock=clock)
+        original.deposit(10000.00)
+        for i in range(12):
+            original.buy_shares("AAPL" if i % 3 else "TSLA", 2)
+            if i % 4 == 3:
+                original.sell_shares("AAPL", 1)
+        export_ledgers(self.path, [original])
+
+        with LedgerFile(self.path) as ledger_file:
+            loaded = ledger_file.load_account("carol", price_provider=PRICES, checkpoint_interval=3)
+        self.assertEqual(loaded._checkpoint_rows, list(range(0, len(loaded.get_transactions()) + 1, 3)))
+        for minute in range(17):
+            moment = start + datetime.timedelta(minutes=minute, seconds=30)
+            self.assertEqual(loaded.get_holdings_at(moment), original.get_holdings_at(moment))
+            self.assertAlmostEqual(loaded.get_profit_loss_at(moment), original.get_profit_loss_at(moment))
+        self.assert_same_account(loaded, original)
+
+    def test_column_pruning(self):
+        """
+        Test reading only some columns, and only one account's rows.
+        """
+        export_ledgers(self.path, [self.alice, self.bob], row_group_size=2)
+        with LedgerFile(self.path) as ledger_file:
+            everything = ledger_file.columns()
+            self.assertEqual(set(everything), {
+                'timestamps', 'types', 'symbols', 'quantities', 'prices',
+                'cash_changes', 'balances_after', 'successes', 'message_codes',
+            })
+            self.assertEqual(len(everything['timestamps']), 9)
+
+            bob = ledger_file.columns(["cash_changes", "symbols"], account_id="bob")
+            self.assertEqual(set(bob), {"cash_changes", "symbols"})
+            self.assertEqual(list(bob['cash_changes']), [500.00, -100.00])
+            self.assertEqual([ledger_file.symbols[code] for code in bob['symbols'][1:]], ["TSLA"])
+
+            alice = ledger_file.columns(["timestamps", "types"], account_id="alice")
+            self.assertEqual(list(alice['timestamps']), list(self.alice._transactions.columns()['timestamps']))
+            self.assertEqual(
+                [TRANSACTION_TYPES[code] for code in alice['types']],
+                [t['type'] for t in self.alice.get_transactions()],
+            )
+            self.assertTrue(np.all(np.diff(alice['timestamps']) >= 0))
+
+            with self.assertRaises(ValueError):
+                ledger_file.columns(["message"])
+            with self.assertRaises(KeyError):
+                ledger_file.columns(account_id="carol")
+
+    def test_other_cost_basis_method_rebuilds_lots(self):
+        """
+        Test loading under a different cost basis method replays the trades into new lots.
+        """
+        export_ledgers(self.path, [self.alice])
+        with LedgerFile(self.path) as ledger_file:
+            lifo = ledger_file.load_account("alice", price_provider=PRICES, cost_basis_method="lifo")
+        self.assertEqual(lifo.get_holdings(), self.alice.get_holdings())
+        self.assertEqual(lifo.get_lots("AAPL"), [(3, 100.00)])
+        self.assertAlmostEqual(lifo.get_cost_basis(), self.alice.get_cost_basis())
+
+    def test_rejects_bad_files_and_duplicate_ids(self):
+        """
+        Test duplicate account ids cannot be exported and foreign files cannot be opened.
+        """
+        with self.assertRaises(ValueError):
+            export_ledgers(self.path, [self.alice, Account("alice")])
+        with open(self.path, "wb") as other:
+            other.write(b"not a ledger file at all")
+        with self.assertRaises(ValueError):
+            LedgerFile(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
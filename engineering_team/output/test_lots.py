@@ -0,0 +1,88 @@
+import unittest
+
+from lots import AVERAGE, FIFO, LIFO, LotQueue
+
+
+class TestLotQueue(unittest.TestCase):
+    """
+    Unit tests for the LotQueue class in lots.py.
+    """
+
+    def buy_three_lots(self, method: str) -> LotQueue:
+        """
+        Open 10 @ 100, 10 @ 110 and 10 @ 120.
+        """
+        queue = LotQueue(method)
+        queue.buy(10, 100.00)
+        queue.buy(10, 110.00)
+        queue.buy(10, 120.00)
+        return queue
+
+    def test_fifo_closes_oldest_lots_first(self):
+        """
+        Test FIFO sales consume the oldest lots, splitting a lot when needed.
+        """
+        queue = self.buy_three_lots(FIFO)
+        self.assertAlmostEqual(queue.sell(15, 130.00), 15 * 130.00 - (10 * 100.00 + 5 * 110.00))
+        self.assertEqual(queue.lots(), [(5, 110.00), (10, 120.00)])
+        self.assertEqual(queue.quantity, 15)
+        self.assertAlmostEqual(queue.cost_basis, 1750.00)
+        self.assertAlmostEqual(queue.unrealized(130.00), 15 * 130.00 - 1750.00)
+
+    def test_lifo_closes_newest_lots_first(self):
+        """
+        Test LIFO sales consume the newest lots.
+        """
+        queue = self.buy_three_lots(LIFO)
+        self.assertAlmostEqual(queue.sell(15, 130.00), 15 * 130.00 - (10 * 120.00 + 5 * 110.00))
+        self.assertEqual(queue.lots(), [(10, 100.00), (5, 110.00)])
+        self.assertAlmostEqual(queue.realized, 200.00)
+
+    def test_average_cost_pools_lots(self):
+        """
+        Test the average method keeps one lot at the average cost of the open shares.
+        """
+        queue = self.buy_three_lots(AVERAGE)
+        self.assertEqual(queue.lots(), [(30, 110.00)])
+        self.assertAlmostEqual(queue.sell(10, 100.00), -100.00)
+        queue.buy(20, 140.00)
+        self.assertEqual(queue.lots(), [(40, 125.00)])
+        self.assertAlmostEqual(queue.average_cost(), 125.00)
+
+    def test_closing_everything_resets_basis(self):
+        """
+        Test selling the whole position leaves no lots or cost basis, but keeps realized P&L.
+        """
+        queue = self.buy_three_lots(FIFO)
+        queue.sell(30, 100.00)
+        self.assertEqual(queue.lots(), [])
+        self.assertEqual(queue.cost_basis, 0.0)
+        self.assertEqual(queue.average_cost(), 0.0)
+        self.assertAlmostEqual(queue.realized, -300.00)
+
+    def test_state_round_trip(self):
+        """
+        Test a queue rebuilt from to_state() matches the original.
+        """
+        queue = self.buy_three_lots(FIFO)
+        queue.sell(12, 90.00)
+        restored = LotQueue.from_state(queue.to_state(), FIFO)
+        self.assertEqual(restored.lots(), queue.lots())
+        self.assertEqual(restored.quantity, queue.quantity)
+        self.assertAlmostEqual(restored.cost_basis, queue.cost_basis)
+        self.assertAlmostEqual(restored.realized, queue.realized)
+
+    def test_rejects_invalid_use(self):
+        """
+        Test unknown methods and oversized sales raise ValueError.
+        """
+        with self.assertRaises(ValueError):
+            LotQueue("hifo")
+        queue = LotQueue()
+        queue.buy(5, 10.00)
+        with self.assertRaises(ValueError):
+            queue.sell(6, 10.00)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+import unittest
+from unittest import mock
+
+from accounts import Account
+from order_book import BUY, SELL, MatchingEngine
+from price_provider import StaticPriceProvider
+
+PRICES = StaticPriceProvider({"AAPL": 100.00})
+
+
+def funded(account_id: str, cash: float = 10000.00, shares: int = 0) -> Account:
+    """Returns an account with cash and, optionally, AAPL shares bought at 100."""
+    account = Account(account_id, price_provider=PRICES)
+    account.deposit(cash + shares * 100.00)
+    if shares:
+        account.buy_shares("AAPL", shares)
+    return account
+
+
+class TestMatchingEngine(unittest.TestCase):
+    """
+    Unit tests for the MatchingEngine and OrderBook classes in order_book.py.
+    """
+
+    def setUp(self):
+        """
+        Set up an engine, two sellers holding AAPL and a buyer with cash.
+        """
+        self.engine = MatchingEngine()
+        self.alice = funded("alice", shares=50)
+        self.bob = funded("bob", shares=50)
+        self.carol = funded("carol")
+
+    def test_price_time_priority_and_settlement(self):
+        """
+        Test the best price fills first, then the earliest order at a price, at resting prices.
+        """
+        late = self.engine.submit(self.bob, "AAPL", SELL, 10, limit_price=101.00)
+        early = self.engine.submit(self.alice, "aapl", SELL, 10, limit_price=101.00)
+        cheap = self.engine.submit(self.bob, "AAPL", SELL, 5, limit_price=100.50)
+        self.assertEqual(self.engine.depth("AAPL"), {'bids': [], 'asks': [(100.50, 5), (101.00, 20)]})
+
+        buy = self.engine.submit(self.carol, "AAPL", BUY, 12, limit_price=102.00)
+        self.assertEqual(self.engine.get_order(buy)['status'], "filled")
+        self.assertAlmostEqual(self.engine.get_order(buy)['average_price'], (5 * 100.50 + 7 * 101.00) / 12)
+        self.assertEqual(self.engine.get_order(cheap)['status'], "filled")
+        self.assertEqual(self.engine.get_order(late)['filled'], 7)  # Arrived first at 101
+        self.assertEqual(self.engine.get_order(early)['filled'], 0)
+        self.assertEqual(self.engine.last_price("AAPL"), 101.00)
+        self.assertEqual(self.engine.fills, 2)
+
+        self.assertEqual(self.carol.get_holdings(), {"AAPL": 12})
+        self.assertAlmostEqual(self.carol.get_balance(), 10000.00 - 5 * 100.50 - 7 * 101.00)
+        self.assertEqual(self.bob.get_holdings(), {"AAPL": 38})
+        self.assertEqual(self.carol.get_last_transaction()['price_per_share'], 101.00)
+        self.assertEqual(self.engine.depth("AAPL")['asks'], [(101.00, 13)])
+
+    def test_limit_rests_and_market_remainder_is_cancelled(self):
+        """
+        Test an unfilled limit order rests, and a market order never does.
+        """
+        bid = self.engine.submit(self.carol, "AAPL", BUY, 10, limit_price=99.00)
+        self.assertEqual(self.engine.get_order(bid)['status'], "open")
+        market = self.engine.submit(self.alice, "AAPL", SELL, 15)
+        order = self.engine.get_order(market)
+        self.assertEqual((order['status'], order['filled'], order['remaining']), ("cancelled", 10, 5))
+        self.assertEqual(self.engine.get_order(bid)['status'], "filled")
+        self.assertEqual(self.alice.get_holdings(), {"AAPL": 40})
+        self.assertEqual(self.engine.depth("AAPL"), {'bids': [], 'asks': []})
+
+    def test_cancel_and_replace(self):
+        """
+        Test cancelling, replacing down in place, and re-pricing to the back of the queue.
+        """
+        first = self.engine.submit(self.alice, "AAPL", SELL, 10, limit_price=101.00)
+        second = self.engine.submit(self.bob, "AAPL", SELL, 10, limit_price=101.00)
+        gone = self.engine.submit(self.bob, "AAPL", SELL, 10, limit_price=100.00)
+
+        self.assertTrue(self.engine.cancel(gone))
+        self.assertFalse(self.engine.cancel(gone))
+        self.assertTrue(self.engine.replace(first, quantity=4))  # Keeps its place
+        self.assertEqual(self.engine.depth("AAPL")['asks'], [(101.00, 14)])
+        self.engine.submit(self.carol, "AAPL", BUY, 4, limit_price=101.00)
+        self.assertEqual(self.engine.get_order(first)['status'], "filled")
+        self.assertEqual(self.engine.get_order(first)['quantity'], 4)
+
+        third = self.engine.submit(self.alice, "AAPL", SELL, 5, limit_price=101.00)
+        self.assertTrue(self.engine.replace(second, limit_price=101.00, quantity=12))  # Grows: to the back
+        self.engine.submit(self.carol, "AAPL", BUY, 5, limit_price=101.00)
+        self.assertEqual(self.engine.get_order(third)['status'], "filled")
+        self.assertEqual(self.engine.get_order(second)['remaining'], 12)
+
+        # Re-pricing across the spread matches immediately
+        bid = self.engine.submit(self.carol, "AAPL", BUY, 2, limit_price=99.00)
+        self.assertTrue(self.engine.replace(bid, limit_price=101.00))
+        self.assertEqual(self.engine.get_order(bid)['status'], "filled")
+        self.assertFalse(self.engine.replace(bid, quantity=1))
+
+        with self.assertRaises(KeyError):
+            self.engine.cancel(999)
+        with self.assertRaises(ValueError):
+            self.engine.replace(second, quantity=0)
+
+    def test_stop_orders(self):
+        """
+        Test stop orders wait for a trade at their stop price, then execute.
+        """
+        stop_loss = self.engine.submit(self.bob, "AAPL", SELL, 5, stop_price=99.00)
+        stop_buy = self.engine.submit(self.carol, "AAPL", BUY, 3, limit_price=101.00, stop_price=100.50)
+        self.assertEqual(self.engine.get_order(stop_loss)['status'], "pending")
+
+        self.engine.submit(self.carol, "AAPL", BUY, 10, limit_price=98.00)
+        self.engine.submit(self.alice, "AAPL", SELL, 1, limit_price=101.00)
+        self.engine.submit(self.carol, "AAPL", BUY, 1)  # Trades at 101: the buy stop triggers
+        self.assertEqual(self.engine.get_order(stop_buy)['status'], "open")  # Rests at its limit
+        self.assertTrue(self.engine.cancel(stop_buy))
+
+        self.engine.submit(self.alice, "AAPL", SELL, 1, limit_price=98.00)  # Trades at 98
+        order = self.engine.get_order(stop_loss)
+        self.assertEqual((order['status'], order['average_price']), ("filled", 98.00))
+        self.assertEqual(self.engine.depth("AAPL")['bids'], [(98.00, 4)])
+
+    def test_accounts_that_cannot_settle_are_rejected(self):
+        """
+        Test an order whose account lacks the shares or the cash is rejected at fill time.
+        """
+        poor = funded("poor", cash=50.00)
+        short = funded("short")
+        bid = self.engine.submit(poor, "AAPL", BUY, 10, limit_price=100.00)
+        ask = self.engine.submit(short, "AAPL", SELL, 10, limit_price=100.00)
+        self.assertEqual(self.engine.get_order(bid)['status'], "rejected")  # Resting buyer lacks cash
+        self.assertEqual(self.engine.get_order(ask)['status'], "open")
+        market = self.engine.submit(self.carol, "AAPL", BUY, 10)
+        self.assertEqual(self.engine.get_order(ask)['status'], "rejected")  # Resting seller lacks shares
+        self.assertEqual(self.engine.get_order(market)['status'], "cancelled")
+        self.assertEqual(short.get_reject_counts(), {"not_enough_shares": 1})
+        self.assertEqual(poor.get_reject_counts(), {"insufficient_funds": 1})
+        self.assertEqual(poor.get_rejects()[-1]['quantity'], 10)
+        self.assertEqual(self.carol.get_holdings(), {})
+
+        with self.assertRaises(ValueError):
+            self.engine.submit(self.carol, "AAPL", "hold", 1)
+        with self.assertRaises(ValueError):
+            self.engine.submit(self.carol, "AAPL", BUY, 0)
+        with self.assertRaises(ValueError):
+            self.engine.submit(self.carol, "AAPL", BUY, 1, limit_price=-1.0)
+
+    def test_failed_purchase_after_the_sale_is_rolled_back(self):
+        """
+        Test a fill whose buyer fails after the seller has sold returns the seller's shares.
+        """
+        ask = self.engine.submit(self.alice, "AAPL", SELL, 10, limit_price=100.00)
+        with mock.patch.object(self.carol, "buy_shares", return_value=False):
+            bid = self.engine.submit(self.carol, "AAPL", BUY, 10, limit_price=100.00)
+        self.assertEqual(self.engine.get_order(bid)['status'], "rejected")
+        self.assertEqual(self.engine.get_order(ask)['status'], "open")
+        self.assertEqual(self.engine.fills, 0)
+        self.assertIsNone(self.engine.last_price("AAPL"))
+        self.assertEqual(self.alice.get_holdings(), {"AAPL": 50})
+        self.assertAlmostEqual(self.alice.get_balance(), 10000.00)
+        self.assertAlmostEqual(self.carol.get_balance(), 10000.00)
+
+    def test_cancelled_orders_are_compacted_away(self):
+        """
+        Test many cancels leave the book small and matching correct.
+        """
+        trader = funded("trader", shares=1000)
+        orders = [self.engine.submit(trader, "AAPL", SELL, 1, limit_price=100.00 + i / 100) for i in range(300)]
+        for order_id in orders[:250]:
+            self.engine.cancel(order_id)
+        book = self.engine._books["AAPL"]
+        self.assertLess(len(book._heaps[SELL]), 150)
+        self.assertEqual(self.engine.depth("AAPL", levels=1)['asks'], [(102.50, 1)])
+        self.engine.submit(self.carol, "AAPL", BUY, 50)
+        self.assertEqual(self.carol.get_holdings(), {"AAPL": 50})
+        self.assertEqual(self.engine.depth("AAPL"), {'bids': [], 'asks': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import asyncio
+import unittest
+
+from account_book import AccountBook
+from order_gateway import OrderGateway
+from price_provider import StaticPriceProvider
+
+
+class TestOrderGateway(unittest.IsolatedAsyncioTestCase):
+    """
+    Unit tests for the OrderGateway class in order_gateway.py.
+    """
+
+    def setUp(self):
+        """
+        Set up a book with two funded accounts and a gateway in front of it.
+        """
+        self.book = AccountBook(price_provider=StaticPriceProvider({"AAPL": 100.00}))
+        for account_id in ("alice", "bob"):
+            self.book.open_account(account_id).deposit(1000.00)
+        self.gateway = OrderGateway(self.book, queue_size=64, max_batch=16)
+
+    async def asyncTearDown(self):
+        await self.gateway.close()
+
+    async def test_concurrent_orders_are_coalesced(self):
+        """
+        Test concurrent clients' orders are applied in fewer, larger batches.
+        """
+        results = await asyncio.gather(*[
+            self.gateway.submit("alice", {'type': 'deposit', 'amount': 10.00}) for _ in range(20)
+        ], self.gateway.submit("bob", {'type': 'buy', 'symbol': 'AAPL', 'quantity': 3}))
+
+        self.assertEqual(results, [True] * 21)
+        self.assertAlmostEqual(self.book.get_account("alice").get_balance(), 1200.00)
+        self.assertEqual(self.book.get_account("bob").get_holdings(), {"AAPL": 3})
+        stats = self.gateway.stats()
+        self.assertEqual(stats['orders'], 21)
+        self.assertLess(stats['batches'], 21)
+        self.assertEqual(stats['queued'], 0)
+
+    async def test_failing_order_does_not_fail_its_batch(self):
+        """
+        Test a batch containing a failing order falls back to independent execution.
+        """
+        results = await asyncio.gather(
+            self.gateway.submit("alice", {'type': 'buy', 'symbol': 'AAPL', 'quantity': 5}),
+            self.gateway.submit("alice", {'type': 'withdraw', 'amount': 5000.00}),
+            self.gateway.submit("alice", {'type': 'sell', 'symbol': 'AAPL', 'quantity': 2}),
+        )
+
+        self.assertEqual(results, [True, False, True])
+        self.assertEqual(self.gateway.stats()['fallbacks'], 1)
+        account = self.book.get_account("alice")
+        self.assertEqual(account.get_holdings(), {"AAPL": 3})
+        self.assertAlmostEqual(account.get_balance(), 700.00)
+        # The rejected batch itself leaves no trace; only the one failed order is logged
+        self.assertEqual(len(account.get_rejects()), 1)
+        self.assertIn("Insufficient funds", account.get_last_reject()['message'])
+
+    async def test_full_queue_applies_backpressure(self):
+        """
+        Test try_submit refuses orders beyond the queue bound until the writer catches up.
+        """
+        gateway = OrderGateway(self.book, queue_size=2)
+        first = gateway.try_submit("bob", {'type': 'deposit', 'amount': 1.00})
+        gateway.try_submit("bob", {'type': 'deposit', 'amount': 1.00})
+        with self.assertRaises(asyncio.QueueFull):
+            gateway.try_submit("bob", {'type': 'deposit', 'amount': 1.00})
+
+        # submit() waits for room instead
+        waiting = asyncio.ensure_future(gateway.submit("bob", {'type': 'deposit', 'amount': 1.00}))
+        self.assertTrue(await first)
+        self.assertTrue(await waiting)
+        await gateway.close()
+        self.assertAlmostEqual(self.book.get_account("bob").get_balance(), 1003.00)
+
+    async def test_rejects_bad_requests(self):
+        """
+        Test unknown accounts and order types are rejected at submission.
+        """
+        with self.assertRaises(KeyError):
+            await self.gateway.submit("carol", {'type': 'deposit', 'amount': 1.00})
+        with self.assertRaises(ValueError):
+            await self.gateway.submit("alice", {'type': 'short', 'symbol': 'AAPL', 'quantity': 1})
+
+    async def test_malformed_order_fails_its_futures(self):
+        """
+        Test an order missing or mistyping a field is rejected at submission.
+        """
+        for order in ({'type': 'deposit'}, {'type': 'withdraw', 'amount': "10"},
+                      {'type': 'buy', 'quantity': 1}, {'type': 'sell', 'symbol': 'AAPL', 'quantity': None}):
+            with self.assertRaises(ValueError):
+                await self.gateway.submit("alice", order)
+        self.assertTrue(await self.gateway.submit("alice", {'type': 'deposit', 'amount': 1.00}))
+
+    async def test_malformed_order_fails_only_itself_in_a_batch(self):
+        """
+        Test an order that raises while applied fails only its own future; the rest of its batch applies.
+        """
+        loop = asyncio.get_running_loop()
+        queue = self.gateway._queue_for("bob")
+        orders = [
+            {'type': 'deposit', 'amount': 100.00},
+            {'type': 'withdraw', 'amount': 5000.00},  # Insufficient funds
+            {'type': 'deposit'},  # Slipped past the submission check
+            {'type': 'deposit', 'amount': 1.00},
+        ]
+        futures = [loop.create_future() for _ in orders]
+        for order, future in zip(orders, futures):
+            queue.put_nowait((order, future))
+        results = await asyncio.gather(*futures, return_exceptions=True)
+
+        self.assertEqual(results[:2], [True, False])
+        self.assertIsInstance(results[2], KeyError)
+        self.assertIs(results[3], True)
+        self.assertAlmostEqual(self.book.get_account("bob").get_balance(), 1101.00)
+        self.assertEqual(self.gateway.stats()['orders'], 3)
+        self.assertEqual(self.gateway.stats()['fallbacks'], 1)
+
+    async def test_closed_account_fails_instead_of_hanging(self):
+        """
+        Test orders for an account closed under a running gateway raise KeyError instead of hanging.
+        """
+        self.assertTrue(await self.gateway.submit("alice", {'type': 'deposit', 'amount': 1.00}))
+        pending = [self.gateway.try_submit("alice", {'type': 'deposit', 'amount': 1.00}) for _ in range(2)]
+        self.assertTrue(self.book.close_account("alice"))
+
+        results = await asyncio.wait_for(asyncio.gather(*pending, return_exceptions=True), timeout=5)
+        self.assertTrue(all(isinstance(result, KeyError) for result in results))
+        for _ in range(2):
+            with self.assertRaises(KeyError):
+                await asyncio.wait_for(self.gateway.submit("alice", {'type': 'deposit', 'amount': 1.00}), timeout=5)
+        self.assertTrue(await self.gateway.submit("bob", {'type': 'deposit', 'amount': 1.00}))
+        await asyncio.wait_for(self.gateway.close(), timeout=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from accounts import Account
+from price_provider import (
+    CachingPriceProvider,
+    CallablePriceProvider,
+    FilePriceProvider,
+    PriceProvider,
+    StaticPriceProvider,
+)
+
+
+class FakeClock:
+    """Manually advanced time source for TTL tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPriceProviders(unittest.TestCase):
+    """
+    Unit tests for the price providers in price_provider.py.
+    """
+
+    def test_static_provider(self):
+        """
+        Test fixed-table lookups are case-insensitive and keyed by the requested symbol.
+        """
+        provider = StaticPriceProvider({"AAPL": 170.00})
+        self.assertEqual(provider.get_prices(["aapl", "XYZ"]), {"aapl": 170.00, "XYZ": 0.0})
+        self.assertEqual(provider.get_price("AAPL"), 170.00)
+
+    def test_callable_provider(self):
+        """
+        Test a per-symbol function is called once per requested symbol.
+        """
+        fetch = MagicMock(side_effect=lambda symbol: 10.00)
+        provider = CallablePriceProvider(fetch)
+        self.assertEqual(provider.get_prices(["A", "B"]), {"A": 10.00, "B": 10.00})
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_file_provider_reloads_on_change(self):
+        """
+        Test the CSV feed is read lazily and re-read only when the file changes.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "prices.csv")
+            with open(path, "w") as feed:
+                feed.write("symbol,price\nAAPL,170.5\nTSLA,250\n")
+            provider = FilePriceProvider(path)
+            self.assertEqual(provider.get_prices(["aapl", "TSLA", "NVDA"]), {"aapl": 170.5, "TSLA": 250.0, "NVDA": 0.0})
+
+            with open(path, "w") as feed:
+                feed.write("AAPL,180\n")
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            self.assertEqual(provider.get_price("AAPL"), 180.0)
+
+    def test_caching_provider_ttl_and_counters(self):
+        """
+        Test cached prices are served until they expire, with misses fetched in bulk.
+        """
+        source = MagicMock(spec=PriceProvider)
+        source.get_prices.side_effect = lambda symbols: {symbol: 100.00 for symbol in symbols}
+        clock = FakeClock()
+        cache = CachingPriceProvider(source, ttl_seconds=5.0, clock=clock)
+
+        self.assertEqual(cache.get_prices(["AAPL", "TSLA"]), {"AAPL": 100.00, "TSLA": 100.00})
+        source.get_prices.assert_called_once_with(["AAPL", "TSLA"])
+        self.assertEqual(cache.get_prices(["aapl", "TSLA"]), {"aapl": 100.00, "TSLA": 100.00})
+        self.assertEqual(source.get_prices.call_count, 1)
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 2, 'entries': 2})
+
+        clock.now = 5.0
+        cache.get_prices(["AAPL", "MSFT"])
+        source.get_prices.assert_called_with(["AAPL", "MSFT"])
+        self.assertEqual(cache.stats()['misses'], 4)
+
+        cache.invalidate(["TSLA"])
+        self.assertEqual(cache.stats()['entries'], 2)
+
+    def test_caching_provider_evicts_least_recently_used(self):
+        """
+        Test the cache never holds more than max_entries symbols.
+        """
+        source = StaticPriceProvider({"A": 1.0, "B": 2.0, "C": 3.0})
+        cache = CachingPriceProvider(source, ttl_seconds=60.0, max_entries=2)
+        cache.get_prices(["A", "B"])
+        cache.get_price("A")  # A is now the most recently used
+        cache.get_price("C")  # Evicts B
+        self.assertEqual(cache.stats()['entries'], 2)
+        hits = cache.stats()['hits']
+        cache.get_prices(["A", "C"])
+        self.assertEqual(cache.stats()['hits'], hits + 2)
+        cache.get_price("B")
+        self.assertEqual(cache.stats()['misses'], 4)
+
+    def test_account_uses_provider(self):
+        """
+        Test Account trades and re-prices through its provider with bulk lookups.
+        """
+        provider = StaticPriceProvider({"AAPL": 100.00, "TSLA": 50.00})
+        account = Account("provider_account", price_provider=provider)
+        account.deposit(1000.00)
+        self.assertTrue(account.buy_shares("AAPL", 5))
+        self.assertTrue(account.execute_batch([{'type': 'buy', 'symbol': 'TSLA', 'quantity': 2}]))
+        self.assertAlmostEqual(account.get_portfolio_value(), 1000.00)
+
+        account.price_provider = StaticPriceProvider({"AAPL": 110.00, "TSLA": 50.00})
+        account.reprice()
+        self.assertAlmostEqual(account.get_profit_loss(), 50.00)
+
+
+if __name__ == '__main__':
+    unittest.main()
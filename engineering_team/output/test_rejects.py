@@ -0,0 +1,61 @@
+import unittest
+
+from accounts import Account
+from ledger import MSG_INSUFFICIENT_FUNDS, MSG_NOT_ENOUGH_SHARES
+from price_provider import StaticPriceProvider
+from rejects import RejectLog
+
+
+class TestRejectLog(unittest.TestCase):
+    """
+    Unit tests for the RejectLog class in rejects.py.
+    """
+
+    def test_keeps_only_the_most_recent_rejects(self):
+        """
+        Test the ring buffer evicts the oldest rejects but keeps counting them.
+        """
+        log = RejectLog(capacity=3)
+        for amount in range(1, 6):
+            log.record(amount * 1000, "withdraw", -float(amount), None, None, None, 0.0, MSG_INSUFFICIENT_FUNDS)
+        log.record(6000, "sell", 0.0, "AAPL", 2, None, 0.0, MSG_NOT_ENOUGH_SHARES, 1)
+
+        self.assertEqual(len(log), 3)
+        self.assertEqual((log.total, log.dropped), (6, 3))
+        self.assertEqual(log.counts(), {"insufficient_funds": 5, "not_enough_shares": 1})
+        self.assertEqual([row['amount_effect_on_cash'] for row in log.rows()], [-4.0, -5.0, 0.0])
+        self.assertEqual([row['amount_effect_on_cash'] for row in log.rows(limit=2)], [-5.0, 0.0])
+        self.assertEqual(log.last()['message'], "Not enough AAPL shares to sell. Have: 1, Requested: 2")
+        self.assertFalse(log.last()['success'])
+
+    def test_empty_and_invalid_logs(self):
+        """
+        Test an empty log and a negative capacity.
+        """
+        log = RejectLog()
+        self.assertIsNone(log.last())
+        self.assertEqual((log.rows(), log.counts()), ([], {}))
+        with self.assertRaises(ValueError):
+            RejectLog(capacity=-1)
+
+    def test_reject_storm_leaves_the_ledger_untouched(self):
+        """
+        Test a client sending invalid orders in a loop cannot grow the account's history.
+        """
+        account = Account("storm", price_provider=StaticPriceProvider({"AAPL": 100.00}), reject_log_size=10)
+        account.deposit(500.00)
+        for _ in range(1000):
+            account.withdraw(1000.00)
+            account.sell_shares("AAPL", 1)
+            account.buy_shares("AAPL", 0)
+
+        self.assertEqual(len(account.get_transactions()), 1)
+        self.assertEqual(len(account.get_rejects()), 10)
+        self.assertEqual(account.get_reject_counts(), {
+            "insufficient_funds": 1000, "not_enough_shares": 1000, "quantity_not_positive": 1000,
+        })
+        self.assertEqual(account.get_last_reject()['message'], "Quantity must be positive.")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import statistics
+import unittest
+
+import numpy as np
+
+from accounts import Account
+from price_provider import StaticPriceProvider
+from risk import RiskModel
+
+SYMBOLS = ["AAPL", "TSLA", "MSFT"]
+PRICES = [
+    [100.00, 50.00, 300.00],
+    [102.00, 45.00, 303.00],
+    [101.00, 48.00, 306.00],
+    [ 97.00, 52.00, 300.00],
+    [ 99.00, 40.00, 309.00],
+    [104.00, 44.00, 312.00],
+]
+
+
+class TestRiskModel(unittest.TestCase):
+    """
+    Unit tests for the RiskModel class in risk.py.
+    """
+
+    def setUp(self):
+        """
+        Set up a model over six periods and an account holding two of the symbols.
+        """
+        self.model = RiskModel(SYMBOLS, PRICES)
+        self.account = Account("risky", price_provider=StaticPriceProvider({"AAPL": 100.00, "TSLA": 50.00}))
+        self.account.deposit(5000.00)
+        self.account.buy_shares("aapl", 10)
+        self.account.buy_shares("TSLA", 20)
+
+    def test_account_figures_match_a_direct_computation(self):
+        """
+        Test single-account figures against a plain Python computation over the history.
+        """
+        values = [3000.00 + 10 * row[0] + 20 * row[1] for row in PRICES]
+        pnl = [after - before for before, after in zip(values, values[1:])]
+        returns = [change / before for change, before in zip(pnl, values)]
+        peak, drawdown = values[0], 0.0
+        for value in values:
+            peak = max(peak, value)
+            drawdown = max(drawdown, 1.0 - value / peak)
+
+        risk = self.model.account_risk(self.account, confidence=0.9)
+        self.assertAlmostEqual(risk['value'], values[-1])
+        self.assertAlmostEqual(risk['volatility'], statistics.stdev(returns) * 252 ** 0.5)
+        z = statistics.NormalDist().inv_cdf(0.9)
+        self.assertAlmostEqual(risk['var_parametric'], z * statistics.stdev(pnl) - statistics.mean(pnl))
+        self.assertAlmostEqual(risk['var_historical'], -float(np.quantile(pnl, 0.1)))
+        self.assertAlmostEqual(risk['max_drawdown'], drawdown)
+        self.assertEqual(set(risk['contribution']), {"AAPL", "TSLA"})
+        self.assertAlmostEqual(sum(risk['contribution'].values()), 1.0)
+
+    def test_batch_matches_single_accounts(self):
+        """
+        Test one batch call gives the same figures as analyzing each account alone.
+        """
+        provider = StaticPriceProvider({"MSFT": 300.00})
+        single = Account("single", price_provider=provider)
+        single.deposit(3000.00)
+        single.buy_shares("MSFT", 10)
+        cash_only = Account("cash")
+        cash_only.deposit(100.00)
+        accounts = [self.account, single, cash_only]
+
+        figures = self.model.batch(*self.model.holdings_matrix(accounts))
+        for row, account in enumerate(accounts):
+            risk = self.model.account_risk(account)
+            for name in ('value', 'volatility', 'var_parametric', 'var_historical', 'max_drawdown'):
+                self.assertAlmostEqual(figures[name][row], risk[name])
+        self.assertEqual(list(figures['contribution'][1]), [0.0, 0.0, 1.0])  # One symbol carries all the risk
+        self.assertEqual(figures['volatility'][2], 0.0)  # Cash has no risk
+        self.assertEqual(figures['max_drawdown'][2], 0.0)
+
+    def test_rejects_bad_inputs(self):
+        """
+        Test mismatched shapes, bad prices, unknown symbols and bad confidence levels.
+        """
+        with self.assertRaises(ValueError):
+            RiskModel(SYMBOLS, [row[:2] for row in PRICES])
+        with self.assertRaises(ValueError):
+            RiskModel(SYMBOLS, PRICES[:2])
+        with self.assertRaises(ValueError):
+            RiskModel(SYMBOLS, PRICES + [[0.0, 1.0, 1.0]])
+        with self.assertRaises(ValueError):
+            self.model.batch(np.zeros((2, 2)))
+        with self.assertRaises(ValueError):
+            self.model.batch(np.zeros((2, 3)), confidence=1.0)
+        tsla_only = RiskModel(["tsla"], [[1.0], [2.0], [1.5]])
+        self.assertAlmostEqual(tsla_only.batch([[2.0]])['max_drawdown'][0], 0.25)
+        with self.assertRaises(ValueError):
+            tsla_only.account_risk(self.account)  # AAPL has no history
+
+
+if __name__ == '__main__':
+    unittest.main()
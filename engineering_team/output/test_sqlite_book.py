@@ -0,0 +1,165 @@
+import datetime
+import os
+import tempfile
+import threading
+import unittest
+
+from price_provider import StaticPriceProvider
+from sqlite_book import SQLiteAccountBook
+
+PRICES = StaticPriceProvider({"AAPL": 100.00, "TSLA": 50.00})
+
+
+class TestSQLiteAccountBook(unittest.TestCase):
+    """
+    Unit tests for the SQLiteAccountBook class in sqlite_book.py.
+    """
+
+    def setUp(self):
+        """
+        Give each test its own database file.
+        """
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._directory.name, "book.db")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def open(self, **kwargs) -> SQLiteAccountBook:
+        return SQLiteAccountBook(self.path, price_provider=PRICES, **kwargs)
+
+    def trade(self, book: SQLiteAccountBook, account_id: str) -> None:
+        book.open_account(account_id)
+        book.deposit(account_id, 10000.00)
+        book.buy_shares(account_id, "AAPL", 20)
+        book.withdraw(account_id, 50000.00)  # Fails
+        book.sell_shares(account_id, "AAPL", 5)
+        book.execute_batch(account_id, [
+            {'type': 'withdraw', 'amount': 100.00},
+            {'type': 'buy', 'symbol': 'TSLA', 'quantity': 2},
+        ])
+
+    def test_cold_accounts_are_evicted_and_reloaded(self):
+        """
+        Test only cache_size accounts stay in memory, and evicted ones come back intact.
+        """
+        book = self.open(cache_size=2)
+        for account_id in ("alice", "bob", "carol"):
+            self.trade(book, account_id)
+        self.assertEqual(book.cached_ids(), ["bob", "carol"])
+        self.assertEqual(len(book), 3)
+        self.assertIn("alice", book)
+        self.assertEqual(book.account_ids(), ["alice", "bob", "carol"])
+
+        alice = book.get_account("alice")  # Loads alice, evicting bob
+        self.assertEqual(book.cached_ids(), ["carol", "alice"])
+        self.assertAlmostEqual(alice.get_balance(), 10000.00 - 20 * 100.00 + 5 * 100.00 - 100.00 - 2 * 50.00)
+        self.assertEqual(alice.get_holdings(), {"AAPL": 15, "TSLA": 2})
+        self.assertEqual(len(alice.get_transactions()), 5)  # The failed withdrawal is only a reject
+        self.assertAlmostEqual(alice.get_initial_deposit_total(), 10000.00)
+        self.assertEqual(book.get_account("bob").get_holdings(), {"AAPL": 15, "TSLA": 2})
+
+        with self.assertRaises(KeyError):
+            book.get_account("nobody")
+        with self.assertRaises(ValueError):
+            self.open(cache_size=0)
+        book.close()
+
+    def test_reopened_book_matches_the_original(self):
+        """
+        Test every account, hot or evicted, survives closing and reopening the file.
+        """
+        book = self.open(cache_size=3, commit_every=5)
+        for i in range(10):
+            self.trade(book, f"trader{i}")
+        with book.locked("trader0") as account:
+            account.sell_shares("TSLA", 1)
+        expected = {account_id: book.get_account(account_id).get_transactions() for account_id in book.account_ids()}
+        book.close()
+
+        reopened = self.open(cache_size=3)
+        self.assertEqual(reopened.cached_ids(), [])
+        self.assertEqual(len(reopened), 10)
+        for account_id, transactions in expected.items():
+            self.assertEqual(reopened.get_account(account_id).get_transactions(), transactions)
+        self.assertEqual(reopened.get_account("trader0").get_holdings(), {"AAPL": 15, "TSLA": 1})
+        # Replays rows written after a reload too, not only up to the stored state
+        reopened.buy_shares("trader0", "TSLA", 4)
+        reopened.close()
+        self.assertEqual(self.open().get_account("trader0").get_holdings(), {"AAPL": 15, "TSLA": 5})
+
+    def test_close_account_stores_and_drops_it(self):
+        """
+        Test closing an account frees it from memory but keeps it in the database.
+        """
+        book = self.open()
+        self.trade(book, "alice")
+        book.open_account("bob")
+        expected = book.get_account("alice").get_transactions()
+        self.assertTrue(book.close_account("alice"))
+        self.assertEqual(book.cached_ids(), ["bob"])
+        self.assertIn("alice", book)
+        self.assertFalse(book.close_account("alice"))
+        with book.locked("bob"):
+            self.assertFalse(book.close_account("bob"))  # Pinned by this thread
+        self.assertEqual(book.get_account("alice").get_transactions(), expected)
+        self.assertEqual(book.get_account("alice").get_holdings(), {"AAPL": 15, "TSLA": 2})
+        book.close()
+
+    def test_reloaded_account_keeps_its_checkpoints(self):
+        """
+        Test an account paged back in from SQLite has a checkpoint every interval.
+        """
+        book = self.open(cache_size=1)
+        self.trade(book, "alice")
+        book.execute_batch("alice", [{'type': 'deposit', 'amount': 1.00}] * 2500)
+        before = book.get_account("alice").get_holdings_at(datetime.datetime.now())
+        book.open_account("bob")  # Evicts alice, storing her state
+        alice = book.get_account("alice")
+        self.assertEqual(alice._checkpoint_rows, [0, 1000, 2000])
+        self.assertEqual(alice._checkpoints[1][1], {"AAPL": 15, "TSLA": 2})
+        self.assertEqual(alice.get_holdings_at(datetime.datetime.now()), before)
+        book.close()
+
+    def test_pinned_accounts_are_not_evicted(self):
+        """
+        Test an account inside locked() stays cached while other accounts are loaded.
+        """
+        book = self.open(cache_size=1)
+        book.open_account("alice")
+        book.open_account("bob")
+        with book.locked("alice") as alice:
+            alice.deposit(100.00)
+            for _ in range(3):
+                book.deposit("bob", 1.00)  # Would evict alice if she were not pinned
+            alice.deposit(50.00)
+        self.assertAlmostEqual(book.get_account("alice").get_balance(), 150.00)
+        book.close()
+        self.assertAlmostEqual(self.open().get_account("alice").get_balance(), 150.00)
+
+    def test_concurrent_trading_with_a_small_cache(self):
+        """
+        Test threads trading across more accounts than the cache holds keep every row.
+        """
+        book = self.open(cache_size=4, commit_every=7, stripes=4)
+        ids = [f"t{i}" for i in range(12)]
+        for account_id in ids:
+            book.open_account(account_id)
+
+        def work(offset: int) -> None:
+            for i in range(120):
+                book.deposit(ids[(i + offset) % len(ids)], 1.00)
+
+        threads = [threading.Thread(target=work, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertAlmostEqual(sum(book.get_account(account_id).get_balance() for account_id in ids), 480.00)
+        book.close()
+        reopened = self.open()
+        self.assertEqual(sum(len(reopened.get_account(account_id).get_transactions()) for account_id in ids), 480)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from accounts import Account
+from price_provider import StaticPriceProvider
+from transaction_table import COLUMNS, TransactionTable, format_row
+
+
+class TestTransactionTable(unittest.TestCase):
+    """
+    Unit tests for the TransactionTable class in transaction_table.py.
+    """
+
+    def setUp(self):
+        """
+        Set up an account with a few transactions and a small-paged table.
+        """
+        self.account = Account("acct", price_provider=StaticPriceProvider({"AAPL": 100.00}))
+        self.account.deposit(1000.00)
+        self.account.buy_shares("AAPL", 3)
+        self.table = TransactionTable(self.account, page_size=2)
+
+    def test_rows_are_formatted_for_display(self):
+        """
+        Test a rendered row has every column, with blanks for missing values.
+        """
+        rows, page, pages = self.table.page()
+        self.assertEqual((page, pages), (1, 1))
+        self.assertEqual(len(rows[0]), len(COLUMNS))
+        self.assertEqual(rows[0][1:8], ["buy", "AAPL", 3, "100.00", "-300.00", "700.00", "Yes"])
+        self.assertEqual(rows[1][1:8], ["deposit", "", "", "", "1000.00", "1000.00", "Yes"])
+        self.assertEqual(rows[1], format_row(self.account.get_transactions()[0]))
+
+    def test_only_new_rows_are_rendered(self):
+        """
+        Test a refresh formats only rows appended since the last one, and pages shift.
+        """
+        self.assertEqual(self.table.refresh(), 2)
+        self.assertEqual(self.table.refresh(), 0)
+        first = self.table._rows[0]
+        for _ in range(3):
+            self.account.deposit(1.00)
+        self.assertEqual(self.table.refresh(), 3)
+        self.assertIs(self.table._rows[0], first)  # Kept, not re-rendered
+
+        rows, page, pages = self.table.page(3)
+        self.assertEqual((page, pages), (3, 3))
+        self.assertEqual([row[1] for row in rows], ["deposit"])  # The oldest row
+        self.assertEqual(self.table.page(99)[1:], (3, 3))
+        self.assertEqual(self.table.page(0)[1], 1)
+        self.assertEqual(self.table.page(1)[0], self.table.page(1.0)[0])
+
+    def test_empty_history(self):
+        """
+        Test an account with no transactions shows one empty page.
+        """
+        table = TransactionTable(Account("empty"))
+        self.assertEqual(table.page(), ([], 1, 1))
+        with self.assertRaises(ValueError):
+            TransactionTable(self.account, page_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import math
+import unittest
+
+from accounts import Account
+from ledger import ns_to_datetime
+from price_provider import CallablePriceProvider, StaticPriceProvider
+from valuation import PortfolioValuator, equity_curve
+
+PRICES = {"AAPL": 100.00, "TSLA": 50.00, "MSFT": 300.00}
+
+
+class TestPortfolioValuator(unittest.TestCase):
+    """
+    Unit tests for the PortfolioValuator class in valuation.py.
+    """
+
+    def setUp(self):
+        """
+        Set up three accounts with different positions.
+        """
+        provider = StaticPriceProvider(PRICES)
+        self.accounts = [Account(f"user{i}", price_provider=provider) for i in range(3)]
+        self.accounts[0].deposit(10000.00)
+        self.accounts[0].buy_shares("AAPL", 10)
+        self.accounts[0].buy_shares("tsla", 20)
+        self.accounts[1].deposit(500.00)
+        self.accounts[2].deposit(5000.00)
+        self.accounts[2].buy_shares("MSFT", 10)
+        self.valuator = PortfolioValuator.from_accounts(self.accounts)
+
+    def test_values_match_accounts(self):
+        """
+        Test bulk values and profit/loss agree with each account's own figures.
+        """
+        self.valuator.set_prices(PRICES)
+        self.assertEqual(self.valuator.account_ids(), ["user0", "user1", "user2"])
+        for i, account in enumerate(self.accounts):
+            self.assertAlmostEqual(self.valuator.values()[i], account.get_portfolio_value())
+            self.assertAlmostEqual(self.valuator.profit_loss()[i], account.get_profit_loss())
+            self.assertAlmostEqual(self.valuator.value_of(account.account_id), account.get_portfolio_value())
+
+    def test_price_tick_revalues_every_account(self):
+        """
+        Test a price update changes the value of every account holding that symbol.
+        """
+        self.valuator.set_prices(PRICES)
+        self.valuator.set_prices({"aapl": 110.00})
+        for account in self.accounts:
+            account.reprice({"AAPL": 110.00})
+        expected = [account.get_portfolio_value() for account in self.accounts]
+        self.assertEqual(list(self.valuator.values()), expected)
+        self.assertAlmostEqual(self.valuator.profit_loss()[0], 100.00)
+
+        values, profit_loss = self.valuator.revalue({"TSLA": 40.00, "MSFT": 310.00})
+        self.assertEqual(list(values), [9900.00, 500.00, 5100.00])
+        self.assertEqual(list(profit_loss), [-100.00, 0.00, 100.00])
+
+    def test_sync_closes_and_reopens_positions(self):
+        """
+        Test re-syncing an account replaces its holdings and reuses freed storage.
+        """
+        self.valuator.set_prices(PRICES)
+        self.accounts[0].sell_shares("AAPL", 10)
+        self.valuator.sync(self.accounts[0])
+        self.assertAlmostEqual(self.valuator.value_of("user0"), self.accounts[0].get_portfolio_value())
+
+        self.valuator.update_account("user3", 100.00, 100.00, {"MSFT": 2})
+        self.assertEqual(len(self.valuator), 4)
+        self.assertAlmostEqual(self.valuator.values()[3], 700.00)
+        self.assertAlmostEqual(self.valuator.profit_loss()[3], 600.00)
+
+    def test_unpriced_symbols_are_worth_zero(self):
+        """
+        Test positions in symbols without a price contribute nothing until priced.
+        """
+        self.valuator.update_account("user9", 0.0, 0.0, {"NEW": 5})
+        self.assertEqual(self.valuator.value_of("user9"), 0.0)
+        self.valuator.set_prices({"NEW": 2.00})
+        self.assertAlmostEqual(self.valuator.value_of("user9"), 10.00)
+        with self.assertRaises(KeyError):
+            self.valuator.value_of("nobody")
+
+    def test_grows_past_initial_capacity(self):
+        """
+        Test storage grows to fit many accounts and positions.
+        """
+        valuator = PortfolioValuator(capacity=1)
+        for i in range(100):
+            valuator.update_account(f"a{i}", float(i), 0.0, {"AAPL": 1, "TSLA": i})
+        valuator.set_prices(PRICES)
+        values = valuator.values()
+        self.assertEqual(len(values), 100)
+        self.assertAlmostEqual(values[99], 99.0 + 100.00 + 99 * 50.00)
+
+
+
+class TestEquityCurve(unittest.TestCase):
+    """
+    Unit tests for the equity_curve function in valuation.py.
+    """
+
+    def setUp(self):
+        """
+        Set up an account that trades at known times (in seconds) and prices.
+        """
+        self.now = 0
+        self.quotes = {"AAPL": 100.00, "TSLA": 50.00}
+        self.account = Account(
+            "curve",
+            price_provider=CallablePriceProvider(lambda symbol: self.quotes.get(symbol.upper(), 0.0)),
+            clock=lambda: self.now * 1_000_000_000,
+        )
+        self.at(10, lambda: self.account.deposit(10000.00))
+        self.at(20, lambda: self.account.buy_shares("AAPL", 10))  # 10 @ 100
+        self.quotes["AAPL"] = 120.00
+        self.at(30, lambda: self.account.buy_shares("tsla", 20))  # 20 @ 50
+        self.at(40, lambda: self.account.sell_shares("aapl", 10))  # 10 @ 120
+        self.at(50, lambda: self.account.withdraw(99999.00))  # Rejected
+        self.at(50, lambda: self.account.deposit(500.00))
+
+    def at(self, seconds: int, action) -> None:
+        self.now = seconds
+        action()
+
+    def test_matches_point_in_time_valuation(self):
+        """
+        Test every sample equals get_profit_loss_at at the same time and prices.
+        """
+        seconds = [0, 10, 25, 30, 45, 60]
+        aapl = [math.nan, math.nan, 110.00, math.nan, 130.00, 130.00]
+        curve = equity_curve(self.account, [t * 1_000_000_000 for t in seconds], {"aapl": aapl})
+
+        self.assertEqual(list(curve['cash']), [0.0, 10000.00, 9000.00, 8000.00, 9200.00, 9700.00])
+        self.assertEqual(list(curve['deposits']), [0.0, 10000.00, 10000.00, 10000.00, 10000.00, 10500.00])
+        self.assertEqual(list(curve['holdings_value']), [0.0, 0.0, 1100.00, 2000.00, 1000.00, 1000.00])
+        self.assertEqual(list(curve['profit_loss']), [0.0, 0.0, 100.00, 0.0, 200.00, 200.00])
+        for i, t in enumerate(seconds):
+            quoted = {} if math.isnan(aapl[i]) else {"AAPL": aapl[i]}
+            expected = self.account.get_profit_loss_at(ns_to_datetime(t * 1_000_000_000), quoted)
+            self.assertAlmostEqual(curve['profit_loss'][i], expected)
+        self.assertAlmostEqual(curve['portfolio_value'][-1], self.account.get_portfolio_value())
+
+    def test_empty_ledger_and_bad_series(self):
+        """
+        Test an account with no history is flat, and mismatched price series are rejected.
+        """
+        curve = equity_curve(Account("empty"), [1, 2, 3])
+        self.assertEqual(list(curve['portfolio_value']), [0.0, 0.0, 0.0])
+        with self.assertRaises(ValueError):
+            equity_curve(self.account, [1, 2, 3], {"AAPL": [1.0, 2.0]})
+
+
+
+if __name__ == '__main__':
+    unittest.main()
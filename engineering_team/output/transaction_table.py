@@ -0,0 +1,111 @@
+"""
+Server-side render cache for the transaction history table.
+
+Formatting every ledger row into display strings on every click makes the UI
+slower as the history grows. TransactionTable keeps the rows it has already
+rendered and, on each refresh, formats only the rows appended since the last
+one. The ledger is append-only, so rendered rows never go stale. Pages are
+slices of the cache, so a click costs O(new rows + page size) whatever the
+length of the history.
+"""
+
+import threading
+from typing import Any, Dict, List, Tuple
+
+from accounts import Account
+
+COLUMNS = [
+    "Timestamp", "Type", "Symbol", "Quantity", "Price/Share",
+    "Cash Effect", "Balance After", "Success", "Message"
+]
+
+
+def format_row(transaction: Dict[str, Any]) -> List[Any]:
+    """
+    Formats one transaction dict as a display row.
+
+    Args:
+        transaction (Dict[str, Any]): A row as returned by Account.get_transactions().
+
+    Returns:
+        List[Any]: Cell values in COLUMNS order.
+    """
+    return [
+        transaction['timestamp'],
+        transaction['type'],
+        transaction['symbol'] if transaction['symbol'] else '',
+        transaction['quantity'] if transaction['quantity'] is not None else '',
+        f"{transaction['price_per_share']:.2f}" if transaction['price_per_share'] is not None else '',
+        f"{transaction['amount_effect_on_cash']:.2f}",
+        f"{transaction['balance_after']:.2f}",
+        "Yes" if transaction['success'] else "No",
+        transaction['message']
+    ]
+
+
+class TransactionTable:
+    """
+    Rendered transaction rows for one account, refreshed incrementally and read by page.
+    """
+
+    def __init__(self, account: Account, page_size: int = 50):
+        """
+        Initializes an empty cache; nothing is rendered until the first page is read.
+
+        Args:
+            account (Account): The account whose history is displayed.
+            page_size (int, optional): Rows per page. Defaults to 50.
+
+        Raises:
+            ValueError: If page_size is less than 1.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1.")
+        self.account = account
+        self.page_size = page_size
+        self._rows: List[List[Any]] = []  # Rendered rows, oldest first
+        self._lock = threading.Lock()  # Handlers may run concurrently
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def refresh(self) -> int:
+        """
+        Renders the rows appended to the ledger since the last refresh.
+
+        Returns:
+            int: The number of rows rendered by this call.
+        """
+        with self._lock:
+            new_rows = self.account.transactions()[len(self._rows):]
+            self._rows.extend(format_row(transaction) for transaction in new_rows)
+            return len(new_rows)
+
+    def page_count(self) -> int:
+        """
+        Returns the number of pages in the rendered history.
+
+        Returns:
+            int: Pages of page_size rows, at least 1 even when the history is empty.
+        """
+        return max(1, -(-len(self._rows) // self.page_size))
+
+    def page(self, number: int = 1) -> Tuple[List[List[Any]], int, int]:
+        """
+        Refreshes the cache and returns one page, newest transactions first.
+
+        Args:
+            number (int, optional): Page number, 1 being the newest rows. Out-of-range
+                                    numbers are clamped to the first or last page. Defaults to 1.
+
+        Returns:
+            Tuple[List[List[Any]], int, int]: The page's rows, the page number actually
+                                              shown, and the number of pages.
+        """
+        self.refresh()
+        with self._lock:
+            pages = self.page_count()
+            number = min(max(int(number), 1), pages)
+            stop = len(self._rows) - (number - 1) * self.page_size
+            start = max(stop - self.page_size, 0)
+            return self._rows[start:stop][::-1], number, pages
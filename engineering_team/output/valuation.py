@@ -0,0 +1,339 @@
+"""
+Bulk portfolio valuation for many accounts at once.
+
+Holdings for every account are kept as one sparse accounts-by-symbols matrix
+in coordinate form: parallel numpy arrays of (row, column, quantity), one
+entry per position held. Cash and deposit totals are dense per-account
+vectors, and prices are a dense per-symbol vector. After a price tick, every
+portfolio value is one sparse matrix-vector product:
+
+    values = cash + bincount(rows, weights=quantities * prices[columns])
+
+This needs no Python loop over accounts or symbols. See bench_valuation.py
+for timings.
+
+equity_curve() values one account over time instead: cash, holdings value
+and profit/loss at every sample of a price history, computed with
+cumulative sums over the ledger's cash and per-symbol quantity columns
+rather than by replaying transactions. See bench_equity_curve.py.
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from accounts import Account
+from ledger import TRANSACTION_TYPES
+
+_DEPOSIT = TRANSACTION_TYPES.index("deposit")
+_BUY = TRANSACTION_TYPES.index("buy")
+_SELL = TRANSACTION_TYPES.index("sell")
+
+
+class PortfolioValuator:
+    """
+    Values many accounts' portfolios together against a shared price vector.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Initializes an empty valuator.
+
+        Args:
+            capacity (int, optional): Initial number of holding entries to allocate.
+                                      Storage doubles as needed. Defaults to 1024.
+        """
+        self._account_rows: Dict[str, int] = {}  # Account id -> matrix row
+        self._symbol_columns: Dict[str, int] = {}  # Upper-cased symbol -> matrix column
+        self._positions: List[Dict[int, int]] = []  # Row -> {column: entry slot} of open positions
+        self._free_slots: List[int] = []  # Slots of closed positions, reused first
+        self._used = 0  # Slots handed out so far
+        self._rows = np.zeros(capacity, dtype=np.int64)
+        self._columns = np.zeros(capacity, dtype=np.int64)
+        self._quantities = np.zeros(capacity, dtype=np.float64)  # 0 for free slots
+        self._cash = np.zeros(0, dtype=np.float64)
+        self._deposits = np.zeros(0, dtype=np.float64)
+        self._prices = np.zeros(0, dtype=np.float64)
+
+    @classmethod
+    def from_accounts(cls, accounts: Iterable[Account]) -> "PortfolioValuator":
+        """
+        Builds a valuator holding the current state of each account.
+
+        Args:
+            accounts (Iterable[Account]): The accounts to value.
+
+        Returns:
+            PortfolioValuator: A valuator with one row per account.
+        """
+        valuator = cls()
+        for account in accounts:
+            valuator.sync(account)
+        return valuator
+
+    def __len__(self) -> int:
+        return len(self._account_rows)
+
+    def account_ids(self) -> List[str]:
+        """
+        Returns the ids of the valued accounts, in row order.
+
+        Returns:
+            List[str]: Account ids; position i matches element i of values().
+        """
+        return list(self._account_rows)
+
+    def _row(self, account_id: str) -> int:
+        """Returns an account's row, adding it (with zero cash) on first use."""
+        row = self._account_rows.get(account_id)
+        if row is None:
+            row = len(self._account_rows)
+            self._account_rows[account_id] = row
+            self._positions.append({})
+            if row >= len(self._cash):
+                size = max(16, 2 * len(self._cash))
+                self._cash = np.resize(self._cash, size)
+                self._deposits = np.resize(self._deposits, size)
+            self._cash[row] = 0.0
+            self._deposits[row] = 0.0
+        return row
+
+    def _column(self, symbol: str) -> int:
+        """Returns a symbol's column, adding it (priced at 0) on first use."""
+        symbol = symbol.upper()
+        column = self._symbol_columns.get(symbol)
+        if column is None:
+            column = len(self._symbol_columns)
+            self._symbol_columns[symbol] = column
+            if column >= len(self._prices):
+                self._prices = np.resize(self._prices, max(16, 2 * len(self._prices)))
+            self._prices[column] = 0.0
+        return column
+
+    def _set_position(self, row: int, column: int, quantity: float) -> None:
+        """Sets one matrix entry, allocating or freeing its slot as needed."""
+        positions = self._positions[row]
+        slot = positions.get(column)
+        if slot is None:
+            if not quantity:
+                return
+            if self._free_slots:
+                slot = self._free_slots.pop()
+            else:
+                if self._used == len(self._quantities):
+                    size = max(16, 2 * len(self._quantities))
+                    self._rows = np.resize(self._rows, size)
+                    self._columns = np.resize(self._columns, size)
+                    self._quantities = np.resize(self._quantities, size)
+                    self._quantities[self._used:] = 0.0
+                slot = self._used
+                self._used += 1
+            positions[column] = slot
+            self._rows[slot] = row
+            self._columns[slot] = column
+        elif not quantity:
+            del positions[column]
+            self._free_slots.append(slot)
+        self._quantities[slot] = quantity
+
+    def update_account(
+        self, account_id: str, balance: float, deposits: float, holdings: Dict[str, float]
+    ) -> None:
+        """
+        Replaces the stored state of one account.
+
+        Args:
+            account_id (str): The account id; added if not yet known.
+            balance (float): Cash balance.
+            deposits (float): Total deposits, the basis for profit/loss.
+            holdings (Dict[str, float]): Symbol -> quantity held. Positions missing
+                                         from this mapping are closed.
+        """
+        row = self._row(account_id)
+        self._cash[row] = balance
+        self._deposits[row] = deposits
+        held = {self._column(symbol): quantity for symbol, quantity in holdings.items()}
+        for column in [column for column in self._positions[row] if column not in held]:
+            self._set_position(row, column, 0)
+        for column, quantity in held.items():
+            self._set_position(row, column, quantity)
+
+    def sync(self, account: Account) -> None:
+        """
+        Copies an account's current balance, deposits and holdings into the matrix.
+
+        Args:
+            account (Account): The account, keyed by its account_id.
+        """
+        self.update_account(
+            account.account_id,
+            account.get_balance(),
+            account.get_initial_deposit_total(),
+            account.get_holdings(),
+        )
+
+    def set_prices(self, prices: Dict[str, float]) -> None:
+        """
+        Updates the price vector. Symbols not mentioned keep their previous price;
+        symbols that have never been priced are valued at 0.
+
+        Args:
+            prices (Dict[str, float]): Symbol -> current price (case-insensitive).
+        """
+        for symbol, price in prices.items():
+            self._prices[self._column(symbol)] = price
+
+    def values(self) -> np.ndarray:
+        """
+        Computes every account's portfolio value: cash plus holdings at current prices.
+
+        Returns:
+            np.ndarray: One value per account, in account_ids() order.
+        """
+        count = len(self._account_rows)
+        used = self._used
+        holdings_value = np.bincount(
+            self._rows[:used],
+            weights=self._quantities[:used] * self._prices[self._columns[:used]],
+            minlength=count,
+        )
+        return self._cash[:count] + holdings_value[:count]
+
+    def profit_loss(self) -> np.ndarray:
+        """
+        Computes every account's profit or loss relative to its total deposits.
+
+        Returns:
+            np.ndarray: One profit/loss figure per account, in account_ids() order.
+        """
+        return self.values() - self._deposits[:len(self._account_rows)]
+
+    def revalue(self, prices: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Applies a price tick and revalues every account with a single matrix-vector product.
+
+        Args:
+            prices (Dict[str, float]): Symbol -> new price (case-insensitive).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Portfolio values and profit/loss per account,
+                                           in account_ids() order.
+        """
+        self.set_prices(prices)
+        values = self.values()
+        return values, values - self._deposits[:len(values)]
+
+    def value_of(self, account_id: str) -> float:
+        """
+        Computes a single account's portfolio value from the matrix.
+
+        Args:
+            account_id (str): The account id.
+
+        Returns:
+            float: Cash plus holdings at current prices.
+
+        Raises:
+            KeyError: If the account has not been added.
+        """
+        row = self._account_rows[account_id]
+        slots = list(self._positions[row].values())
+        holdings_value = self._quantities[slots] @ self._prices[self._columns[slots]]
+        return float(self._cash[row] + holdings_value)
+
+
+def equity_curve(
+    account: Account,
+    timestamps: Sequence[int],
+    prices: Dict[str, Sequence[float]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Computes an account's cash, holdings value and profit/loss at every sample time of a
+    price history, in one vectorized pass over its ledger.
+
+    The ledger columns are copied into numpy once. The cash and deposit series are
+    cumulative columns indexed by the number of rows at or before each sample time,
+    found by binary search. Holdings are the running sum of signed buy/sell quantities
+    per symbol, looked up the same way, so the cost is one numpy pass per traded
+    symbol, not one replay per sample.
+
+    Args:
+        account (Account): The account to value.
+        timestamps (Sequence[int]): Sample times in nanoseconds since the epoch (see
+                                    ledger.datetime_to_ns), e.g. bar close times.
+        prices (Dict[str, Sequence[float]], optional): Symbol (case-insensitive) -> price
+                                                       at each sample time, NaN for a
+                                                       missing bar. Symbols without a
+                                                       series, and missing bars, are valued
+                                                       at the symbol's last trade price at
+                                                       that time, like get_profit_loss_at().
+                                                       Defaults to trade prices only.
+
+    Returns:
+        Dict[str, np.ndarray]: One array per field, aligned with `timestamps`:
+                               'timestamps', 'cash', 'deposits', 'holdings_value',
+                               'portfolio_value' (cash plus holdings) and 'profit_loss'
+                               (portfolio value minus deposits).
+
+    Raises:
+        ValueError: If a price series is not the same length as `timestamps`.
+    """
+    times = np.asarray(timestamps, dtype=np.int64)
+    series = {}
+    for symbol, values in (prices or {}).items():
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != times.shape:
+            raise ValueError(f"Price series for {symbol!r} has {len(values)} points, expected {len(times)}.")
+        series[symbol.upper()] = values
+
+    columns, symbol_names = account.ledger_columns()
+    ledger_times = np.array(columns['timestamps'], dtype=np.int64)
+    types = np.array(columns['types'], dtype=np.int8)
+    successes = np.array(columns['successes'], dtype=bool)
+    cash_changes = np.array(columns['cash_changes'], dtype=np.float64)
+
+    # Ledger rows at or before each sample time; rows are appended in timestamp order.
+    # Cumulative columns get a leading 0 so that index 0 means "no rows yet".
+    counts = np.searchsorted(ledger_times, times, side="right")
+    cash = np.concatenate(([0.0], np.array(columns['balances_after'], dtype=np.float64)))[counts]
+    deposited = np.where(successes & (types == _DEPOSIT), cash_changes, 0.0)
+    deposits = np.concatenate(([0.0], np.cumsum(deposited)))[counts]
+
+    trades = np.flatnonzero(successes & ((types == _BUY) | (types == _SELL)))
+    holdings_value = np.zeros(len(times), dtype=np.float64)
+    if len(trades):
+        # Symbols are interned as written ("tsla" and "TSLA" get separate codes);
+        # group the codes by upper-cased symbol, as Account holdings are
+        groups: Dict[str, int] = {}
+        group_of_code = np.array(
+            [groups.setdefault(name.upper(), len(groups)) for name in symbol_names], dtype=np.int64
+        )
+        trade_groups = group_of_code[np.array(columns['symbols'], dtype=np.int64)[trades]]
+        quantities = np.array(columns['quantities'], dtype=np.float64)[trades]
+        signed = np.where(types[trades] == _BUY, quantities, -quantities)
+        trade_prices = np.array(columns['prices'], dtype=np.float64)[trades]
+        trade_times = ledger_times[trades]
+
+        order = np.argsort(trade_groups, kind="stable")  # By symbol, then time
+        bounds = np.searchsorted(trade_groups[order], np.arange(len(groups) + 1))
+        for symbol, group in groups.items():
+            rows = order[bounds[group]:bounds[group + 1]]
+            if not len(rows):
+                continue
+            traded = np.searchsorted(trade_times[rows], times, side="right")
+            held = np.concatenate(([0.0], np.cumsum(signed[rows])))[traded]
+            price = np.concatenate(([0.0], trade_prices[rows]))[traded]  # Last trade price
+            quoted = series.get(symbol)
+            if quoted is not None:
+                price = np.where(np.isnan(quoted), price, quoted)
+            holdings_value += held * price
+
+    portfolio_value = cash + holdings_value
+    return {
+        'timestamps': times,
+        'cash': cash,
+        'deposits': deposits,
+        'holdings_value': holdings_value,
+        'portfolio_value': portfolio_value,
+        'profit_loss': portfolio_value - deposits,
+    }
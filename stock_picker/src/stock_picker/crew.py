@@ -1,5 +1,8 @@
-from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
+import asyncio
+import os
+
+from crewai import Agent, Crew, CrewOutput, Process, Task
+from crewai.project import CrewBase, agent, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from crewai_tools import SerperDevTool  # type: ignore[index]
 from crewai.memory import ShortTermMemory ,LongTermMemory , EntityMemory # type: ignore[index]
@@ -32,11 +35,20 @@ class TrendingCompanyResearchList(BaseModel):
 
 @CrewBase
 class StockPicker():
-    """StockPicker crew"""
+    """StockPicker crew
+
+    Runs in three stages: find the trending companies, research each one in its own
+    sub-crew (up to max_concurrent_research at a time), then pick the best from the
+    merged research. End-to-end time is close to that of the slowest single company
+    rather than the sum over all of them.
+    """
 
     agents: List[BaseAgent]
     tasks: List[Task]
 
+    # Companies researched at once; each one holds an agent loop with its own LLM and search calls
+    max_concurrent_research: int = int(os.environ.get("RESEARCH_CONCURRENCY", "4"))
+
     
     @agent
     def trending_company_finder(self) -> Agent:
@@ -75,10 +87,10 @@ class StockPicker():
         )
 
     @task
-    def research_trending_companies(self) -> Task:
+    def research_company(self) -> Task:
         return Task(
-            config=self.tasks_config['research_trending_companies'], # type: ignore[index]
-            output_pydantic=TrendingCompanyResearchList
+            config=self.tasks_config['research_company'], # type: ignore[index]
+            output_pydantic=TrendingCompanyResearch
         )
     
     @task
@@ -88,14 +100,10 @@ class StockPicker():
             output_pydantic=TrendingCompanyResearchList
         )
 
-    @crew
-    def crew(self) -> Crew:
-        """Creates the StockPicker crew"""
-        
-        # manager = Agent(
-        #     config=self.agents_config['manager'],  # type: ignore[index]
-        #     allow_delegation=True, # type: ignore[index]
-        # )
+    def memory_settings(self) -> dict:
+        """Crew memory settings, built once and shared by the finder and picker crews"""
+        if getattr(self, "_memory_settings", None) is not None:
+            return self._memory_settings
 
         short_term_memory = ShortTermMemory(
             storage=RAGStorage(
@@ -129,15 +137,71 @@ class StockPicker():
             )
         )
 
-        return Crew(
-            agents = self.agents,
-            tasks= self.tasks,
-            process= Process.sequential,
-            verbose=True,  # type: ignore[index]
-            # manager_agent=manager 
+        self._memory_settings = dict(
             memory = True,
             long_term_memory=long_term_memory,
-            short_term_memory=short_term_memory,    
+            short_term_memory=short_term_memory,
             entity_memory=entity_memory
         )
- 
\ No newline at end of file
+        return self._memory_settings
+
+    def finder_crew(self) -> Crew:
+        """Creates the crew that finds the trending companies"""
+        return Crew(
+            agents = [self.trending_company_finder()],
+            tasks = [self.find_trending_companies()],
+            process = Process.sequential,
+            verbose = True,
+            **self.memory_settings()
+        )
+
+    def research_crew(self) -> Crew:
+        """Creates the crew that researches one company; copied for each company researched"""
+        # No crew memory: copies running at once would share and interleave the same stores
+        return Crew(
+            agents = [self.financial_researcher()],
+            tasks = [self.research_company()],
+            process = Process.sequential,
+            verbose = True
+        )
+
+    def picker_crew(self) -> Crew:
+        """Creates the crew that picks the best company from the merged research"""
+        return Crew(
+            agents = [self.stock_picker()],
+            tasks = [self.pick_best_company()],
+            process = Process.sequential,
+            verbose = True,
+            **self.memory_settings()
+        )
+
+    async def research_trending_companies(self, companies: List[TrendingCompany], inputs: dict) -> TrendingCompanyResearchList:
+        """Researches every company in its own copy of the research crew, at most
+        max_concurrent_research at a time, and merges the results in the original order"""
+        template = self.research_crew()
+        limit = asyncio.Semaphore(self.max_concurrent_research)
+
+        async def research(company: TrendingCompany) -> TrendingCompanyResearch:
+            async with limit:
+                # A copy per company: agents and tasks keep per-run state
+                output = await template.copy().kickoff_async(inputs={**inputs, **company.model_dump()})
+            return output.pydantic or TrendingCompanyResearch.model_validate_json(output.raw)
+
+        research_list = await asyncio.gather(*(research(company) for company in companies))
+        return TrendingCompanyResearchList(research_list=list(research_list))
+
+    async def kickoff_async(self, inputs: dict) -> CrewOutput:
+        """Finds the trending companies, researches them concurrently and picks the best"""
+        trending = await self.finder_crew().kickoff_async(inputs=inputs)
+        companies = trending.pydantic or TrendingCompaniesList.model_validate_json(trending.raw)
+
+        research = await self.research_trending_companies(companies.companies, inputs)
+        os.makedirs("output", exist_ok=True)
+        with open("output/research_report.json", "w") as report:
+            report.write(research.model_dump_json(indent=2))
+
+        return await self.picker_crew().kickoff_async(inputs={**inputs, 'research': research.model_dump_json()})
+
+    def kickoff(self, inputs: dict) -> CrewOutput:
+        """Runs the whole pipeline from synchronous code"""
+        return asyncio.run(self.kickoff_async(inputs))
@@ -12,7 +12,7 @@ def run():
     }
     
     try:
-        StockPicker().crew().kickoff(inputs=inputs)
+        StockPicker().kickoff(inputs=inputs)
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
 